@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures CLI import cost with `python -X importtime` against a recorded budget
+
+Usage:
+    python benchmarks/startup.py                  # Check against startup_budget.json
+    python benchmarks/startup.py --json           # Machine-readable report
+    python benchmarks/startup.py --budget FILE    # Use another budget file
+
+Exits with status 1 when a target is over budget or imports a module it
+must not load at startup.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+DESKTOP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.json")
+
+
+def import_profile(module: str) -> Dict[str, int]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        Mapping of every imported module name to its cumulative time in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=DESKTOP_DIR, capture_output=True, text=True, check=True
+    )
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def measure_target(module: str, runs: int = 5) -> Dict[str, object]:
+    """
+    Profile a module several times and keep the fastest run.
+
+    Returns:
+        Dictionary with the best cumulative import time (ms) and the
+        full set of modules the import loaded
+    """
+    best: Optional[Dict[str, int]] = None
+    for _ in range(runs):
+        profile = import_profile(module)
+        if best is None or profile.get(module, 0) < best.get(module, 0):
+            best = profile
+
+    return {
+        'import_ms': best.get(module, 0) / 1000.0,
+        'modules': sorted(best)
+    }
+
+
+def check_budget(budget: Dict[str, object]) -> List[Dict[str, object]]:
+    """
+    Measure every target in a budget.
+
+    Returns:
+        One result per target with its timing, any forbidden modules it
+        loaded and an overall 'ok' flag
+    """
+    runs = budget.get('runs', 5)
+    results = []
+    for module, limits in budget['targets'].items():
+        measured = measure_target(module, runs)
+        loaded = set(measured['modules'])
+        forbidden = [name for name in limits.get('forbidden_modules', []) if name in loaded]
+        over_budget = measured['import_ms'] > limits['max_import_ms']
+        results.append({
+            'target': module,
+            'import_ms': round(measured['import_ms'], 2),
+            'max_import_ms': limits['max_import_ms'],
+            'forbidden_loaded': forbidden,
+            'ok': not over_budget and not forbidden
+        })
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the startup benchmark and report; returns the exit status."""
+    argv = sys.argv[1:] if argv is None else argv
+    budget_path = DEFAULT_BUDGET
+    if "--budget" in argv:
+        budget_path = argv[argv.index("--budget") + 1]
+
+    with open(budget_path, 'r', encoding='utf-8') as f:
+        budget = json.load(f)
+
+    results = check_budget(budget)
+
+    if "--json" in argv:
+        print(json.dumps({'benchmark': 'startup', 'results': results}, indent=2))
+    else:
+        for result in results:
+            status = "OK  " if result['ok'] else "FAIL"
+            print(f"[{status}] {result['target']:<28} {result['import_ms']:8.2f} ms "
+                  f"(budget {result['max_import_ms']} ms)")
+            for name in result['forbidden_loaded']:
+                print(f"       loads forbidden module at startup: {name}")
+
+    return 0 if all(result['ok'] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,41 @@
 """
 Command Line Interface for Secure Mnemonic Encryption
 Enhanced version with modern security practices
+
+Heavy modules (cryptography, argparse, msvcrt, thread pools) are imported
+only by the operations that need them, so scripted calls such as
+--test-password start quickly. benchmarks/startup.py guards this.
 """
 
 import getpass
 import sys
-from typing import Optional
-import argparse
-import msvcrt  # For Windows getch functionality
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from crypto.password_strength import PasswordStrengthChecker
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from crypto.secure_encryption import PreparedKey, SecureMnemonicEncryption
+
+# Flags main() can dispatch without building the argparse parser
+_FLAG_ACTIONS = {
+    '--encrypt': 'encrypt_mnemonic_interactive',
+    '--decrypt': 'decrypt_mnemonic_interactive',
+    '--test-password': 'password_strength_test',
+}
+
+
+def _wipe_prepared(future: 'Future') -> None:
+    """Done-callback: zero the key of a finished speculative derivation."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().wipe()
+
 
-from crypto.secure_encryption import SecureMnemonicEncryption, PasswordStrengthChecker
+def _abandon(future: 'Future') -> None:
+    """Cancel a speculative derivation, or wipe its key when it finishes."""
+    if not future.cancel():
+        future.add_done_callback(_wipe_prepared)
 
 
 class MnemonicCLI:
@@ -17,11 +43,73 @@ class MnemonicCLI:
 
     def __init__(self):
         """Initialize CLI with required components."""
-        self.encryption = SecureMnemonicEncryption()
+        self._encryption: Optional['SecureMnemonicEncryption'] = None
         self.password_checker = PasswordStrengthChecker()
 
+        # Background worker for key derivation that overlaps with prompts
+        self._background = None
+        self._speculative_key: Optional[Tuple[str, 'Future']] = None
+
+    @property
+    def encryption(self) -> 'SecureMnemonicEncryption':
+        """Encryption engine, imported on first use."""
+        if self._encryption is None:
+            from crypto.secure_encryption import SecureMnemonicEncryption
+            self._encryption = SecureMnemonicEncryption()
+        return self._encryption
+
+    def _submit_background(self, func, *args) -> 'Future':
+        """Run a function on the single background worker thread."""
+        if self._background is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cli-kdf")
+        return self._background.submit(func, *args)
+
+    def _start_speculative_key(self, password: str) -> None:
+        """Begin deriving an encryption key while the user is still answering prompts."""
+        self._discard_speculative_key()
+        # encrypt rejects short passwords, so a key for one would never be used
+        if len(password) < 8:
+            return
+        self._speculative_key = (password, self._submit_background(self.encryption.prepare_key, password))
+
+    def _discard_speculative_key(self) -> None:
+        """Drop a speculative key that will not be used, wiping it once derived."""
+        if self._speculative_key is not None:
+            _abandon(self._speculative_key[1])
+            self._speculative_key = None
+
+    def _take_speculative_key(self, password: str) -> Optional['PreparedKey']:
+        """Claim the speculative key if it was derived for this exact password."""
+        import hmac
+
+        speculative, self._speculative_key = self._speculative_key, None
+        if speculative is None:
+            return None
+
+        started_for, future = speculative
+        if not hmac.compare_digest(started_for.encode('utf-8'), password.encode('utf-8')):
+            _abandon(future)
+            return None
+        try:
+            return future.result()
+        except Exception:
+            return None
+
+    def _inspect_envelope(self, encrypted_text: str) -> str:
+        """Validate a pasted envelope and warm up the KDF backend; returns a reason code."""
+        from crypto.kdf_backends import get_backend
+
+        get_backend()
+        return self.encryption.validate_envelope(encrypted_text)
+
     def get_password_with_asterisks(self, prompt: str) -> str:
-        """Get password input with asterisk masking."""
+        """Get password input with asterisk masking (plain hidden input off Windows)."""
+        try:
+            import msvcrt  # For Windows getch functionality
+        except ImportError:
+            return getpass.getpass(prompt)
+
         print(prompt, end='', flush=True)
         password = ""
 
@@ -56,7 +144,8 @@ class MnemonicCLI:
         return password
 
     def get_secure_password(self, prompt: str = "Enter password: ",
-                           confirm: bool = True, check_strength: bool = True) -> Optional[str]:
+                           confirm: bool = True, check_strength: bool = True,
+                           speculate: bool = False) -> Optional[str]:
         """
         Get password from user with optional confirmation and strength checking.
 
@@ -64,10 +153,13 @@ class MnemonicCLI:
             prompt: Password prompt message
             confirm: Whether to ask for password confirmation
             check_strength: Whether to check password strength
+            speculate: Start deriving the encryption key as soon as the
+                password is typed; claim it with _take_speculative_key
 
         Returns:
             Password string or None if cancelled
         """
+        accepted = False
         try:
             password = self.get_password_with_asterisks(prompt)
 
@@ -75,6 +167,10 @@ class MnemonicCLI:
                 print("Password cannot be empty.")
                 return None
 
+            if speculate:
+                # The KDF runs while the strength report and confirmation are shown
+                self._start_speculative_key(password)
+
             if check_strength:
                 strength = self.password_checker.check_password_strength(password)
                 print(f"\nPassword strength: {strength['strength']} (Entropy: {strength['entropy']:.1f} bits)")
@@ -95,12 +191,17 @@ class MnemonicCLI:
                     print("Passwords do not match.")
                     return None
 
+            accepted = True
             return password
 
         except KeyboardInterrupt:
             print("\nOperation cancelled.")
             return None
 
+        finally:
+            if speculate and not accepted:
+                self._discard_speculative_key()
+
     def encrypt_mnemonic_interactive(self) -> None:
         """Interactive mnemonic encryption."""
         print("=== Encrypt Mnemonic Phrase ===")
@@ -130,14 +231,15 @@ class MnemonicCLI:
                 return
 
         # Get encryption password
-        password = self.get_secure_password("Enter encryption password: ")
+        password = self.get_secure_password("Enter encryption password: ", speculate=True)
         if not password:
             return
 
         try:
             # Encrypt the mnemonic
             print("\n[INFO] Encrypting mnemonic...")
-            encrypted_data = self.encryption.encrypt_mnemonic(mnemonic, password)
+            prepared = self._take_speculative_key(password)
+            encrypted_data, verified = self.encryption.encrypt_and_verify(mnemonic, password, prepared)
 
             # Display the encrypted result
             print("\n" + "=" * 60)
@@ -151,10 +253,9 @@ class MnemonicCLI:
             print(f"[INFO] Save this encrypted text somewhere safe")
             print(f"[WARNING] Keep your password safe - it cannot be recovered!")
 
-            # Test decryption to verify
-            print(f"\n[INFO] Testing decryption...")
-            test_decrypt = self.encryption.decrypt_mnemonic(encrypted_data, password)
-            if test_decrypt == mnemonic:
+            # Verify the envelope decrypts, reusing the derived key
+            print(f"\n[INFO] Verifying decryption...")
+            if verified:
                 print(f"[SUCCESS] Encryption/decryption test passed")
             else:
                 print(f"[ERROR] Encryption/decryption test failed!")
@@ -176,12 +277,22 @@ class MnemonicCLI:
             print("[ERROR] No encrypted text provided.")
             return
 
+        # Check the envelope while the password prompt is open
+        inspection = self._submit_background(self._inspect_envelope, encrypted_text)
+
         # Get decryption password
         password = self.get_password_with_asterisks("Enter decryption password: ")
         if not password:
             print("[ERROR] Password cannot be empty.")
             return
 
+        from crypto import envelope
+
+        reason = inspection.result()
+        if reason != envelope.REASON_OK:
+            print(f"[ERROR] Encrypted text is malformed ({reason}).")
+            return
+
         # Decrypt
         print("\n[INFO] Decrypting...")
         decrypted_mnemonic = self.encryption.decrypt_mnemonic(encrypted_text, password)
@@ -260,6 +371,8 @@ class MnemonicCLI:
 
 def create_argument_parser():
     """Create command line argument parser."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Secure Mnemonic Encryption Tool",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -284,6 +397,18 @@ Examples:
 
 def main():
     """Main entry point."""
+    argv = sys.argv[1:]
+
+    # A single known flag (or none) needs no parser; anything else, such
+    # as --help or a typo, goes through argparse for usage and errors
+    if len(argv) <= 1 and all(arg in _FLAG_ACTIONS for arg in argv):
+        cli = MnemonicCLI()
+        if argv:
+            getattr(cli, _FLAG_ACTIONS[argv[0]])()
+        else:
+            cli.main_menu()
+        return
+
     parser = create_argument_parser()
     args = parser.parse_args()
 
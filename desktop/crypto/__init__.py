@@ -1,5 +1,34 @@
-"""Cryptographic modules for secure mnemonic encryption."""
+"""Cryptographic modules for secure mnemonic encryption.
 
-from crypto.secure_encryption import SecureMnemonicEncryption, PasswordStrengthChecker
+Exports are resolved on first access (PEP 562), so importing a light
+submodule such as crypto.password_strength does not pull in the
+cryptography package.
+"""
 
-__all__ = ['SecureMnemonicEncryption', 'PasswordStrengthChecker']
\ No newline at end of file
+import importlib
+
+_EXPORTS = {
+    'SecureMnemonicEncryption': 'crypto.secure_encryption',
+    'PasswordStrengthChecker': 'crypto.password_strength',
+    'BatchResult': 'crypto.secure_encryption',
+    'DerivedKeyCache': 'crypto.key_cache',
+    'AsyncMnemonicEncryption': 'crypto.async_encryption',
+    'SecureArena': 'crypto.secure_memory',
+    'VaultSession': 'crypto.vault_session',
+    'Metrics': 'crypto.metrics',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
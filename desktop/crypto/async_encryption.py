@@ -0,0 +1,157 @@
+"""
+Asyncio Facade for Mnemonic Encryption
+Runs KDF and cipher work off the event loop with a concurrency cap
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, Optional, Tuple, Union
+
+from crypto.secure_encryption import SecureMnemonicEncryption, _decrypt_chunk, _encrypt_chunk
+
+
+class AsyncMnemonicEncryption:
+    """
+    Async wrapper around SecureMnemonicEncryption.
+
+    Every operation runs on an executor while at most max_concurrency of
+    them are in flight. A slot stays taken until the worker really finishes,
+    even when the awaiting task is cancelled mid-derivation, so the cap
+    holds under cancellation.
+    """
+
+    def __init__(self, encryption: Optional[SecureMnemonicEncryption] = None,
+                 executor: Optional[Executor] = None,
+                 max_concurrency: Optional[int] = None):
+        """
+        Args:
+            encryption: Configured instance to delegate to
+            executor: Thread or process pool to run work on; a private
+                thread pool sized to max_concurrency is created if omitted
+            max_concurrency: Maximum concurrent operations (defaults to CPU count)
+        """
+        self.encryption = encryption or SecureMnemonicEncryption()
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop = None
+
+    def _get_executor(self) -> Executor:
+        """Return the executor, creating the private thread pool on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                thread_name_prefix="mnemonic-kdf")
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the semaphore for the running loop, creating it inside that loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _submit(self, worker, item, password: str):
+        """
+        Submit one operation.
+
+        Returns:
+            (future, batched); batched is True when the picklable chunk
+            worker was used because the executor is a process pool
+        """
+        executor = self._get_executor()
+        if isinstance(executor, ProcessPoolExecutor):
+            chunk_worker = _encrypt_chunk if worker == 'encrypt' else _decrypt_chunk
+            future = executor.submit(chunk_worker, type(self.encryption),
+                                     self.encryption._worker_options(), [(0, item)], password)
+            return future, True
+
+        method = (self.encryption.encrypt_mnemonic if worker == 'encrypt'
+                  else self.encryption.decrypt_mnemonic)
+        return executor.submit(method, item, password), False
+
+    async def _run(self, worker: str, item, password: str):
+        """Run one operation under the concurrency cap."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._get_semaphore()
+        await semaphore.acquire()
+
+        try:
+            future, batched = self._submit(worker, item, password)
+        except BaseException:
+            semaphore.release()
+            raise
+
+        def release(_):
+            # Fires when the worker is truly done, or at once if cancelled before starting
+            try:
+                loop.call_soon_threadsafe(semaphore.release)
+            except RuntimeError:
+                pass  # Loop already closed
+
+        future.add_done_callback(release)
+        result = await asyncio.wrap_future(future)
+
+        if batched:
+            # Process pool path returns a one-item BatchResult list
+            batch = result[0]
+            if worker == 'encrypt' and batch.error is not None:
+                raise ValueError(batch.error)
+            return batch.result
+        return result
+
+    async def encrypt_mnemonic(self, mnemonic: str, password: str) -> Union[str, bytes]:
+        """Encrypt without blocking the event loop; raises like encrypt_mnemonic."""
+        return await self._run('encrypt', mnemonic, password)
+
+    async def decrypt_mnemonic(self, encrypted_data: Union[str, bytes], password: str) -> Optional[str]:
+        """Decrypt without blocking the event loop; None on failure."""
+        return await self._run('decrypt', encrypted_data, password)
+
+    async def as_completed(self, items: Iterable, password: str,
+                           operation: str = 'decrypt') -> AsyncIterator[Tuple[int, object]]:
+        """
+        Run an operation over many items and yield results as they finish.
+
+        Args:
+            items: Mnemonics (encrypt) or envelopes (decrypt)
+            password: Password shared by every item
+            operation: 'encrypt' or 'decrypt'
+
+        Yields:
+            (index, result) in completion order; for encrypt, result is the
+            raised exception when an item fails. Leaving the loop early
+            cancels the remaining work.
+        """
+        if operation not in ('encrypt', 'decrypt'):
+            raise ValueError("operation must be 'encrypt' or 'decrypt'")
+
+        async def run_one(index, item):
+            try:
+                return index, await self._run(operation, item, password)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                return index, e
+
+        tasks = [asyncio.ensure_future(run_one(i, item)) for i, item in enumerate(items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def close(self) -> None:
+        """Shut down the private executor, if one was created."""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self) -> 'AsyncMnemonicEncryption':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,261 @@
+"""
+Batched PBKDF2-HMAC-SHA256
+Runs many derivations that share one password in lockstep over NumPy arrays
+
+Every SHA-256 word is a uint32 array with one lane per salt, so each round
+of the compression function advances the whole batch at once. The HMAC
+inner and outer pad states depend only on the password and are computed
+a single time per batch. Output is bit-identical to PBKDF2HMAC.
+
+The engine is opt-in (SecureMnemonicEncryption.decrypt_batch(lockstep=True)).
+Where OpenSSL uses SHA extensions, hashlib is many times faster per key
+than NumPy, so nothing probes or selects it automatically; measure with
+lockstep_speedup() on the target host before turning it on.
+"""
+
+import hashlib
+import os
+import struct
+import time
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+_K = [
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+]
+
+_IV = [
+    0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
+    0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+]
+
+# Lanes and iterations used when comparing against the per-item backend
+PROBE_LANES = 1024
+PROBE_ITERATIONS = 20
+
+_speedup: Optional[float] = None
+
+
+class _Compressor:
+    """SHA-256 compression over N lanes with preallocated scratch buffers."""
+
+    def __init__(self, lanes: int):
+        self.lanes = lanes
+        self.w = np.empty((64, lanes), dtype=np.uint32)
+        self.k = [np.uint32(k) for k in _K]
+        self._t1 = np.empty(lanes, dtype=np.uint32)
+        self._t2 = np.empty(lanes, dtype=np.uint32)
+        self._t3 = np.empty(lanes, dtype=np.uint32)
+        self._ws1 = np.empty((2, lanes), dtype=np.uint32)
+        self._ws2 = np.empty((2, lanes), dtype=np.uint32)
+        self._ws3 = np.empty((2, lanes), dtype=np.uint32)
+
+    @staticmethod
+    def _sigma(x, r1, r2, r3, out, tmp, shift=False):
+        """out = rotr(x, r1) ^ rotr(x, r2) ^ (rotr or shr)(x, r3)."""
+        np.right_shift(x, r1, out=out)
+        np.left_shift(x, 32 - r1, out=tmp)
+        np.bitwise_or(out, tmp, out=out)
+        np.right_shift(x, r2, out=tmp)
+        np.bitwise_xor(out, tmp, out=out)
+        np.left_shift(x, 32 - r2, out=tmp)
+        np.bitwise_xor(out, tmp, out=out)
+        np.right_shift(x, r3, out=tmp)
+        np.bitwise_xor(out, tmp, out=out)
+        if not shift:
+            np.left_shift(x, 32 - r3, out=tmp)
+            np.bitwise_xor(out, tmp, out=out)
+        return out
+
+    def _expand(self):
+        """Fill w[16:64]; w[t] and w[t+1] are independent so go two at a time."""
+        w, s0, s1, tmp = self.w, self._ws1, self._ws2, self._ws3
+        for t in range(16, 64, 2):
+            self._sigma(w[t - 15:t - 13], 7, 18, 3, s0, tmp, shift=True)
+            self._sigma(w[t - 2:t], 17, 19, 10, s1, tmp, shift=True)
+            np.add(w[t - 16:t - 14], s0, out=w[t:t + 2])
+            np.add(w[t:t + 2], w[t - 7:t - 5], out=w[t:t + 2])
+            np.add(w[t:t + 2], s1, out=w[t:t + 2])
+
+    def compress(self, state: List) -> List:
+        """Compress self.w[0:16] into state and return the new state."""
+        self._expand()
+        w, k = self.w, self.k
+        t1, t2, tmp = self._t1, self._t2, self._t3
+        a, b, c, d, e, f, g, h = [x.copy() for x in state]
+
+        for i in range(64):
+            # t1 = h + S1(e) + ch(e, f, g) + k[i] + w[i]
+            self._sigma(e, 6, 11, 25, t1, tmp)
+            np.add(t1, h, out=t1)
+            np.bitwise_xor(f, g, out=tmp)
+            np.bitwise_and(tmp, e, out=tmp)
+            np.bitwise_xor(tmp, g, out=tmp)
+            np.add(t1, tmp, out=t1)
+            np.add(t1, w[i], out=t1)
+            np.add(t1, k[i], out=t1)
+
+            # t2 = S0(a) + maj(a, b, c); h becomes the new a
+            self._sigma(a, 2, 13, 22, t2, tmp)
+            np.bitwise_or(a, b, out=tmp)
+            np.bitwise_and(tmp, c, out=tmp)
+            np.bitwise_and(a, b, out=h)
+            np.bitwise_or(tmp, h, out=tmp)
+            np.add(t2, tmp, out=t2)
+
+            np.add(d, t1, out=d)
+            np.add(t1, t2, out=h)
+            a, b, c, d, e, f, g, h = h, a, b, c, d, e, f, g
+
+        return [np.add(s, x) for s, x in zip(state, (a, b, c, d, e, f, g, h))]
+
+
+def _pad_states(password: bytes, lanes: int):
+    """HMAC inner and outer midstates, computed once and broadcast to every lane."""
+    if len(password) > 64:
+        password = hashlib.sha256(password).digest()
+    key = password.ljust(64, b"\x00")
+
+    one = _Compressor(1)
+    iv = [np.full(1, v, dtype=np.uint32) for v in _IV]
+    states = []
+    for pad in (0x36, 0x5c):
+        block = bytes(b ^ pad for b in key)
+        one.w[:16, 0] = struct.unpack(">16I", block)
+        states.append([np.repeat(s, lanes) for s in one.compress(iv)])
+    return states
+
+
+def _first_block_words(salts: Sequence[bytes], block_index: int) -> "np.ndarray":
+    """Padded SHA-256 message words for salt || INT(i) after the 64-byte ipad block."""
+    message_len = len(salts[0]) + 4
+    total = ((message_len + 9 + 63) // 64) * 64
+    bit_len = (64 + message_len) * 8
+    suffix = struct.pack(">I", block_index) + b"\x80"
+    tail = b"\x00" * (total - message_len - 9) + struct.pack(">Q", bit_len)
+
+    raw = b"".join(bytes(s) + suffix + tail for s in salts)
+    words = np.frombuffer(raw, dtype=">u4").astype(np.uint32)
+    return words.reshape(len(salts), total // 4).T
+
+
+def _derive_group(password: bytes, salts: Sequence[bytes], iterations: int, length: int) -> List[bytes]:
+    """Lockstep PBKDF2 for salts of identical length."""
+    lanes = len(salts)
+    inner, outer = _pad_states(password, lanes)
+    comp = _Compressor(lanes)
+    w = comp.w
+    blocks = []
+
+    for block_index in range(1, (length + 31) // 32 + 1):
+        # U1 = HMAC(P, salt || INT(i)); the salt may span several blocks
+        words = _first_block_words(salts, block_index)
+        state = inner
+        for offset in range(0, words.shape[0], 16):
+            w[:16] = words[offset:offset + 16]
+            state = comp.compress(state)
+
+        # Every later HMAC input is a 32-byte digest: one padded block each
+        w[8] = 0x80000000
+        w[9:15] = 0
+        w[15] = (64 + 32) * 8
+
+        w[:8] = state
+        u = comp.compress(outer)
+        result = [x.copy() for x in u]
+
+        # Only w[16:] is rewritten by compress, so the padding words stay put
+        for _ in range(iterations - 1):
+            w[:8] = u
+            w[:8] = comp.compress(inner)
+            u = comp.compress(outer)
+            for r, x in zip(result, u):
+                np.bitwise_xor(r, x, out=r)
+
+        blocks.append(np.stack(result).T.astype(">u4").tobytes())
+
+    # Reassemble per-lane output from the 32-byte blocks
+    return [
+        b"".join(block[lane * 32:(lane + 1) * 32] for block in blocks)[:length]
+        for lane in range(lanes)
+    ]
+
+
+def pbkdf2_sha256_batch(password: bytes, salts: Sequence[bytes],
+                        iterations: int, length: int = 32) -> List[bytes]:
+    """
+    Derive one key per salt under a shared password, all in lockstep.
+
+    Args:
+        password: Encoded password shared by every derivation
+        salts: One salt per output key; lengths may differ
+        iterations: PBKDF2 iteration count
+        length: Derived key length in bytes
+
+    Returns:
+        Derived keys in the same order as salts
+    """
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required for the batched PBKDF2 engine")
+    if iterations < 1:
+        raise ValueError("iterations must be at least 1")
+    if not salts:
+        return []
+
+    # Lanes must share a message layout, so group salts by length
+    groups: Dict[int, List[int]] = {}
+    for i, salt in enumerate(salts):
+        groups.setdefault(len(salt), []).append(i)
+
+    keys: List[bytes] = [b""] * len(salts)
+    for indexes in groups.values():
+        derived = _derive_group(password, [salts[i] for i in indexes], iterations, length)
+        for i, key in zip(indexes, derived):
+            keys[i] = key
+    return keys
+
+
+def lockstep_speedup() -> float:
+    """
+    Per-derivation speedup of the lockstep engine over the selected backend.
+
+    Measured once per process and never called implicitly; the probe
+    itself takes a noticeable fraction of a second. Hosts whose OpenSSL uses
+    SHA extensions outrun NumPy, in which case this is below 1.0 and callers
+    should stay on the per-item backend.
+    """
+    global _speedup
+    if _speedup is None:
+        if not NUMPY_AVAILABLE:
+            _speedup = 0.0
+            return _speedup
+
+        from crypto.kdf_backends import get_backend
+        backend = get_backend()
+        salts = [os.urandom(16) for _ in range(PROBE_LANES)]
+
+        start = time.perf_counter()
+        pbkdf2_sha256_batch(b"probe-password", salts, PROBE_ITERATIONS)
+        lockstep = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for salt in salts:
+            backend(b"probe-password", salt, PROBE_ITERATIONS, 32)
+        serial = time.perf_counter() - start
+
+        _speedup = serial / lockstep
+    return _speedup
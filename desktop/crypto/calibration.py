@@ -0,0 +1,114 @@
+"""
+KDF Cost Calibration
+Picks a PBKDF2 iteration count that hits a target unlock latency on this machine
+"""
+
+import json
+import os
+import platform
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from crypto.kdf_backends import backend_info, get_backend
+
+DEFAULT_CACHE_PATH = Path.home() / ".mnemonic_encryption" / "kdf_calibration.json"
+
+# Iterations timed per measurement; large enough to swamp call overhead
+PROBE_ITERATIONS = 20000
+
+# Calibrated counts are rounded down to a multiple of this
+ITERATION_STEP = 1000
+
+
+def _host_fingerprint() -> str:
+    """Identify the machine and runtime a cached calibration belongs to."""
+    return "|".join([
+        platform.node(),
+        platform.machine(),
+        platform.processor(),
+        platform.python_implementation(),
+        platform.python_version(),
+    ])
+
+
+def measure_iterations_per_second() -> float:
+    """Time the selected PBKDF2 backend and return iterations per second."""
+    backend = get_backend()
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        backend(b"calibration-password", os.urandom(16), PROBE_ITERATIONS, 32)
+        best = min(best, time.perf_counter() - start)
+    return PROBE_ITERATIONS / best
+
+
+def _load_cache(cache_path: Path) -> Dict[str, Any]:
+    """Read the calibration cache, treating any problem as an empty cache."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _save_cache(cache_path: Path, data: Dict[str, Any]) -> None:
+    """Write the calibration cache; failure only costs a recalibration later."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        if os.name != 'nt':
+            os.chmod(cache_path, 0o600)
+    except Exception:
+        pass
+
+
+def calibrate_iterations(target_seconds: float = 0.5,
+                         min_iterations: int = 10000,
+                         cache_path: Optional[Path] = DEFAULT_CACHE_PATH,
+                         force: bool = False) -> int:
+    """
+    Choose a PBKDF2 iteration count for a target unlock latency.
+
+    Results are cached on disk per host, backend and target so later
+    startups skip the measurement.
+
+    Args:
+        target_seconds: Desired time for one key derivation
+        min_iterations: Floor for the result (the mobile-compatible default)
+        cache_path: JSON cache location, or None to disable caching
+        force: Re-measure even when a cached result exists
+
+    Returns:
+        Iteration count, at least min_iterations
+    """
+    if target_seconds <= 0:
+        raise ValueError("target_seconds must be positive")
+
+    backend = backend_info()['selected']
+    entry_key = f"{backend}:{target_seconds:g}"
+    host = _host_fingerprint()
+
+    cache = _load_cache(Path(cache_path)) if cache_path else {}
+    if not force and cache.get('host') == host:
+        cached = cache.get('results', {}).get(entry_key)
+        if isinstance(cached, dict) and isinstance(cached.get('iterations'), int):
+            return max(cached['iterations'], min_iterations)
+
+    rate = measure_iterations_per_second()
+    iterations = int(rate * target_seconds) // ITERATION_STEP * ITERATION_STEP
+    iterations = max(iterations, min_iterations)
+
+    if cache_path:
+        if cache.get('host') != host:
+            cache = {'host': host, 'results': {}}
+        cache.setdefault('results', {})[entry_key] = {
+            'iterations': iterations,
+            'iterations_per_second': rate,
+            'measured_at': time.time()
+        }
+        _save_cache(Path(cache_path), cache)
+
+    return iterations
@@ -0,0 +1,251 @@
+"""
+Chunked Encrypted Container
+Large payloads split into independently authenticated AES-GCM chunks
+
+Layout (all integers big-endian):
+
+    offset  size        field
+    0       4           MAGIC b"MNCC"
+    4       1           version
+    5       4           PBKDF2 iterations
+    9       16          salt
+    25      8           nonce prefix
+    33      4           chunk size (plaintext bytes per chunk)
+    37      8           total plaintext length
+    45      4           chunk count
+    49      12 * count  chunk index: (file offset u64, ciphertext length u32)
+    ...                 chunks, each ciphertext || 16-byte tag
+
+Chunk i uses nonce = prefix || i (u32) and is authenticated together with
+a hash of the fixed header, its own index and a last-chunk flag. Chunks
+therefore cannot be reordered, truncated or moved between containers, and
+any chunk can be decrypted without touching the others.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from crypto.concurrency import bounded_map
+from crypto.kdf_backends import pbkdf2_sha256
+from crypto.secure_encryption import SecureMnemonicEncryption
+
+MAGIC = b"MNCC"
+VERSION = 1
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_ITERATIONS = 10000
+TAG_SIZE = 16
+
+_HEADER = struct.Struct(">4sBI16s8sIQI")
+_INDEX_ENTRY = struct.Struct(">QI")
+_AAD = struct.Struct(">32sI?")
+
+
+class ContainerError(ValueError):
+    """Raised for malformed containers and failed chunk authentication"""
+
+
+def _chunk_aad(header_hash: bytes, index: int, last: bool) -> bytes:
+    """Associated data binding a chunk to its container and position."""
+    return _AAD.pack(header_hash, index, last)
+
+
+def _chunk_nonce(prefix: bytes, index: int) -> bytes:
+    """Per-chunk nonce derived from the file's random prefix and chunk index."""
+    return prefix + struct.pack(">I", index)
+
+
+def _map_input(file_obj: BinaryIO):
+    """Read-only mmap of an input file, or empty bytes for an empty file."""
+    if os.fstat(file_obj.fileno()).st_size == 0:
+        return b""
+    return mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def encrypt_file(input_path: str, output_path: str, password: str,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 iterations: int = DEFAULT_ITERATIONS,
+                 workers: Optional[int] = None) -> int:
+    """
+    Encrypt a file into a chunked container, encrypting chunks in parallel.
+
+    Args:
+        input_path: Plaintext file (memory-mapped)
+        output_path: Container to create
+        password: Encryption password
+        chunk_size: Plaintext bytes per chunk
+        iterations: PBKDF2 iterations for the file key
+        workers: Worker threads (defaults to CPU count)
+
+    Returns:
+        Number of chunks written
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    if not 1 <= iterations <= SecureMnemonicEncryption.MAX_PBKDF2_ITERATIONS:
+        raise ValueError(f"iterations must be between 1 and {SecureMnemonicEncryption.MAX_PBKDF2_ITERATIONS}")
+
+    salt = os.urandom(16)
+    prefix = os.urandom(8)
+    aead = AESGCM(pbkdf2_sha256(password.encode('utf-8'), salt, iterations))
+
+    with open(input_path, 'rb') as src:
+        data = _map_input(src)
+        try:
+            total = len(data)
+            count = max(1, -(-total // chunk_size))
+            header = _HEADER.pack(MAGIC, VERSION, iterations, salt, prefix, chunk_size, total, count)
+            header_hash = hashlib.sha256(header).digest()
+
+            # Every chunk but the last is full, so all offsets are known up front
+            first = _HEADER.size + count * _INDEX_ENTRY.size
+            index = []
+            for i in range(count):
+                length = min(chunk_size, total - i * chunk_size) + TAG_SIZE
+                index.append(_INDEX_ENTRY.pack(first + i * (chunk_size + TAG_SIZE), length))
+
+            def seal(i):
+                plaintext = data[i * chunk_size:(i + 1) * chunk_size]
+                return aead.encrypt(_chunk_nonce(prefix, i), plaintext,
+                                    _chunk_aad(header_hash, i, i == count - 1))
+
+            workers = workers or os.cpu_count() or 1
+            with open(output_path, 'wb') as dst, ThreadPoolExecutor(max_workers=workers) as pool:
+                dst.write(header + b"".join(index))
+                for sealed in bounded_map(pool, seal, ((i,) for i in range(count)), workers * 2):
+                    dst.write(sealed)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    return count
+
+
+class ChunkedReader:
+    """
+    Random-access reader for a chunked container.
+
+    Only the chunks overlapping a requested byte range are decrypted.
+    """
+
+    def __init__(self, path: str, password: str, workers: Optional[int] = None):
+        """
+        Open a container and derive its file key.
+
+        Raises:
+            ContainerError: If the header or index is malformed
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self._file = open(path, 'rb')
+        try:
+            self._map = _map_input(self._file)
+            self._parse_header()
+        except Exception:
+            self.close()
+            raise
+
+        self._aead = AESGCM(pbkdf2_sha256(password.encode('utf-8'), self._salt, self._iterations))
+
+    def _parse_header(self) -> None:
+        """Read the fixed header and chunk index."""
+        if len(self._map) < _HEADER.size:
+            raise ContainerError("Container truncated")
+
+        header = bytes(self._map[:_HEADER.size])
+        (magic, version, self._iterations, self._salt, self._prefix,
+         self.chunk_size, self.size, self.chunk_count) = _HEADER.unpack(header)
+
+        if magic != MAGIC:
+            raise ContainerError("Not a chunked container")
+        if version != VERSION:
+            raise ContainerError(f"Unsupported container version {version}")
+        # The header is untrusted; a crafted cost could make open spin for hours
+        if not 1 <= self._iterations <= SecureMnemonicEncryption.MAX_PBKDF2_ITERATIONS:
+            raise ContainerError("Iteration count out of range")
+        if self.chunk_size < 1 or self.chunk_count != max(1, -(-self.size // self.chunk_size)):
+            raise ContainerError("Inconsistent chunk layout")
+
+        index_end = _HEADER.size + self.chunk_count * _INDEX_ENTRY.size
+        if len(self._map) < index_end:
+            raise ContainerError("Container index truncated")
+
+        self._header_hash = hashlib.sha256(header).digest()
+        self._index: List[Tuple[int, int]] = [
+            _INDEX_ENTRY.unpack_from(self._map, _HEADER.size + i * _INDEX_ENTRY.size)
+            for i in range(self.chunk_count)
+        ]
+        for offset, length in self._index:
+            if offset < index_end or offset + length > len(self._map):
+                raise ContainerError("Chunk index points outside the container")
+
+    def read_chunk(self, index: int) -> bytes:
+        """
+        Decrypt and authenticate one chunk.
+
+        Raises:
+            ContainerError: On a wrong password or tampered chunk
+        """
+        offset, length = self._index[index]
+        try:
+            return self._aead.decrypt(_chunk_nonce(self._prefix, index),
+                                      self._map[offset:offset + length],
+                                      _chunk_aad(self._header_hash, index, index == self.chunk_count - 1))
+        except Exception:
+            raise ContainerError(f"Chunk {index} failed authentication")
+
+    def iter_chunks(self, first: int = 0, last: Optional[int] = None) -> Iterator[bytes]:
+        """Decrypt chunks first..last in parallel and yield them in order."""
+        last = self.chunk_count - 1 if last is None else last
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            yield from bounded_map(pool, self.read_chunk,
+                                   ((i,) for i in range(first, last + 1)), self.workers * 2)
+
+    def read(self, offset: int = 0, length: Optional[int] = None) -> bytes:
+        """
+        Read a plaintext byte range, decrypting only the chunks it spans.
+
+        Args:
+            offset: First plaintext byte
+            length: Number of bytes (to the end when omitted)
+        """
+        if offset < 0:
+            raise ValueError("offset must be non-negative")
+        end = self.size if length is None else min(self.size, offset + length)
+        if offset >= end:
+            return b""
+
+        first = offset // self.chunk_size
+        last = (end - 1) // self.chunk_size
+        data = b"".join(self.iter_chunks(first, last))
+        start = offset - first * self.chunk_size
+        return data[start:start + (end - offset)]
+
+    def decrypt_to_file(self, output_path: str) -> int:
+        """Decrypt the whole container to a file; returns bytes written."""
+        written = 0
+        try:
+            with open(output_path, 'wb') as dst:
+                for chunk in self.iter_chunks():
+                    written += dst.write(chunk)
+        except Exception:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise
+        return written
+
+    def close(self) -> None:
+        """Release the mapping and file handle."""
+        if isinstance(getattr(self, '_map', None), mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'ChunkedReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
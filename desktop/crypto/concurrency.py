@@ -0,0 +1,36 @@
+"""
+Concurrency Helpers
+Order-preserving, bounded fan-out over a thread pool
+
+Shared by the chunked container and the bulk storage APIs. Has no
+dependency on the cryptography package.
+"""
+
+from collections import deque
+from concurrent.futures import Executor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Tuple
+
+
+def bounded_map(executor: Executor, func: Callable, args: Iterable[Tuple], window: int) -> Iterator:
+    """
+    Like executor.map but with a bounded number of tasks in flight.
+
+    Args:
+        executor: Pool to run func on
+        func: Called as func(*item) for each item of args
+        args: Argument tuples; consumed lazily, so it may be endless
+        window: Maximum tasks submitted but not yet yielded
+
+    Yields:
+        func's results in input order
+    """
+    pending = deque()
+    args = iter(args)
+    for item in islice(args, window):
+        pending.append(executor.submit(func, *item))
+    while pending:
+        result = pending.popleft().result()
+        for item in islice(args, 1):
+            pending.append(executor.submit(func, *item))
+        yield result
@@ -0,0 +1,208 @@
+"""
+Binary Envelope Format
+Versioned, compact container for encrypted mnemonics
+
+Layout (all integers big-endian):
+
+    offset  size  field
+    0       1     MAGIC (0x9E)
+    1       1     version
+    2       1     KDF id (1 = PBKDF2-HMAC-SHA256, 2 = vault HKDF)
+    3       4     KDF iterations
+    7       1     salt length
+    8       n     salt
+    8+n     m     nonce (length fixed by the version's cipher)
+    8+n+m   ...   ciphertext
+
+Version 2 is AES-256-CBC with PKCS7 padding. Version 3 is AES-256-GCM,
+with the header bytes as associated data and a 16-byte tag after the
+ciphertext. For both, the key is the PBKDF2 output directly.
+
+Version 4 (multi-recipient) shares MAGIC and the version byte but has its
+own layout after them; crypto.multi_recipient parses it and
+SecureMnemonicEncryption dispatches to it.
+
+The optional text armor is a single standard base64 layer over the whole
+envelope. Legacy (v1) envelopes are base64 over a hex salt, so their first
+byte is always an ASCII hex digit and can never equal MAGIC.
+"""
+
+import base64
+import binascii
+import struct
+from typing import NamedTuple, Union
+
+MAGIC = 0x9E
+
+# Version 1 is the legacy Android/CryptoJS text format, which has no header
+VERSION_LEGACY = 1
+VERSION_CBC = 2
+VERSION_GCM = 3
+# Multi-recipient envelope; its layout is defined in crypto.multi_recipient
+VERSION_MULTI = 4
+
+KDF_PBKDF2_SHA256 = 1
+# HKDF-SHA256 from a vault session's master key (see crypto.vault_session);
+# the iterations field is 0 and the salt is the per-entry HKDF salt
+KDF_HKDF_VAULT = 2
+
+# Nonce length of each binary version's cipher
+NONCE_SIZES = {
+    VERSION_CBC: 16,
+    VERSION_GCM: 12,
+}
+
+_FIXED = struct.Struct(">BBBIB")
+
+# Characters detect_version examines for the armored prefix
+_PEEK_SIZE = 64
+
+# Reason codes for structurally invalid envelopes
+REASON_OK = 'ok'
+REASON_EMPTY = 'empty'
+REASON_BAD_BASE64 = 'bad_base64'
+REASON_BAD_LAYOUT = 'bad_layout'
+REASON_BAD_ITERATIONS = 'bad_iterations'
+REASON_BAD_SALT = 'bad_salt'
+REASON_MISSING_SALTED_PREFIX = 'missing_salted_prefix'
+REASON_BAD_BLOCK_ALIGNMENT = 'bad_block_alignment'
+REASON_TRUNCATED = 'truncated'
+REASON_BAD_MAGIC = 'bad_magic'
+REASON_UNSUPPORTED_VERSION = 'unsupported_version'
+REASON_UNSUPPORTED_KDF = 'unsupported_kdf'
+# Decryption-time failure: PKCS7 padding did not check out (usually a wrong password)
+REASON_BAD_PADDING = 'bad_padding'
+# Decryption-time failure: a vault entry (KDF_HKDF_VAULT) opens only through its VaultSession
+REASON_SESSION_REQUIRED = 'session_required'
+
+
+class EnvelopeHeader(NamedTuple):
+    """Parsed header of a binary envelope"""
+
+    version: int
+    kdf_id: int
+    iterations: int
+    salt: bytes
+    nonce: bytes
+
+
+class EnvelopeError(ValueError):
+    """Raised when envelope data is malformed; reason is one of the REASON_* codes"""
+
+    def __init__(self, message: str, reason: str = REASON_BAD_LAYOUT):
+        super().__init__(message)
+        self.reason = reason
+
+
+def pack_envelope(version: int, iterations: int, salt: bytes, nonce: bytes,
+                  ciphertext: bytes, kdf_id: int = KDF_PBKDF2_SHA256) -> bytes:
+    """
+    Serialize a binary envelope.
+
+    Returns:
+        Raw envelope bytes (no armor)
+    """
+    if NONCE_SIZES.get(version) != len(nonce):
+        raise EnvelopeError(f"Unsupported version {version} or bad nonce length",
+                            REASON_UNSUPPORTED_VERSION)
+    if not 0 < len(salt) < 256:
+        raise EnvelopeError("Salt must be 1-255 bytes", REASON_BAD_SALT)
+
+    header = _FIXED.pack(MAGIC, version, kdf_id, iterations, len(salt))
+    return b"".join((header, salt, nonce, ciphertext))
+
+
+def unpack_envelope(data: bytes):
+    """
+    Parse a raw binary envelope without copying the ciphertext.
+
+    Returns:
+        Tuple of (EnvelopeHeader, ciphertext memoryview, header bytes)
+
+    Raises:
+        EnvelopeError: If the data is not a well-formed binary envelope
+    """
+    view = memoryview(data)
+    if len(view) < _FIXED.size:
+        raise EnvelopeError("Envelope truncated", REASON_TRUNCATED)
+
+    magic, version, kdf_id, iterations, salt_len = _FIXED.unpack_from(view)
+    if magic != MAGIC:
+        raise EnvelopeError("Bad magic byte", REASON_BAD_MAGIC)
+    if version not in NONCE_SIZES:
+        raise EnvelopeError(f"Unsupported envelope version {version}", REASON_UNSUPPORTED_VERSION)
+
+    nonce_start = _FIXED.size + salt_len
+    body_start = nonce_start + NONCE_SIZES[version]
+    if len(view) < body_start:
+        raise EnvelopeError("Envelope truncated", REASON_TRUNCATED)
+
+    # Cipher-level shape: whole CBC blocks, or at least a GCM tag plus one byte
+    body_len = len(view) - body_start
+    if version == VERSION_CBC and (body_len == 0 or body_len % 16):
+        raise EnvelopeError("Ciphertext is not a whole number of blocks", REASON_BAD_BLOCK_ALIGNMENT)
+    if version == VERSION_GCM and body_len <= 16:
+        raise EnvelopeError("Ciphertext shorter than the authentication tag", REASON_TRUNCATED)
+
+    header = EnvelopeHeader(
+        version=version,
+        kdf_id=kdf_id,
+        iterations=iterations,
+        salt=bytes(view[_FIXED.size:nonce_start]),
+        nonce=bytes(view[nonce_start:body_start]),
+    )
+    return header, view[body_start:], bytes(view[:body_start])
+
+
+def armor(data: bytes) -> str:
+    """Apply the single text armor layer."""
+    return base64.b64encode(data).decode('ascii')
+
+
+def dearmor(text: Union[str, bytes]) -> bytes:
+    """Remove the text armor layer, ignoring whitespace from copy/paste."""
+    try:
+        return base64.b64decode(b"".join(_as_bytes(text).split()), validate=True)
+    except (binascii.Error, ValueError):
+        raise EnvelopeError("Invalid base64 armor", REASON_BAD_BASE64)
+
+
+def _as_bytes(text: Union[str, bytes]) -> bytes:
+    """ASCII-encode armored text; non-ASCII can never be valid base64."""
+    if isinstance(text, str):
+        try:
+            return text.encode('ascii')
+        except UnicodeEncodeError:
+            raise EnvelopeError("Invalid base64 armor", REASON_BAD_BASE64)
+    return bytes(text)
+
+
+def is_raw(data: Union[str, bytes, bytearray, memoryview]) -> bool:
+    """True for an unarmored binary envelope (bytes starting with MAGIC)."""
+    return not isinstance(data, str) and len(data) > 0 and data[0] == MAGIC
+
+
+def detect_version(data: Union[str, bytes, bytearray, memoryview]) -> int:
+    """
+    Identify the envelope version from its prefix in O(1).
+
+    Accepts raw binary envelopes or armored text, as str or ASCII bytes.
+    Anything without the magic byte is treated as the legacy v1 text format.
+    Leading whitespace (up to _PEEK_SIZE characters) is skipped, as dearmor
+    skips it, so a pasted envelope with a leading newline is still found.
+    """
+    if is_raw(data):
+        prefix = bytes(data[:2])
+    else:
+        head = data[:_PEEK_SIZE]
+        if not isinstance(head, str):
+            head = bytes(head)
+        # The first 4 base64 characters decode to the magic and version bytes
+        try:
+            prefix = base64.b64decode(head.lstrip()[:4], validate=True)
+        except (binascii.Error, ValueError):
+            return VERSION_LEGACY
+
+    if len(prefix) >= 2 and prefix[0] == MAGIC:
+        return prefix[1]
+    return VERSION_LEGACY
@@ -0,0 +1,174 @@
+"""
+PBKDF2 Backend Registry
+Chooses the fastest PBKDF2-HMAC-SHA256 implementation available on this host
+"""
+
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+# backend(password, salt, iterations, length) -> derived key
+KDFBackend = Callable[[bytes, bytes, int, int], bytes]
+
+# Published PBKDF2-HMAC-SHA256 vectors: (password, salt, iterations, length, expected hex)
+KNOWN_VECTORS = [
+    (b"password", b"salt", 1, 32,
+     "120fb6cffcf8b32c43e7225256c4f837a86548c92ccc35480805987cb70be17b"),
+    (b"password", b"salt", 2, 32,
+     "ae4d0c95af6b46d32d0adff928f06dd02a303f8ef3c251dfd6e2d85a95474c43"),
+    (b"password", b"salt", 4096, 32,
+     "c5e478d59288c841aa530db6845c4c8d962893a001ce4e11a4963873aa98134a"),
+    (b"passwordPASSWORDpassword", b"saltSALTsaltSALTsaltSALTsaltSALTsalt", 4096, 40,
+     "348c89dbcbd32b2f32d814b8116e84cf2b17347ebc1800181c4e2a1fb8dd53e1c635518c7dac47e9"),
+]
+
+# Iterations used when timing each backend during selection
+PROBE_ITERATIONS = 2000
+
+
+def _cryptography_pbkdf2(password: bytes, salt: bytes, iterations: int, length: int) -> bytes:
+    """PBKDF2 through cryptography's OpenSSL bindings."""
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=length,
+        salt=salt,
+        iterations=iterations,
+    )
+    return kdf.derive(password)
+
+
+def _hashlib_pbkdf2(password: bytes, salt: bytes, iterations: int, length: int) -> bytes:
+    """PBKDF2 through the standard library."""
+    return hashlib.pbkdf2_hmac('sha256', password, salt, iterations, length)
+
+
+_backends: Dict[str, KDFBackend] = {
+    'cryptography': _cryptography_pbkdf2,
+    'hashlib': _hashlib_pbkdf2,
+}
+_selected: Optional[str] = None
+_diagnostics: Dict[str, object] = {}
+_lock = threading.Lock()
+
+
+def register_backend(name: str, backend: KDFBackend) -> None:
+    """
+    Register a PBKDF2-HMAC-SHA256 implementation.
+
+    The next call to get_backend() re-runs selection so the new backend
+    is verified and timed alongside the existing ones.
+
+    Args:
+        name: Unique backend name
+        backend: Callable taking (password, salt, iterations, length)
+    """
+    global _selected
+    with _lock:
+        _backends[name] = backend
+        _selected = None
+
+
+def available_backends() -> list:
+    """Return the names of all registered backends."""
+    return list(_backends)
+
+
+def _verify(backend: KDFBackend) -> bool:
+    """Check a backend against the known vectors."""
+    try:
+        for password, salt, iterations, length, expected in KNOWN_VECTORS:
+            if backend(password, salt, iterations, length).hex() != expected:
+                return False
+        return True
+    except Exception:
+        return False
+
+
+def _time(backend: KDFBackend) -> float:
+    """Best-of-three wall time of one probe derivation."""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        backend(b"probe-password", b"probe-salt-16byt", PROBE_ITERATIONS, 32)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _select() -> str:
+    """Verify and time every backend, then remember the fastest. Caller holds the lock."""
+    global _selected, _diagnostics
+    timings = {}
+    rejected = []
+
+    for name, backend in _backends.items():
+        if _verify(backend):
+            timings[name] = _time(backend)
+        else:
+            rejected.append(name)
+
+    if not timings:
+        raise RuntimeError("No PBKDF2 backend passed the known-vector check")
+
+    _selected = min(timings, key=timings.get)
+    _diagnostics = {
+        'selected': _selected,
+        'probe_iterations': PROBE_ITERATIONS,
+        'timings': timings,
+        'rejected': rejected,
+        'forced': False
+    }
+    return _selected
+
+
+def select_backend(name: str) -> None:
+    """
+    Force a specific backend instead of the automatic choice.
+
+    Raises:
+        KeyError: If no backend with that name is registered
+        ValueError: If the backend fails the known-vector check
+    """
+    global _selected, _diagnostics
+    with _lock:
+        backend = _backends[name]
+        if not _verify(backend):
+            raise ValueError(f"KDF backend '{name}' failed the known-vector check")
+        _selected = name
+        _diagnostics = {'selected': name, 'forced': True}
+
+
+def get_backend() -> KDFBackend:
+    """Return the selected backend, running selection on first use."""
+    with _lock:
+        name = _selected or _select()
+        return _backends[name]
+
+
+def pbkdf2_sha256(password: bytes, salt: bytes, iterations: int, length: int = 32) -> bytes:
+    """Derive a key with the selected PBKDF2-HMAC-SHA256 backend."""
+    return get_backend()(password, salt, iterations, length)
+
+
+def pbkdf2_sha256_into(password: bytes, salt: bytes, iterations: int, out) -> None:
+    """
+    Derive a key directly into a writable buffer of the desired length.
+
+    The cryptography backend writes into the buffer without creating an
+    intermediate bytes object; other backends derive and copy.
+    """
+    backend = get_backend()
+    if backend is _cryptography_pbkdf2 and hasattr(PBKDF2HMAC, 'derive_into'):
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=len(out), salt=salt, iterations=iterations)
+        kdf.derive_into(password, out)
+    else:
+        out[:] = backend(password, salt, iterations, len(out))
+
+
+def backend_info() -> Dict[str, object]:
+    """Return diagnostics about the chosen backend, selecting one if needed."""
+    get_backend()
+    return dict(_diagnostics)
@@ -0,0 +1,129 @@
+"""
+Derived Key Cache
+Bounded in-process LRU cache of PBKDF2 output for repeated decrypts
+"""
+
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+
+def _zeroize(buffer: bytearray) -> None:
+    """Overwrite a key buffer in place."""
+    for i in range(len(buffer)):
+        buffer[i] = 0
+
+
+class DerivedKeyCache:
+    """
+    LRU cache of derived keys keyed on (salt, password fingerprint).
+
+    Passwords are never stored: the fingerprint is an HMAC under a random
+    per-cache secret. Keys are held in bytearrays and zeroed when evicted,
+    expired or cleared.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl_seconds: Optional[float] = 300.0):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of keys kept before LRU eviction
+            ttl_seconds: Lifetime of an entry, or None to never expire
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._secret = os.urandom(32)
+        self._entries: "OrderedDict[Tuple[bytes, int, bytes], Tuple[bytearray, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _fingerprint(self, password: bytes) -> bytes:
+        """Keyed fingerprint of a password, meaningless outside this cache."""
+        return hmac.new(self._secret, password, hashlib.sha256).digest()
+
+    def get_or_derive(self, salt: bytes, password: bytes,
+                      derive: Callable[[], bytes], iterations: int = 0) -> bytes:
+        """
+        Return the cached key for (salt, password), deriving it on a miss.
+
+        Args:
+            salt: KDF salt of the envelope
+            password: Encoded password
+            derive: Called without arguments to compute the key on a miss
+            iterations: KDF cost, so one salt under two costs never collides
+
+        Returns:
+            The derived key
+        """
+        cache_key = (bytes(salt), iterations, self._fingerprint(password))
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                key, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(cache_key)
+                    self.hits += 1
+                    return bytes(key)
+                self._discard(cache_key)
+            self.misses += 1
+
+        # Derive outside the lock so concurrent misses do not serialize
+        derived = derive()
+
+        with self._lock:
+            if cache_key in self._entries:
+                self._discard(cache_key)
+            expires_at = now + self.ttl_seconds if self.ttl_seconds is not None else float('inf')
+            self._entries[cache_key] = (bytearray(derived), expires_at)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+        return derived
+
+    def _discard(self, cache_key: Tuple[bytes, int, bytes]) -> None:
+        """Remove one entry and zero its key. Caller holds the lock."""
+        key, _ = self._entries.pop(cache_key)
+        _zeroize(key)
+
+    def purge_expired(self) -> int:
+        """Drop every expired entry and return how many were removed."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (_, expires_at) in self._entries.items() if expires_at <= now]
+            for cache_key in expired:
+                self._discard(cache_key)
+        return len(expired)
+
+    def clear(self) -> None:
+        """Zero and drop every cached key."""
+        with self._lock:
+            for cache_key in list(self._entries):
+                self._discard(cache_key)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,191 @@
+"""
+Instrumentation Hooks
+Optional per-stage latency histograms and outcome counters
+
+Instrumentation is off by default. While off, stage() returns one shared
+no-op context manager and record() returns at once, so the hooks cost a
+global lookup and a call. Turn it on with enable() and read the results
+with Metrics.to_dict() or Metrics.to_prometheus().
+"""
+
+import bisect
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+# Upper bounds in seconds; tuned for microsecond-level cipher work up to
+# multi-second PBKDF2 on slow hardware
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class _Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus style."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def to_dict(self) -> Dict[str, object]:
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            running += count
+            cumulative['+Inf' if bound == float('inf') else repr(bound)] = running
+        return {'count': self.count, 'sum': self.sum, 'buckets': cumulative}
+
+
+class _Stage:
+    """Times one stage and feeds the stage histogram."""
+
+    __slots__ = ('_metrics', '_name', '_start')
+
+    def __init__(self, metrics: 'Metrics', name: str):
+        self._metrics = metrics
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._metrics.observe(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class _NullStage:
+    """Shared do-nothing stage used while instrumentation is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Metrics:
+    """Registry of stage latency histograms and operation outcome counters."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = "mnemonic"):
+        """
+        Args:
+            buckets: Histogram upper bounds in seconds, ascending
+            namespace: Prefix for exported metric names
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self._histograms: Dict[str, _Histogram] = {}
+        self._counters: Dict[Tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name: str) -> _Stage:
+        """Context manager timing one stage."""
+        return _Stage(self, name)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Add one latency sample for a stage."""
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = _Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def record(self, operation: str, outcome: str, reason: str = "") -> None:
+        """Count one finished operation, e.g. ('decrypt', 'failure', 'bad_base64')."""
+        key = (operation, outcome, reason)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def reset(self) -> None:
+        """Drop every sample and counter."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def to_dict(self) -> Dict[str, object]:
+        """Snapshot as plain Python data."""
+        with self._lock:
+            return {
+                'stages': {name: histogram.to_dict() for name, histogram in sorted(self._histograms.items())},
+                'operations': [
+                    {'operation': operation, 'outcome': outcome, 'reason': reason, 'count': count}
+                    for (operation, outcome, reason), count in sorted(self._counters.items())
+                ]
+            }
+
+    def to_prometheus(self) -> str:
+        """Snapshot in the Prometheus text exposition format."""
+        snapshot = self.to_dict()
+        stage_metric = f"{self.namespace}_stage_duration_seconds"
+        counter_metric = f"{self.namespace}_operations_total"
+
+        lines = [f"# HELP {stage_metric} Latency of each encrypt/decrypt/storage stage.",
+                 f"# TYPE {stage_metric} histogram"]
+        for stage, histogram in snapshot['stages'].items():
+            label = f'stage="{_escape(stage)}"'
+            for bound, count in histogram['buckets'].items():
+                lines.append(f'{stage_metric}_bucket{{{label},le="{bound}"}} {count}')
+            lines.append(f"{stage_metric}_sum{{{label}}} {histogram['sum']!r}")
+            lines.append(f"{stage_metric}_count{{{label}}} {histogram['count']}")
+
+        lines += [f"# HELP {counter_metric} Finished operations by outcome and failure reason.",
+                  f"# TYPE {counter_metric} counter"]
+        for row in snapshot['operations']:
+            labels = ",".join(f'{key}="{_escape(row[key])}"' for key in ('operation', 'outcome', 'reason'))
+            lines.append(f"{counter_metric}{{{labels}}} {row['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+_active: Optional[Metrics] = None
+
+
+def enable(metrics: Optional[Metrics] = None) -> Metrics:
+    """Start collecting into metrics (a fresh registry by default) and return it."""
+    global _active
+    _active = metrics or Metrics()
+    return _active
+
+
+def disable() -> None:
+    """Stop collecting; hooks go back to being no-ops."""
+    global _active
+    _active = None
+
+
+def get_metrics() -> Optional[Metrics]:
+    """The active registry, or None while disabled."""
+    return _active
+
+
+def stage(name: str):
+    """Hook: time a stage if instrumentation is enabled."""
+    metrics = _active
+    if metrics is None:
+        return _NULL_STAGE
+    return _Stage(metrics, name)
+
+
+def record(operation: str, outcome: str, reason: str = "") -> None:
+    """Hook: count an operation outcome if instrumentation is enabled."""
+    metrics = _active
+    if metrics is not None:
+        metrics.record(operation, outcome, reason)
@@ -0,0 +1,297 @@
+"""
+Multi-Recipient Envelopes
+One AES-GCM payload whose data key is wrapped once per recipient password
+
+Layout (all integers big-endian):
+
+    offset  size  field
+    0       1     MAGIC (0x9E)
+    1       1     version (4)
+    2       12    payload nonce
+    14      1     recipient count
+    15      ...   recipient slots
+    ...     ...   payload ciphertext || 16-byte GCM tag
+
+Each recipient slot is:
+
+    1       label length
+    n       label (UTF-8)
+    1       KDF id (1 = PBKDF2-HMAC-SHA256)
+    4       KDF iterations
+    1       salt length
+    m       salt
+    40      data key wrapped with AES key wrap (RFC 3394) under the PBKDF2 key
+
+The payload's associated data is the first 14 bytes only, so recipients
+can be added, removed or re-keyed by rewriting their 40-byte slot while
+the payload ciphertext stays byte-for-byte the same. Key wrap carries its
+own integrity check, so a wrong password is detected before the payload
+is touched.
+"""
+
+import os
+import struct
+from typing import List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.keywrap import InvalidUnwrap, aes_key_unwrap, aes_key_wrap
+
+from crypto import envelope
+from crypto.kdf_backends import pbkdf2_sha256
+from crypto.secure_encryption import SecureMnemonicEncryption
+
+NONCE_SIZE = 12
+DATA_KEY_SIZE = 32
+WRAPPED_KEY_SIZE = DATA_KEY_SIZE + 8
+MAX_RECIPIENTS = 255
+
+_PREFIX = struct.Struct(">BB12sB")
+_KDF = struct.Struct(">BIB")
+
+
+class RecipientSlot(NamedTuple):
+    """One recipient's wrapped copy of the data key"""
+
+    label: str
+    iterations: int
+    salt: bytes
+    wrapped_key: bytes
+
+
+class MultiRecipientEnvelope(NamedTuple):
+    """Parsed multi-recipient envelope"""
+
+    nonce: bytes
+    recipients: Tuple[RecipientSlot, ...]
+    ciphertext: bytes
+
+    def labels(self) -> List[str]:
+        """Recipient labels in slot order."""
+        return [slot.label for slot in self.recipients]
+
+
+def _wrap_for(label: str, password: str, data_key: bytes, iterations: int) -> RecipientSlot:
+    """Wrap the data key under a fresh PBKDF2 key for one recipient."""
+    if not password or len(password) < 8:
+        raise ValueError("Password must be at least 8 characters")
+    if not label or len(label.encode('utf-8')) > 255:
+        raise ValueError("Recipient label must be 1-255 bytes")
+
+    salt = os.urandom(SecureMnemonicEncryption.SALT_SIZE)
+    kek = pbkdf2_sha256(password.encode('utf-8'), salt, iterations)
+    return RecipientSlot(label, iterations, salt, aes_key_wrap(kek, data_key))
+
+
+def _unwrap(slot: RecipientSlot, password: str) -> Optional[bytes]:
+    """Recover the data key from a slot, or None if the password is wrong."""
+    kek = pbkdf2_sha256(password.encode('utf-8'), slot.salt, slot.iterations)
+    try:
+        return aes_key_unwrap(kek, slot.wrapped_key)
+    except InvalidUnwrap:
+        return None
+
+
+def _associated_data(nonce: bytes) -> bytes:
+    """Payload AAD: magic, version and nonce, but not the recipient table."""
+    return bytes((envelope.MAGIC, envelope.VERSION_MULTI)) + nonce
+
+
+def pack(parsed: MultiRecipientEnvelope, armor: bool = True) -> Union[str, bytes]:
+    """Serialize an envelope; armored as base64 text unless armor is False."""
+    if not 1 <= len(parsed.recipients) <= MAX_RECIPIENTS:
+        raise ValueError(f"An envelope needs 1-{MAX_RECIPIENTS} recipients")
+
+    parts = [_PREFIX.pack(envelope.MAGIC, envelope.VERSION_MULTI, parsed.nonce, len(parsed.recipients))]
+    for slot in parsed.recipients:
+        label = slot.label.encode('utf-8')
+        parts += [bytes([len(label)]), label,
+                  _KDF.pack(envelope.KDF_PBKDF2_SHA256, slot.iterations, len(slot.salt)),
+                  slot.salt, slot.wrapped_key]
+    parts.append(parsed.ciphertext)
+
+    packed = b"".join(parts)
+    return envelope.armor(packed) if armor else packed
+
+
+def unpack(data: Union[str, bytes]) -> MultiRecipientEnvelope:
+    """
+    Parse an armored or raw multi-recipient envelope.
+
+    Raises:
+        envelope.EnvelopeError: With a reason code when the data is malformed
+    """
+    raw = data if envelope.is_raw(data) else envelope.dearmor(data)
+    view = memoryview(raw)
+    if len(view) < _PREFIX.size:
+        raise envelope.EnvelopeError("Envelope truncated", envelope.REASON_TRUNCATED)
+
+    magic, version, nonce, count = _PREFIX.unpack_from(view)
+    if magic != envelope.MAGIC:
+        raise envelope.EnvelopeError("Bad magic byte", envelope.REASON_BAD_MAGIC)
+    if version != envelope.VERSION_MULTI:
+        raise envelope.EnvelopeError(f"Not a multi-recipient envelope (version {version})",
+                                     envelope.REASON_UNSUPPORTED_VERSION)
+    if count == 0:
+        raise envelope.EnvelopeError("Envelope has no recipients", envelope.REASON_BAD_LAYOUT)
+
+    offset = _PREFIX.size
+    recipients = []
+    try:
+        for _ in range(count):
+            label_len = view[offset]
+            label = bytes(view[offset + 1:offset + 1 + label_len]).decode('utf-8')
+            offset += 1 + label_len
+
+            kdf_id, iterations, salt_len = _KDF.unpack_from(view, offset)
+            offset += _KDF.size
+            salt = bytes(view[offset:offset + salt_len])
+            wrapped_key = bytes(view[offset + salt_len:offset + salt_len + WRAPPED_KEY_SIZE])
+            offset += salt_len + WRAPPED_KEY_SIZE
+
+            if kdf_id != envelope.KDF_PBKDF2_SHA256:
+                raise envelope.EnvelopeError("Unsupported KDF", envelope.REASON_UNSUPPORTED_KDF)
+            if not 1 <= iterations <= SecureMnemonicEncryption.MAX_PBKDF2_ITERATIONS:
+                raise envelope.EnvelopeError("Iteration count out of range", envelope.REASON_BAD_ITERATIONS)
+            if len(wrapped_key) != WRAPPED_KEY_SIZE:
+                raise envelope.EnvelopeError("Envelope truncated", envelope.REASON_TRUNCATED)
+            recipients.append(RecipientSlot(label, iterations, salt, wrapped_key))
+    except (IndexError, struct.error, UnicodeDecodeError):
+        raise envelope.EnvelopeError("Recipient table is malformed", envelope.REASON_TRUNCATED)
+
+    if len(view) - offset <= 16:
+        raise envelope.EnvelopeError("Ciphertext shorter than the authentication tag",
+                                     envelope.REASON_TRUNCATED)
+
+    return MultiRecipientEnvelope(nonce, tuple(recipients), bytes(view[offset:]))
+
+
+def encrypt_for_recipients(mnemonic: str, recipients: Mapping[str, str],
+                           iterations: int = SecureMnemonicEncryption.PBKDF2_ITERATIONS,
+                           armor: bool = True) -> Union[str, bytes]:
+    """
+    Encrypt a mnemonic once for several passwords.
+
+    Args:
+        mnemonic: Mnemonic phrase to encrypt
+        recipients: Mapping of recipient label to password
+        iterations: PBKDF2 cost for each recipient's key
+        armor: Return base64 text (True) or raw bytes
+
+    Returns:
+        The multi-recipient envelope
+    """
+    if not mnemonic or not mnemonic.strip():
+        raise ValueError("Mnemonic cannot be empty")
+    if not recipients:
+        raise ValueError("At least one recipient is required")
+
+    data_key = AESGCM.generate_key(bit_length=256)
+    nonce = os.urandom(NONCE_SIZE)
+    ciphertext = AESGCM(data_key).encrypt(nonce, mnemonic.encode('utf-8'), _associated_data(nonce))
+    slots = tuple(_wrap_for(label, password, data_key, iterations)
+                  for label, password in recipients.items())
+    return pack(MultiRecipientEnvelope(nonce, slots, ciphertext), armor)
+
+
+def _find_data_key(parsed: MultiRecipientEnvelope, password: str,
+                   label: Optional[str] = None) -> Optional[bytes]:
+    """Try the password against one labelled slot, or every slot in turn."""
+    for slot in parsed.recipients:
+        if label is not None and slot.label != label:
+            continue
+        data_key = _unwrap(slot, password)
+        if data_key is not None:
+            return data_key
+    return None
+
+
+def decrypt_for_recipient(data: Union[str, bytes], password: str,
+                          label: Optional[str] = None) -> Optional[str]:
+    """
+    Decrypt a multi-recipient envelope with any recipient's password.
+
+    Args:
+        data: Armored or raw envelope
+        password: One recipient's password
+        label: Recipient to try; without it every slot is tried, costing
+            one PBKDF2 per slot in the worst case
+
+    Returns:
+        The mnemonic, or None on failure
+    """
+    try:
+        parsed = unpack(data)
+        data_key = _find_data_key(parsed, password, label)
+        if data_key is None:
+            return None
+        plaintext = AESGCM(data_key).decrypt(parsed.nonce, parsed.ciphertext,
+                                             _associated_data(parsed.nonce))
+        return plaintext.decode('utf-8')
+    except Exception:
+        return None
+
+
+def add_recipient(data: Union[str, bytes], password: str, label: str, new_password: str,
+                  iterations: int = SecureMnemonicEncryption.PBKDF2_ITERATIONS) -> Union[str, bytes]:
+    """
+    Grant a new recipient access; the payload is not re-encrypted.
+
+    Args:
+        data: Existing envelope
+        password: Password of any current recipient
+        label: Label for the new recipient (must be unused)
+        new_password: The new recipient's password
+
+    Raises:
+        ValueError: If the password is wrong or the label is taken
+    """
+    parsed = unpack(data)
+    if label in parsed.labels():
+        raise ValueError(f"Recipient '{label}' already exists")
+    data_key = _find_data_key(parsed, password)
+    if data_key is None:
+        raise ValueError("Password does not match any recipient")
+
+    slot = _wrap_for(label, new_password, data_key, iterations)
+    return pack(parsed._replace(recipients=parsed.recipients + (slot,)), isinstance(data, str))
+
+
+def remove_recipient(data: Union[str, bytes], label: str) -> Union[str, bytes]:
+    """
+    Drop a recipient's slot.
+
+    This only removes the wrapped key from this copy of the envelope; it
+    cannot revoke a data key the recipient has already unwrapped.
+
+    Raises:
+        ValueError: If the label is unknown or it is the last recipient
+    """
+    parsed = unpack(data)
+    remaining = tuple(slot for slot in parsed.recipients if slot.label != label)
+    if len(remaining) == len(parsed.recipients):
+        raise ValueError(f"Unknown recipient '{label}'")
+    if not remaining:
+        raise ValueError("Cannot remove the last recipient")
+    return pack(parsed._replace(recipients=remaining), isinstance(data, str))
+
+
+def change_password(data: Union[str, bytes], label: str, old_password: str,
+                    new_password: str) -> Union[str, bytes]:
+    """
+    Re-wrap one recipient's slot under a new password with a fresh salt.
+
+    Raises:
+        ValueError: If the label is unknown or the old password is wrong
+    """
+    parsed = unpack(data)
+    if label not in parsed.labels():
+        raise ValueError(f"Unknown recipient '{label}'")
+    data_key = _find_data_key(parsed, old_password, label)
+    if data_key is None:
+        raise ValueError("Old password is incorrect")
+
+    recipients = tuple(
+        _wrap_for(label, new_password, data_key, slot.iterations) if slot.label == label else slot
+        for slot in parsed.recipients
+    )
+    return pack(parsed._replace(recipients=recipients), isinstance(data, str))
@@ -0,0 +1,102 @@
+"""
+Password Strength Checking
+Entropy estimate and recommendations; needs no cryptography imports
+"""
+
+import math
+
+
+class PasswordStrengthChecker:
+    """Utility class for checking password strength."""
+
+    @staticmethod
+    def calculate_entropy(password: str) -> float:
+        """Calculate estimated entropy bits for a password."""
+        if not password:
+            return 0.0
+
+        charset_size = 0
+        if any(c.islower() for c in password):
+            charset_size += 26
+        if any(c.isupper() for c in password):
+            charset_size += 26
+        if any(c.isdigit() for c in password):
+            charset_size += 10
+        if any(c in "!@#$%^&*()_+-=[]{}|;:,.<>?" for c in password):
+            charset_size += 23
+
+        if charset_size == 0:
+            return 0.0
+
+        return len(password) * math.log2(charset_size)
+
+    @staticmethod
+    def check_password_strength(password: str) -> dict:
+        """
+        Check password strength and return detailed analysis.
+
+        Returns:
+            Dictionary with strength analysis
+        """
+        if not password:
+            return {
+                'score': 0,
+                'strength': 'Very Weak',
+                'entropy': 0.0,
+                'recommendations': ['Password cannot be empty']
+            }
+
+        issues = []
+        score = 0
+
+        # Length check
+        if len(password) < 8:
+            issues.append('Use at least 8 characters (12+ recommended)')
+        elif len(password) < 12:
+            issues.append('Consider using 12+ characters for better security')
+            score += 1
+        else:
+            score += 2
+
+        # Character variety checks
+        if any(c.islower() for c in password):
+            score += 1
+        else:
+            issues.append('Add lowercase letters')
+
+        if any(c.isupper() for c in password):
+            score += 1
+        else:
+            issues.append('Add uppercase letters')
+
+        if any(c.isdigit() for c in password):
+            score += 1
+        else:
+            issues.append('Add numbers')
+
+        if any(c in "!@#$%^&*()_+-=[]{}|;:,.<>?" for c in password):
+            score += 1
+        else:
+            issues.append('Add special characters (!@#$%^&*)')
+
+        # Calculate entropy
+        entropy = PasswordStrengthChecker.calculate_entropy(password)
+
+        # Determine strength level
+        if score >= 6 and entropy >= 70:
+            strength = 'Very Strong'
+        elif score >= 5 and entropy >= 60:
+            strength = 'Strong'
+        elif score >= 4 and entropy >= 50:
+            strength = 'Moderate'
+        elif score >= 2:
+            strength = 'Weak'
+        else:
+            strength = 'Very Weak'
+
+        return {
+            'score': score,
+            'strength': strength,
+            'entropy': entropy,
+            'recommendations': issues
+        }
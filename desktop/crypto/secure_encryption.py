@@ -5,11 +5,51 @@ This module provides the exact same encryption format as CryptoJS AES.encrypt()
 
 import os
 import base64
+import binascii
 import hashlib
+import hmac
+import mmap
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+from cryptography.exceptions import InvalidTag
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives import padding
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.keywrap import InvalidUnwrap, aes_key_unwrap
+
+from crypto import envelope, metrics
+from crypto.concurrency import bounded_map
+from crypto.key_cache import DerivedKeyCache
+from crypto.kdf_backends import pbkdf2_sha256, pbkdf2_sha256_into
+from crypto.secure_memory import SecureArena
+# Re-exported: PasswordStrengthChecker lived here before it got its own module
+from crypto.password_strength import PasswordStrengthChecker  # noqa: F401
+
+# Chunk size for streaming file encryption; memory use is bounded by this
+STREAM_CHUNK_SIZE = 64 * 1024
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# Failure reasons reported to crypto.metrics beyond the envelope.REASON_* codes
+REASON_NO_PASSWORD = 'no_password'
+REASON_AUTHENTICATION_FAILED = 'authentication_failed'
+REASON_BAD_UTF8 = 'bad_utf8'
+REASON_VERIFICATION_FAILED = 'verification_failed'
+
+
+def _wipe(buffer: bytearray) -> None:
+    """Zero a mutable buffer holding secret material."""
+    buffer[:] = bytes(len(buffer))
+
+
+def _decode_and_wipe(buffer: bytearray) -> Optional[str]:
+    """Decode a UTF-8 plaintext buffer to str, then wipe the buffer."""
+    try:
+        return buffer.decode('utf-8')
+    finally:
+        _wipe(buffer)
 
 
 class CryptoJSAES:
@@ -24,9 +64,10 @@ class CryptoJSAES:
         derived = b''
         h = b''
 
-        while len(derived) < (key_len + iv_len):
-            h = hashlib.md5(h + password + salt).digest()
-            derived += h
+        with metrics.stage('evp_bytes_to_key'):
+            while len(derived) < (key_len + iv_len):
+                h = hashlib.md5(h + password + salt).digest()
+                derived += h
 
         return derived[:key_len], derived[key_len:key_len + iv_len]
 
@@ -36,28 +77,26 @@ class CryptoJSAES:
         Encrypt plaintext with password using CryptoJS-compatible format
         Returns base64 string in CryptoJS format: "Salted__" + salt + encrypted_data
         """
-        # Generate random 8-byte salt (CryptoJS standard)
-        salt = os.urandom(8)
+        result = CryptoJSAES.encrypt_buffer(plaintext.encode('utf-8'), password.encode('utf-8'))
 
-        # Derive key and IV using CryptoJS method
-        key, iv = CryptoJSAES.derive_key_and_iv(password.encode('utf-8'), salt)
+        # Return base64 encoded
+        return base64.b64encode(result).decode('ascii')
 
-        # Pad plaintext using PKCS7
-        padder = padding.PKCS7(128).padder()
-        padded_data = padder.update(plaintext.encode('utf-8'))
-        padded_data += padder.finalize()
+    @staticmethod
+    def encrypt_buffer(plaintext: BytesLike, password: BytesLike) -> bytes:
+        """
+        Encrypt a bytes-like plaintext; returns raw "Salted__" + salt + ciphertext.
 
-        # Encrypt using AES-256-CBC
-        cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
-        encryptor = cipher.encryptor()
-        encrypted = encryptor.update(padded_data) + encryptor.finalize()
+        The padded plaintext lives in a bytearray that is wiped afterwards.
+        """
+        # Generate random 8-byte salt (CryptoJS standard)
+        salt = os.urandom(8)
 
-        # Format as CryptoJS: "Salted__" + salt + encrypted_data
-        salted_prefix = b"Salted__"
-        result = salted_prefix + salt + encrypted
+        # Derive key and IV using CryptoJS method
+        key, iv = CryptoJSAES.derive_key_and_iv(password, salt)
 
-        # Return base64 encoded
-        return base64.b64encode(result).decode('ascii')
+        # Encrypt using AES-256-CBC, formatted as CryptoJS: "Salted__" + salt + encrypted_data
+        return b"Salted__" + salt + _cbc_encrypt(key, iv, plaintext)
 
     @staticmethod
     def decrypt(encrypted_data: str, password: str) -> str:
@@ -67,32 +106,300 @@ class CryptoJSAES:
         try:
             # Decode base64
             data = base64.b64decode(encrypted_data)
+        except Exception:
+            return None
+
+        return CryptoJSAES.decrypt_raw(data, password)
+
+    @staticmethod
+    def decrypt_raw(data: bytes, password: str) -> str:
+        """
+        Decrypt already base64-decoded CryptoJS data ("Salted__" + salt + ciphertext)
+        """
+        try:
+            plaintext = CryptoJSAES.decrypt_buffer(data, password.encode('utf-8'))
+            try:
+                return plaintext.decode('utf-8')
+            finally:
+                _wipe(plaintext)
+
+        except Exception:
+            return None
+
+    @staticmethod
+    def decrypt_buffer(data: BytesLike, password: BytesLike) -> bytearray:
+        """
+        Decrypt raw CryptoJS data without intermediate copies.
+
+        The ciphertext is read through a memoryview and decrypted into a
+        bytearray, which is unpadded in place and returned so the caller
+        can wipe it.
+
+        Raises:
+            ValueError: On bad format or bad padding (usually a wrong password)
+        """
+        view = memoryview(data).cast('B')
+
+        # Check for "Salted__" prefix
+        if view[:8] != b"Salted__":
+            raise ValueError("Invalid CryptoJS format")
+
+        # Extract salt (8 bytes after "Salted__") and encrypted data
+        encrypted = view[16:]
+        if not encrypted or len(encrypted) % 16:
+            raise ValueError("Ciphertext is not a whole number of blocks")
+
+        # Derive key and IV
+        key, iv = CryptoJSAES.derive_key_and_iv(password, bytes(view[8:16]))
+
+        # Decrypt and remove padding in place
+        return _cbc_decrypt(key, iv, encrypted)
+
+    @staticmethod
+    def encrypt_stream(source: BinaryIO, destination: BinaryIO, password: str,
+                       chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+        """
+        Encrypt a binary stream in fixed-size chunks with constant memory.
+
+        Output is raw "Salted__" + salt + ciphertext, the same bytes as
+        `openssl enc -aes-256-cbc -md md5` (without -a).
+
+        Returns:
+            Number of bytes written
+        """
+        return CryptoJSAES._encrypt_chunks(iter(lambda: source.read(chunk_size), b""),
+                                           destination, password)
+
+    @staticmethod
+    def decrypt_stream(source: BinaryIO, destination: BinaryIO, password: str,
+                       chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+        """
+        Decrypt a stream produced by encrypt_stream or `openssl enc`.
 
-            # Check for "Salted__" prefix
-            if not data.startswith(b"Salted__"):
-                raise ValueError("Invalid CryptoJS format")
+        Returns:
+            Number of plaintext bytes written
 
-            # Extract salt and encrypted data
-            salt = data[8:16]  # 8 bytes after "Salted__"
-            encrypted = data[16:]
+        Raises:
+            ValueError: On a missing "Salted__" header, truncated data or
+                bad padding (usually a wrong password)
+        """
+        header = source.read(16)
+        return CryptoJSAES._decrypt_chunks(header, iter(lambda: source.read(chunk_size), b""),
+                                           destination, password)
 
-            # Derive key and IV
-            key, iv = CryptoJSAES.derive_key_and_iv(password.encode('utf-8'), salt)
+    @staticmethod
+    def encrypt_file(input_path: str, output_path: str, password: str,
+                     chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+        """Encrypt a file, memory-mapping the input; returns bytes written."""
+        with open(input_path, 'rb') as src, open(output_path, 'wb') as dst:
+            with _map_file(src) as view:
+                chunks = (view[i:i + chunk_size] for i in range(0, len(view), chunk_size))
+                return CryptoJSAES._encrypt_chunks(chunks, dst, password)
 
-            # Decrypt
-            cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
-            decryptor = cipher.decryptor()
-            padded_plaintext = decryptor.update(encrypted) + decryptor.finalize()
+    @staticmethod
+    def decrypt_file(input_path: str, output_path: str, password: str,
+                     chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+        """
+        Decrypt a file, memory-mapping the input; returns bytes written.
+
+        The partial output file is removed if decryption fails.
+        """
+        try:
+            with open(input_path, 'rb') as src, open(output_path, 'wb') as dst:
+                with _map_file(src) as view:
+                    chunks = (view[i:i + chunk_size] for i in range(16, len(view), chunk_size))
+                    return CryptoJSAES._decrypt_chunks(bytes(view[:16]), chunks, dst, password)
+        except Exception:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise
 
-            # Remove padding
-            unpadder = padding.PKCS7(128).unpadder()
-            plaintext = unpadder.update(padded_plaintext)
-            plaintext += unpadder.finalize()
+    @staticmethod
+    def _encrypt_chunks(chunks: Iterable, destination: BinaryIO, password: str) -> int:
+        """Pad and encrypt an iterable of byte chunks into destination"""
+        salt = os.urandom(8)
+        key, iv = CryptoJSAES.derive_key_and_iv(password.encode('utf-8'), salt)
+        padder = padding.PKCS7(128).padder()
+        encryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).encryptor()
 
-            return plaintext.decode('utf-8')
+        written = destination.write(b"Salted__" + salt)
+        for chunk in chunks:
+            written += destination.write(encryptor.update(padder.update(chunk)))
+        written += destination.write(encryptor.update(padder.finalize()) + encryptor.finalize())
+        return written
 
+    @staticmethod
+    def _decrypt_chunks(header: bytes, chunks: Iterable, destination: BinaryIO, password: str) -> int:
+        """Decrypt and unpad an iterable of ciphertext chunks into destination"""
+        if len(header) != 16 or not header.startswith(b"Salted__"):
+            raise ValueError("Invalid CryptoJS/OpenSSL format")
+
+        key, iv = CryptoJSAES.derive_key_and_iv(password.encode('utf-8'), header[8:16])
+        decryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).decryptor()
+        unpadder = padding.PKCS7(128).unpadder()
+
+        written = 0
+        for chunk in chunks:
+            written += destination.write(unpadder.update(decryptor.update(chunk)))
+        # finalize() raises on truncated ciphertext or bad padding
+        written += destination.write(unpadder.update(decryptor.finalize()) + unpadder.finalize())
+        return written
+
+
+def _record(operation: str, reason: str) -> None:
+    """Count an operation outcome from its reason code"""
+    if reason == envelope.REASON_OK:
+        metrics.record(operation, 'success')
+    else:
+        metrics.record(operation, 'failure', reason)
+
+
+@contextmanager
+def _map_file(file_obj):
+    """
+    Read-only mmap of an open file; empty files map to an empty buffer.
+
+    Slicing the map copies just that chunk, so no view into the mapping
+    outlives it, even in a traceback.
+    """
+    if os.fstat(file_obj.fileno()).st_size == 0:
+        yield b""
+        return
+    with mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+
+def _cbc_encrypt(key: bytes, iv: bytes, plaintext: BytesLike) -> bytes:
+    """PKCS7-pad into a wipeable buffer and AES-256-CBC encrypt"""
+    view = memoryview(plaintext).cast('B')
+    pad_len = 16 - len(view) % 16
+    padded = bytearray(len(view) + pad_len)
+    padded[:len(view)] = view
+    padded[len(view):] = bytes([pad_len]) * pad_len
+
+    ciphertext = bytearray(len(padded) + 15)
+    with metrics.stage('aes'):
+        encryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).encryptor()
+        written = encryptor.update_into(padded, ciphertext)
+        encryptor.finalize()
+    _wipe(padded)
+
+    del ciphertext[written:]
+    return bytes(ciphertext)
+
+
+def _cbc_decrypt(key: bytes, iv: bytes, ciphertext: BytesLike) -> bytearray:
+    """
+    AES-256-CBC decrypt into a bytearray and strip PKCS7 padding in place.
+
+    Raises:
+        envelope.EnvelopeError: On bad padding (usually a wrong password);
+            reason is REASON_BAD_PADDING
+    """
+    plaintext = bytearray(len(ciphertext) + 15)
+    with metrics.stage('aes'):
+        decryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).decryptor()
+        written = decryptor.update_into(ciphertext, plaintext)
+        decryptor.finalize()
+    del plaintext[written:]
+
+    with metrics.stage('unpad'):
+        pad_len = plaintext[-1] if plaintext else 0
+        if not 1 <= pad_len <= 16 or plaintext[-pad_len:] != bytes([pad_len]) * pad_len:
+            _wipe(plaintext)
+            raise envelope.EnvelopeError("Invalid padding bytes.", envelope.REASON_BAD_PADDING)
+        del plaintext[-pad_len:]
+    return plaintext
+
+
+def _gcm_decrypt(key: bytes, nonce: bytes, data: BytesLike, associated_data: bytes) -> bytearray:
+    """
+    AES-256-GCM decrypt into a bytearray; the trailing 16 bytes are the tag.
+
+    Raises:
+        cryptography.exceptions.InvalidTag: On a wrong key or any tampering
+    """
+    view = memoryview(data).cast('B')
+    plaintext = bytearray(len(view) - 16 + 15)
+    with metrics.stage('aes'):
+        decryptor = Cipher(algorithms.AES(key), modes.GCM(nonce, bytes(view[-16:]))).decryptor()
+        decryptor.authenticate_additional_data(associated_data)
+        written = decryptor.update_into(view[:-16], plaintext)
+        del plaintext[written:]
+        try:
+            decryptor.finalize()
         except Exception:
-            return None
+            _wipe(plaintext)
+            raise
+    return plaintext
+
+
+class _ParsedEnvelope(NamedTuple):
+    """Envelope fields needed to derive the key and decrypt"""
+
+    version: int
+    salt: bytes
+    iterations: int
+    nonce: Optional[bytes]
+    payload: Union[bytes, memoryview]  # decoded inner CryptoJS data (v1) or ciphertext
+    header: bytes                    # raw binary header (v4: the payload AAD), empty for v1
+    # v4 only: recipient slots, each with its own salt and cost
+    recipients: Tuple = ()
+    kdf_id: int = envelope.KDF_PBKDF2_SHA256
+
+
+class PreparedKey(NamedTuple):
+    """Salt and key derived ahead of time for one encryption (see prepare_key)"""
+
+    salt: bytes
+    iterations: int
+    # Mutable so it can be zeroed once used or abandoned
+    key: bytearray
+    # HMAC-SHA256 of the password keyed with key; ties the key to its password
+    fingerprint: bytes
+
+    def wipe(self) -> None:
+        """Zero the key; encrypt_and_verify does this after using it."""
+        _wipe(self.key)
+
+
+def _password_fingerprint(key: Union[bytes, bytearray], password: str) -> bytes:
+    """Keyed fingerprint binding a prepared key to the password it came from"""
+    return hmac.new(key, password.encode('utf-8'), hashlib.sha256).digest()
+
+
+class BatchResult(NamedTuple):
+    """Outcome of one item in an encrypt_many / decrypt_many batch"""
+
+    index: int
+    result: Optional[str]
+    error: Optional[str]
+
+
+def _encrypt_chunk(cls, options, items, password):
+    """Worker entry point: encrypt a chunk of (index, mnemonic) pairs"""
+    encryption = cls(**options)
+    results = []
+    for index, mnemonic in items:
+        try:
+            results.append(BatchResult(index, encryption.encrypt_mnemonic(mnemonic, password), None))
+        except Exception as e:
+            results.append(BatchResult(index, None, str(e) or type(e).__name__))
+    return results
+
+
+def _decrypt_chunk(cls, options, items, password):
+    """Worker entry point: decrypt a chunk of (index, encrypted_data) pairs"""
+    encryption = cls(**options)
+    results = []
+    for index, encrypted_data in items:
+        decrypted, reason = encryption._decrypt_text(encrypted_data, password)
+        if decrypted is None:
+            # Same reason codes as crypto.metrics records for decrypt
+            results.append(BatchResult(index, None, reason))
+        else:
+            results.append(BatchResult(index, decrypted, None))
+    return results
 
 
 class SecureMnemonicEncryption:
@@ -102,194 +409,597 @@ class SecureMnemonicEncryption:
     PBKDF2_ITERATIONS = 10000
     SALT_SIZE = 16
 
-    def __init__(self):
-        pass
+    # Upper bound on iterations read from an envelope, so a crafted
+    # envelope cannot make decrypt spin for minutes
+    MAX_PBKDF2_ITERATIONS = 10_000_000
+
+    # Items handed to a worker process per task in encrypt_many / decrypt_many
+    BATCH_CHUNK_SIZE = 16
+
+    def __init__(self, key_cache: Optional[DerivedKeyCache] = None,
+                 iterations: Optional[int] = None,
+                 envelope_version: int = envelope.VERSION_LEGACY,
+                 armor: bool = True,
+                 arena: Optional[SecureArena] = None):
+        """
+        Args:
+            key_cache: Optional cache so repeat decrypts of the same
+                envelope with the same password skip PBKDF2
+            iterations: PBKDF2 cost for new envelopes, recorded in the
+                binary header; legacy (v1) envelopes only support
+                PBKDF2_ITERATIONS, the one cost the mobile app can read
+            envelope_version: Format for new envelopes; 1 is the mobile
+                compatible text format, 2 the compact binary envelope
+                (AES-CBC) and 3 the authenticated binary envelope (AES-GCM)
+            armor: Return binary envelopes as base64 text (True) or raw bytes
+            arena: Optional locked memory arena; derived keys are written
+                into its slots and zeroed as soon as the operation ends
+        """
+        if iterations is not None and not 1 <= iterations <= self.MAX_PBKDF2_ITERATIONS:
+            raise ValueError(f"iterations must be between 1 and {self.MAX_PBKDF2_ITERATIONS}")
+        if envelope_version != envelope.VERSION_LEGACY and envelope_version not in envelope.NONCE_SIZES:
+            raise ValueError(f"Unsupported envelope version: {envelope_version}")
+        if (envelope_version == envelope.VERSION_LEGACY and iterations is not None
+                and iterations != self.PBKDF2_ITERATIONS):
+            raise ValueError(f"Legacy (v1) envelopes use {self.PBKDF2_ITERATIONS} iterations; "
+                             "use envelope version 2 or 3 for a different cost")
+
+        self.key_cache = key_cache
+        self.iterations = iterations or self.PBKDF2_ITERATIONS
+        self.envelope_version = envelope_version
+        self.armor = armor
+        self.arena = arena
+
+    @classmethod
+    def calibrated(cls, target_seconds: float = 0.5, **kwargs) -> 'SecureMnemonicEncryption':
+        """
+        Create an instance whose KDF cost is tuned to this machine.
+
+        The cost is carried in the binary header, so the envelope version
+        defaults to 3 (AES-GCM); legacy v1 envelopes cannot record it.
+
+        Args:
+            target_seconds: Desired unlock latency for one derivation
+            **kwargs: Passed through to the constructor
+
+        Returns:
+            Instance using the calibrated iteration count (never below
+            PBKDF2_ITERATIONS)
+        """
+        from crypto.calibration import calibrate_iterations
+
+        iterations = calibrate_iterations(target_seconds, min_iterations=cls.PBKDF2_ITERATIONS)
+        kwargs.setdefault('envelope_version', envelope.VERSION_GCM)
+        return cls(iterations=min(iterations, cls.MAX_PBKDF2_ITERATIONS), **kwargs)
+
+    def _worker_options(self) -> dict:
+        """Constructor arguments that recreate this configuration in a worker"""
+        return {
+            'iterations': self.iterations,
+            'envelope_version': self.envelope_version,
+            'armor': self.armor
+        }
+
+    def _derive_key(self, password: Union[str, BytesLike], salt: bytes,
+                    iterations: Optional[int] = None, cached: bool = False) -> bytes:
+        """Run PBKDF2-HMAC-SHA256 over the password (same as Android)"""
+        password_bytes = password.encode('utf-8') if isinstance(password, str) else password
+        iterations = iterations or self.iterations
+
+        def derive():
+            # Fastest verified backend for this host (see kdf_backends)
+            with metrics.stage('pbkdf2'):
+                return pbkdf2_sha256(password_bytes, salt, iterations)
+
+        if cached and self.key_cache is not None:
+            return self.key_cache.get_or_derive(salt, password_bytes, derive, iterations)
+        return derive()
+
+    @contextmanager
+    def _derived_key(self, password: Union[str, BytesLike], salt: bytes,
+                     iterations: Optional[int] = None, cached: bool = False):
+        """
+        Yield the derived key for one operation.
+
+        With an arena the key lives in a locked slot that is zeroed when
+        the block exits; otherwise this is plain _derive_key.
+        """
+        if self.arena is None:
+            yield self._derive_key(password, salt, iterations, cached)
+            return
+
+        with self.arena.acquire(32) as key:
+            if cached and self.key_cache is not None:
+                key[:] = self._derive_key(password, salt, iterations, cached=True)
+            else:
+                password_bytes = password.encode('utf-8') if isinstance(password, str) else password
+                with metrics.stage('pbkdf2'):
+                    pbkdf2_sha256_into(password_bytes, salt, iterations or self.iterations, key)
+            yield key
+
+    def _is_text_output(self) -> bool:
+        """True when envelopes are produced as ASCII text rather than raw binary"""
+        return self.envelope_version == envelope.VERSION_LEGACY or self.armor
+
+    def encrypt_mnemonic(self, mnemonic: str, password: str) -> Union[str, bytes]:
+        """
+        Encrypt mnemonic using CryptoJS-compatible format, or a binary
+        envelope when envelope_version is 2 or 3
+        """
+        self._check_encrypt_inputs(mnemonic, password)
+
+        # Generate salt for PBKDF2
+        salt = os.urandom(self.SALT_SIZE)
+
+        # Derive key using PBKDF2 (same as Android)
+        with metrics.stage('encrypt'), self._derived_key(password, salt) as derived_key:
+            sealed = self._encrypt_with_key(mnemonic.encode('utf-8'), salt, derived_key)
+        _record('encrypt', envelope.REASON_OK)
+        return sealed.decode('ascii') if self._is_text_output() else sealed
+
+    def prepare_key(self, password: str) -> PreparedKey:
+        """
+        Pick a fresh salt and derive its key before the mnemonic is known.
+
+        Lets interactive callers run the slow KDF in the background while
+        the user is still typing. The key is held in a bytearray; pass it
+        to encrypt_and_verify, which wipes it, or call wipe() on an unused
+        one. encrypt_and_verify ignores it unless the password matches.
+
+        Raises:
+            ValueError: If encrypt_mnemonic would reject the password
+        """
+        if not password or len(password) < 8:
+            raise ValueError("Password must be at least 8 characters")
+
+        salt = os.urandom(self.SALT_SIZE)
+        key = bytearray(32)
+        with metrics.stage('pbkdf2'):
+            pbkdf2_sha256_into(password.encode('utf-8'), salt, self.iterations, key)
+        return PreparedKey(salt, self.iterations, key, _password_fingerprint(key, password))
 
-    def encrypt_mnemonic(self, mnemonic: str, password: str) -> str:
+    def encrypt_and_verify(self, mnemonic: str, password: str,
+                           prepared: Optional[PreparedKey] = None) -> Tuple[Union[str, bytes], bool]:
         """
-        Encrypt mnemonic using CryptoJS-compatible format
+        Encrypt, then prove the envelope decrypts back to the mnemonic.
+
+        The check parses the finished envelope and decrypts it with the key
+        already derived for encryption, so it costs one PBKDF2 instead of two.
+        PBKDF2 is deterministic, so re-deriving the key would add nothing.
+
+        Args:
+            mnemonic: Mnemonic phrase to encrypt
+            password: Encryption password
+            prepared: Key from prepare_key(password) to skip derivation;
+                ignored if it was made with a different iteration count or
+                for a different password. Wiped before returning either way.
+
+        Returns:
+            Tuple of (envelope as encrypt_mnemonic returns it, verified flag)
         """
+        try:
+            self._check_encrypt_inputs(mnemonic, password)
+
+            plaintext = mnemonic.encode('utf-8')
+            with metrics.stage('encrypt'):
+                if (prepared is not None and prepared.iterations == self.iterations
+                        and hmac.compare_digest(prepared.fingerprint,
+                                                _password_fingerprint(prepared.key, password))):
+                    sealed = self._encrypt_with_key(plaintext, prepared.salt, prepared.key)
+                    verified = self._verify_with_key(sealed, prepared.salt, prepared.key, plaintext)
+                else:
+                    salt = os.urandom(self.SALT_SIZE)
+                    with self._derived_key(password, salt) as derived_key:
+                        sealed = self._encrypt_with_key(plaintext, salt, derived_key)
+                        verified = self._verify_with_key(sealed, salt, derived_key, plaintext)
+        finally:
+            if prepared is not None:
+                prepared.wipe()
+        _record('encrypt', envelope.REASON_OK if verified else REASON_VERIFICATION_FAILED)
+        return (sealed.decode('ascii') if self._is_text_output() else sealed), verified
+
+    def _verify_with_key(self, sealed: bytes, salt: bytes, derived_key: bytes, expected: bytes) -> bool:
+        """Check that an envelope carries our KDF parameters and opens to expected."""
+        try:
+            parsed = self._parse_envelope(sealed)
+            if parsed.salt != salt or parsed.iterations != self.iterations:
+                return False
+            plaintext = self._decrypt_with_key(parsed, derived_key)
+        except Exception:
+            return False
+
+        try:
+            return hmac.compare_digest(plaintext, expected)
+        finally:
+            _wipe(plaintext)
+
+    @staticmethod
+    def _check_encrypt_inputs(mnemonic: str, password: str) -> None:
+        """Reject empty mnemonics and short passwords"""
         if not mnemonic or not mnemonic.strip():
             raise ValueError("Mnemonic cannot be empty")
         if not password or len(password) < 8:
             raise ValueError("Password must be at least 8 characters")
 
-        # Generate salt for PBKDF2
+    def encrypt_mnemonic_bytes(self, mnemonic: BytesLike, password: BytesLike) -> bytes:
+        """
+        Encrypt a UTF-8 mnemonic held in any bytes-like buffer.
+
+        Nothing is converted to str, so the caller can keep the mnemonic
+        and password in bytearrays and wipe them afterwards.
+
+        Args:
+            mnemonic: UTF-8 encoded mnemonic
+            password: UTF-8 encoded password
+
+        Returns:
+            The envelope as ASCII bytes, or raw bytes for unarmored binary versions
+        """
+        mnemonic_view = memoryview(mnemonic).cast('B')
+        if not any(byte not in b" \t\n\r\x0b\x0c" for byte in mnemonic_view):
+            raise ValueError("Mnemonic cannot be empty")
+        if len(memoryview(password).cast('B')) < 8:
+            raise ValueError("Password must be at least 8 characters")
+
         salt = os.urandom(self.SALT_SIZE)
+        with metrics.stage('encrypt'), self._derived_key(password, salt) as derived_key:
+            sealed = self._encrypt_with_key(mnemonic_view, salt, derived_key)
+        _record('encrypt', envelope.REASON_OK)
+        return sealed
 
-        # Derive key using PBKDF2 (same as Android)
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=self.PBKDF2_ITERATIONS,
-        )
-        derived_key = kdf.derive(password.encode('utf-8'))
+    def _encrypt_with_key(self, plaintext: BytesLike, salt: bytes, derived_key: bytes) -> bytes:
+        """
+        Build an envelope of the configured version from an already-derived key
 
-        # Convert key to hex string (same as Android key.toString())
-        key_string = derived_key.hex()
+        Returns:
+            ASCII envelope bytes when armored or legacy, raw bytes otherwise
+        """
+        if self.envelope_version != envelope.VERSION_LEGACY:
+            nonce = os.urandom(envelope.NONCE_SIZES[self.envelope_version])
+            header = envelope.pack_envelope(self.envelope_version, self.iterations,
+                                            salt, nonce, b"")
+            if self.envelope_version == envelope.VERSION_GCM:
+                # Header is authenticated so KDF params cannot be swapped
+                with metrics.stage('aes'):
+                    ciphertext = AESGCM(derived_key).encrypt(nonce, plaintext, header)
+            else:
+                ciphertext = _cbc_encrypt(derived_key, nonce, plaintext)
+            packed = header + ciphertext
+            return base64.b64encode(packed) if self.armor else packed
+
+        # Hex key as bytes (same as Android key.toString()); the legacy
+        # format uses it as the CryptoJS passphrase
+        key_hex = binascii.hexlify(derived_key)
 
         # Encrypt using CryptoJS-compatible method
-        encrypted = CryptoJSAES.encrypt(mnemonic, key_string)
+        encrypted = base64.b64encode(CryptoJSAES.encrypt_buffer(plaintext, key_hex))
 
         # Format like Android: salt_hex + ':' + encrypted_data
-        salt_hex = salt.hex()
-        combined_format = f"{salt_hex}:{encrypted}"
-
         # Return base64 encoded result
-        return base64.b64encode(combined_format.encode('utf-8')).decode('ascii')
+        return base64.b64encode(binascii.hexlify(salt) + b":" + encrypted)
 
-    def decrypt_mnemonic(self, encrypted_data: str, password: str) -> str:
+    def _parse_envelope(self, encrypted_data: Union[str, bytes]) -> _ParsedEnvelope:
         """
-        Decrypt mnemonic from Android/CryptoJS format
-        """
-        try:
-            if not encrypted_data or not password:
-                return None
+        Parse and structurally check any supported envelope version.
 
-            # Decode outer base64
-            combined_format = base64.b64decode(encrypted_data).decode('utf-8')
+        Never touches the KDF, so it is cheap enough to screen data in bulk.
 
-            # Split salt and encrypted data
-            parts = combined_format.split(':')
-            if len(parts) != 2:
-                return None
+        Raises:
+            envelope.EnvelopeError: With a reason code when the data is malformed
+        """
+        if not encrypted_data:
+            raise envelope.EnvelopeError("Empty envelope", envelope.REASON_EMPTY)
+
+        version = envelope.detect_version(encrypted_data)
+        if version == envelope.VERSION_MULTI:
+            # Imported here: multi_recipient builds on this module
+            from crypto import multi_recipient
+            multi = multi_recipient.unpack(encrypted_data)
+            return _ParsedEnvelope(version, b"", 0, multi.nonce, multi.ciphertext,
+                                   multi_recipient._associated_data(multi.nonce), multi.recipients)
+        if version != envelope.VERSION_LEGACY:
+            raw = encrypted_data if envelope.is_raw(encrypted_data) else envelope.dearmor(encrypted_data)
+            header, ciphertext, header_bytes = envelope.unpack_envelope(raw)
+            if header.kdf_id == envelope.KDF_HKDF_VAULT:
+                # Vault session entries: GCM, no PBKDF2 cost, an HKDF salt
+                if header.version != envelope.VERSION_GCM:
+                    raise envelope.EnvelopeError("Vault entries must be AES-GCM", envelope.REASON_UNSUPPORTED_KDF)
+                if header.iterations != 0:
+                    raise envelope.EnvelopeError("Vault entries carry no iteration count",
+                                                 envelope.REASON_BAD_ITERATIONS)
+                if len(header.salt) != self.SALT_SIZE:
+                    raise envelope.EnvelopeError("Salt is not 16 bytes", envelope.REASON_BAD_SALT)
+            elif header.kdf_id != envelope.KDF_PBKDF2_SHA256:
+                raise envelope.EnvelopeError("Unsupported KDF", envelope.REASON_UNSUPPORTED_KDF)
+            elif not 1 <= header.iterations <= self.MAX_PBKDF2_ITERATIONS:
+                raise envelope.EnvelopeError("Iteration count out of range", envelope.REASON_BAD_ITERATIONS)
+            return _ParsedEnvelope(header.version, header.salt, header.iterations,
+                                   header.nonce, ciphertext, header_bytes, kdf_id=header.kdf_id)
+
+        # Decode outer base64
+        combined_format = envelope.dearmor(encrypted_data)
+
+        # Split salt and encrypted data; a third leading field carries the KDF
+        # cost of envelopes written before non-default costs moved to v2/v3
+        parts = combined_format.split(b':')
+        if len(parts) == 2:
+            iterations = self.PBKDF2_ITERATIONS
+        elif len(parts) == 3 and parts[0].isdigit():
+            iterations = int(parts.pop(0))
+            if not 1 <= iterations <= self.MAX_PBKDF2_ITERATIONS:
+                raise envelope.EnvelopeError("Iteration count out of range", envelope.REASON_BAD_ITERATIONS)
+        else:
+            raise envelope.EnvelopeError("Expected salt:data", envelope.REASON_BAD_LAYOUT)
 
-            salt_hex, encrypted_part = parts
+        salt_hex, encrypted_part = parts
 
-            # Convert salt back to bytes
-            salt = bytes.fromhex(salt_hex)
+        # Convert salt back to bytes
+        try:
+            salt = binascii.unhexlify(salt_hex)
+        except binascii.Error:
+            salt = b""
+        if len(salt) != self.SALT_SIZE:
+            raise envelope.EnvelopeError("Salt is not 16 hex-encoded bytes", envelope.REASON_BAD_SALT)
+
+        # Inner CryptoJS data: "Salted__" + 8-byte salt + whole AES blocks
+        inner = envelope.dearmor(encrypted_part)
+        if not inner.startswith(b"Salted__"):
+            raise envelope.EnvelopeError("Missing Salted__ prefix", envelope.REASON_MISSING_SALTED_PREFIX)
+        ciphertext_len = len(inner) - 16
+        if ciphertext_len <= 0 or ciphertext_len % 16:
+            raise envelope.EnvelopeError("Ciphertext is not a whole number of blocks",
+                                         envelope.REASON_BAD_BLOCK_ALIGNMENT)
+
+        return _ParsedEnvelope(version, salt, iterations, None, inner, b"")
+
+    def validate_envelope(self, encrypted_data: Union[str, bytes]) -> str:
+        """
+        Check an envelope's structure without deriving any key.
 
-            # Derive the same key
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt,
-                iterations=self.PBKDF2_ITERATIONS,
-            )
-            derived_key = kdf.derive(password.encode('utf-8'))
+        Returns:
+            envelope.REASON_OK, or the reason code explaining why decryption
+            could never succeed
+        """
+        try:
+            self._parse_envelope(encrypted_data)
+            return envelope.REASON_OK
+        except envelope.EnvelopeError as e:
+            return e.reason
 
-            # Convert key to hex string
-            key_string = derived_key.hex()
+    def _decrypt_with_key(self, parsed: _ParsedEnvelope, derived_key: bytes) -> bytearray:
+        """
+        Open a parsed envelope with its derived key; may raise on bad data
 
-            # Decrypt using CryptoJS-compatible method
-            decrypted = CryptoJSAES.decrypt(encrypted_part, key_string)
+        Returns:
+            The plaintext in a bytearray the caller is expected to wipe
+        """
+        if parsed.version == envelope.VERSION_GCM:
+            # Raises InvalidTag on a wrong password or any tampering
+            return _gcm_decrypt(derived_key, parsed.nonce, parsed.payload, parsed.header)
+        if parsed.version == envelope.VERSION_CBC:
+            return _cbc_decrypt(derived_key, parsed.nonce, parsed.payload)
 
-            return decrypted
+        # Decrypt using CryptoJS-compatible method
+        return CryptoJSAES.decrypt_buffer(parsed.payload, binascii.hexlify(derived_key))
 
-        except Exception:
-            return None
+    def _unwrap_data_key(self, parsed: _ParsedEnvelope, password: Union[str, BytesLike]) -> Optional[bytes]:
+        """
+        Data key of a v4 envelope from the first recipient slot the password
+        opens, or None; costs one PBKDF2 per slot tried.
+        """
+        for slot in parsed.recipients:
+            with self._derived_key(password, slot.salt, slot.iterations) as kek:
+                try:
+                    return aes_key_unwrap(kek, slot.wrapped_key)
+                except InvalidUnwrap:
+                    continue
+        return None
+
+    def _open(self, encrypted_data: Union[str, BytesLike],
+              password: Union[str, BytesLike]) -> Tuple[Optional[bytearray], str]:
+        """
+        Parse, derive and decrypt without raising.
 
-    def verify_mnemonic_format(self, mnemonic: str) -> bool:
-        """Validate mnemonic format"""
-        if not mnemonic or not mnemonic.strip():
-            return False
+        Returns:
+            Tuple of (plaintext or None, envelope.REASON_OK or the failure reason)
+        """
+        try:
+            if not encrypted_data:
+                return None, envelope.REASON_EMPTY
+            if not password:
+                return None, REASON_NO_PASSWORD
+
+            # Structural checks run before the (slow) key derivation
+            with metrics.stage('decode'):
+                parsed = self._parse_envelope(encrypted_data)
+
+            if parsed.kdf_id == envelope.KDF_HKDF_VAULT:
+                return None, envelope.REASON_SESSION_REQUIRED
+            if parsed.version == envelope.VERSION_MULTI:
+                data_key = self._unwrap_data_key(parsed, password)
+                if data_key is None:
+                    return None, REASON_AUTHENTICATION_FAILED
+                return _gcm_decrypt(data_key, parsed.nonce, parsed.payload, parsed.header), envelope.REASON_OK
+
+            # Derive the same key (served from the cache when enabled)
+            with self._derived_key(password, parsed.salt, parsed.iterations, cached=True) as derived_key:
+                return self._decrypt_with_key(parsed, derived_key), envelope.REASON_OK
+
+        except envelope.EnvelopeError as e:
+            return None, e.reason
+        except InvalidTag:
+            return None, REASON_AUTHENTICATION_FAILED
+        except Exception as e:
+            return None, type(e).__name__
+
+    def decrypt_mnemonic(self, encrypted_data: Union[str, bytes], password: str) -> str:
+        """
+        Decrypt mnemonic from Android/CryptoJS format or a binary envelope
+        (armored or raw); the version is detected from the prefix
+        """
+        return self._decrypt_text(encrypted_data, password)[0]
 
-        words = mnemonic.strip().split()
-        valid_lengths = [12, 15, 18, 21, 24]
+    def _decrypt_text(self, encrypted_data: Union[str, bytes], password: str) -> Tuple[Optional[str], str]:
+        """
+        decrypt_mnemonic, also returning envelope.REASON_OK or the failure reason.
+        """
+        with metrics.stage('decrypt'):
+            plaintext, reason = self._open(encrypted_data, password)
+            mnemonic = None
+            if plaintext is not None:
+                try:
+                    mnemonic = _decode_and_wipe(plaintext)
+                except UnicodeDecodeError:
+                    # Wrong keys occasionally unpad cleanly under CBC; garbage is not a mnemonic
+                    reason = REASON_BAD_UTF8
+        _record('decrypt', reason)
+        return mnemonic, reason
+
+    def decrypt_mnemonic_bytes(self, encrypted_data: BytesLike,
+                               password: BytesLike) -> Optional[bytearray]:
+        """
+        Decrypt an envelope held in any bytes-like buffer.
 
-        if len(words) not in valid_lengths:
-            return False
+        Armored envelopes may be passed as ASCII bytes. The ciphertext is
+        read through memoryviews and the mnemonic is returned as UTF-8 in a
+        bytearray, so no immutable copy of it is created.
 
-        for word in words:
-            if not word.isalpha():
-                return False
+        Returns:
+            The mnemonic bytes (wipe with buffer[:] = bytes(len(buffer)) when
+            done), or None on failure
+        """
+        with metrics.stage('decrypt'):
+            plaintext, reason = self._open(encrypted_data, password)
+        _record('decrypt', reason)
+        return plaintext
 
-        return True
+    def decrypt_batch(self, encrypted_items: Sequence[str], password: str,
+                      lockstep: bool = False) -> List[Optional[str]]:
+        """
+        Decrypt many envelopes that share one password in this process.
 
+        Args:
+            encrypted_items: Encrypted strings, each with its own salt
+            password: Decryption password shared by every item
+            lockstep: Derive the keys on the NumPy lockstep engine
+                (crypto.batch_pbkdf2) instead of one by one through the
+                regular backend. Only worth it where
+                batch_pbkdf2.lockstep_speedup() is above 1.0; hashlib with
+                SHA extensions is usually far faster.
 
-class PasswordStrengthChecker:
-    """Utility class for checking password strength."""
+        Returns:
+            Decrypted mnemonics in input order, None for items that failed
 
-    @staticmethod
-    def calculate_entropy(password: str) -> float:
-        """Calculate estimated entropy bits for a password."""
-        if not password:
-            return 0.0
+        Raises:
+            RuntimeError: If lockstep is set and numpy is not installed
+        """
+        if lockstep:
+            from crypto.batch_pbkdf2 import NUMPY_AVAILABLE, pbkdf2_sha256_batch
+            if not NUMPY_AVAILABLE:
+                raise RuntimeError("numpy is required for the batched PBKDF2 engine")
 
-        charset_size = 0
-        if any(c.islower() for c in password):
-            charset_size += 26
-        if any(c.isupper() for c in password):
-            charset_size += 26
-        if any(c.isdigit() for c in password):
-            charset_size += 10
-        if any(c in "!@#$%^&*()_+-=[]{}|;:,.<>?" for c in password):
-            charset_size += 23
+        results: List[Optional[str]] = [None] * len(encrypted_items)
+        if not password:
+            return results
+
+        parsed = []
+        for index, encrypted_data in enumerate(encrypted_items):
+            try:
+                envelope_data = self._parse_envelope(encrypted_data)
+            except Exception:
+                continue
+            if envelope_data.kdf_id == envelope.KDF_HKDF_VAULT:
+                continue  # Opens only through its VaultSession
+            if envelope_data.version == envelope.VERSION_MULTI:
+                # One key per recipient slot, not per envelope
+                results[index] = self.decrypt_mnemonic(encrypted_data, password)
+            else:
+                parsed.append((index, envelope_data))
+
+        # Lockstep lanes must share an iteration count
+        groups = {}
+        for index, envelope_data in parsed:
+            groups.setdefault(envelope_data.iterations, []).append((index, envelope_data))
+
+        for iterations, group in groups.items():
+            salts = [envelope_data.salt for _, envelope_data in group]
+            if lockstep:
+                keys = pbkdf2_sha256_batch(password.encode('utf-8'), salts, iterations)
+            else:
+                keys = [self._derive_key(password, salt, iterations, cached=True) for salt in salts]
+
+            for (index, envelope_data), key in zip(group, keys):
+                try:
+                    results[index] = _decode_and_wipe(self._decrypt_with_key(envelope_data, key))
+                except Exception:
+                    results[index] = None
+
+        return results
+
+    def encrypt_many(self, mnemonics: Iterable[str], password: str,
+                     workers: Optional[int] = None,
+                     chunk_size: Optional[int] = None) -> Iterator[BatchResult]:
+        """
+        Encrypt many mnemonics with one password across a process pool.
 
-        if charset_size == 0:
-            return 0.0
+        Args:
+            mnemonics: Mnemonics to encrypt (any iterable, consumed lazily)
+            password: Encryption password shared by every item
+            workers: Number of worker processes (defaults to CPU count)
+            chunk_size: Items sent to a worker per task
 
-        import math
-        return len(password) * math.log2(charset_size)
+        Returns:
+            Generator of BatchResult in input order; failed items carry
+            an error message instead of aborting the batch
+        """
+        return self._run_batch(_encrypt_chunk, mnemonics, password, workers, chunk_size)
 
-    @staticmethod
-    def check_password_strength(password: str) -> dict:
+    def decrypt_many(self, encrypted_items: Iterable[str], password: str,
+                     workers: Optional[int] = None,
+                     chunk_size: Optional[int] = None) -> Iterator[BatchResult]:
         """
-        Check password strength and return detailed analysis.
+        Decrypt many envelopes with one password across a process pool.
+
+        Args:
+            encrypted_items: Encrypted strings (any iterable, consumed lazily)
+            password: Decryption password shared by every item
+            workers: Number of worker processes (defaults to CPU count)
+            chunk_size: Items sent to a worker per task
 
         Returns:
-            Dictionary with strength analysis
+            Generator of BatchResult in input order; items that fail to
+            decrypt carry their failure reason code (envelope.REASON_* or
+            a REASON_* of this module) instead of aborting the batch
         """
-        if not password:
-            return {
-                'score': 0,
-                'strength': 'Very Weak',
-                'entropy': 0.0,
-                'recommendations': ['Password cannot be empty']
-            }
-
-        issues = []
-        score = 0
-
-        # Length check
-        if len(password) < 8:
-            issues.append('Use at least 8 characters (12+ recommended)')
-        elif len(password) < 12:
-            issues.append('Consider using 12+ characters for better security')
-            score += 1
-        else:
-            score += 2
+        return self._run_batch(_decrypt_chunk, encrypted_items, password, workers, chunk_size)
+
+    def _run_batch(self, worker, items, password, workers, chunk_size):
+        """Feed chunks to a process pool, keeping a bounded number in flight"""
+        workers = workers or os.cpu_count() or 1
+        chunk_size = chunk_size or self.BATCH_CHUNK_SIZE
+        indexed = enumerate(items)
+        chunks = iter(lambda: list(islice(indexed, chunk_size)), [])
+        options = self._worker_options()
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Keep every worker busy plus one queued chunk each
+            for results in bounded_map(pool, worker, ((type(self), options, chunk, password) for chunk in chunks),
+                                       workers * 2):
+                yield from results
 
-        # Character variety checks
-        if any(c.islower() for c in password):
-            score += 1
-        else:
-            issues.append('Add lowercase letters')
+    def verify_mnemonic_format(self, mnemonic: str) -> bool:
+        """Validate mnemonic format"""
+        if not mnemonic or not mnemonic.strip():
+            return False
 
-        if any(c.isupper() for c in password):
-            score += 1
-        else:
-            issues.append('Add uppercase letters')
+        words = mnemonic.strip().split()
+        valid_lengths = [12, 15, 18, 21, 24]
 
-        if any(c.isdigit() for c in password):
-            score += 1
-        else:
-            issues.append('Add numbers')
+        if len(words) not in valid_lengths:
+            return False
 
-        if any(c in "!@#$%^&*()_+-=[]{}|;:,.<>?" for c in password):
-            score += 1
-        else:
-            issues.append('Add special characters (!@#$%^&*)')
-
-        # Calculate entropy
-        entropy = PasswordStrengthChecker.calculate_entropy(password)
-
-        # Determine strength level
-        if score >= 6 and entropy >= 70:
-            strength = 'Very Strong'
-        elif score >= 5 and entropy >= 60:
-            strength = 'Strong'
-        elif score >= 4 and entropy >= 50:
-            strength = 'Moderate'
-        elif score >= 2:
-            strength = 'Weak'
-        else:
-            strength = 'Very Weak'
+        for word in words:
+            if not word.isalpha():
+                return False
 
-        return {
-            'score': score,
-            'strength': strength,
-            'entropy': entropy,
-            'recommendations': issues
-        }
\ No newline at end of file
+        return True
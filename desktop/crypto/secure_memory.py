@@ -0,0 +1,168 @@
+"""
+Secure Memory Arena
+Page-locked, reusable buffers for derived keys and other short-lived secrets
+"""
+
+import ctypes
+import ctypes.util
+import mmap
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+
+def _load_lock_functions():
+    """Return (lock, unlock) callables taking (address, size), or None if unsupported."""
+    try:
+        if sys.platform == 'win32':
+            library = ctypes.WinDLL('kernel32', use_last_error=True)
+            lock, unlock = library.VirtualLock, library.VirtualUnlock
+            succeeded = bool  # BOOL, non-zero on success
+        else:
+            library = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            lock, unlock = library.mlock, library.munlock
+            succeeded = (0).__eq__  # 0 on success, -1 with errno set
+
+        for func in (lock, unlock):
+            func.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+            func.restype = ctypes.c_int
+    except (AttributeError, OSError, TypeError):
+        return None
+
+    return (lambda address, size: succeeded(lock(address, size)),
+            lambda address, size: succeeded(unlock(address, size)))
+
+
+_LOCK_FUNCTIONS = _load_lock_functions()
+
+
+def _address_of(region: mmap.mmap) -> int:
+    """Base address of a writable mmap (the temporary export is released at once)."""
+    anchor = ctypes.c_char.from_buffer(region)
+    try:
+        return ctypes.addressof(anchor)
+    finally:
+        del anchor
+
+
+class SecureArena:
+    """
+    Fixed pool of equally sized slots carved out of one mmap region.
+
+    The region is locked into RAM once (mlock / VirtualLock) when the
+    process is allowed to, and excluded from core dumps where supported.
+    Slots are handed out from a free-list and zeroed on release, so hot
+    paths never pay for a lock or unlock call. Requests that do not fit
+    fall back to an ordinary bytearray, which is still zeroed afterwards.
+    """
+
+    def __init__(self, slots: int = 64, slot_size: int = 64, lock: bool = True):
+        """
+        Map and (optionally) lock the arena.
+
+        Args:
+            slots: Number of slots in the arena
+            slot_size: Bytes per slot; a derived key needs 32
+            lock: Try to lock the pages into RAM
+        """
+        if slots < 1 or slot_size < 1:
+            raise ValueError("slots and slot_size must be positive")
+
+        self.slots = slots
+        self.slot_size = slot_size
+        size = slots * slot_size
+        self.size = -(-size // mmap.PAGESIZE) * mmap.PAGESIZE
+
+        self._region = mmap.mmap(-1, self.size)
+        self._address = _address_of(self._region)
+        if hasattr(mmap, 'MADV_DONTDUMP'):
+            self._region.madvise(mmap.MADV_DONTDUMP)
+
+        self.locked = False
+        if lock and _LOCK_FUNCTIONS is not None:
+            self.locked = bool(_LOCK_FUNCTIONS[0](self._address, self.size))
+
+        self._free: List[int] = list(range(slots - 1, -1, -1))
+        self._lock = threading.Lock()
+        self._closed = False
+        self.acquisitions = 0
+        self.fallbacks = 0
+        self.peak_in_use = 0
+
+    @contextmanager
+    def acquire(self, size: int) -> Iterator[memoryview]:
+        """
+        Borrow a zeroed buffer of exactly size bytes.
+
+        The buffer is zeroed and returned to the free-list when the block
+        exits; do not keep references to it beyond that.
+
+        Yields:
+            Writable memoryview, backed by a locked slot when one is free
+        """
+        if size < 0:
+            raise ValueError("size must be non-negative")
+
+        slot = None
+        with self._lock:
+            if self._closed:
+                raise ValueError("Arena is closed")
+            self.acquisitions += 1
+            if size <= self.slot_size and self._free:
+                slot = self._free.pop()
+                self.peak_in_use = max(self.peak_in_use, self.slots - len(self._free))
+            else:
+                self.fallbacks += 1
+
+        if slot is None:
+            backing = bytearray(size)
+            view = memoryview(backing)
+        else:
+            start = slot * self.slot_size
+            view = memoryview(self._region)[start:start + size]
+
+        try:
+            yield view
+        finally:
+            view[:] = bytes(size)
+            view.release()
+            if slot is not None:
+                with self._lock:
+                    self._free.append(slot)
+
+    def stats(self) -> Dict[str, object]:
+        """Return slot usage counters for sizing the arena."""
+        with self._lock:
+            return {
+                'slots': self.slots,
+                'slot_size': self.slot_size,
+                'bytes': self.size,
+                'locked': self.locked,
+                'in_use': self.slots - len(self._free),
+                'peak_in_use': self.peak_in_use,
+                'acquisitions': self.acquisitions,
+                'fallbacks': self.fallbacks
+            }
+
+    def close(self) -> None:
+        """Zero, unlock and unmap the arena. Outstanding buffers must be released first."""
+        with self._lock:
+            if self._closed:
+                return
+            if len(self._free) != self.slots:
+                raise RuntimeError("Arena still has buffers in use")
+            self._closed = True
+
+        self._region[:] = bytes(self.size)
+        if self.locked:
+            _LOCK_FUNCTIONS[1](self._address, self.size)
+            self.locked = False
+        self._region.close()
+
+    def __enter__(self) -> 'SecureArena':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
@@ -0,0 +1,103 @@
+"""
+Envelope Screening
+Zero-KDF structural validation of encrypted mnemonics, singly or in bulk
+"""
+
+import json
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional, Tuple, Union
+
+from crypto import envelope
+from crypto.secure_encryption import SecureMnemonicEncryption
+
+# Reason codes for containers that never reach envelope parsing
+REASON_BAD_CONTAINER = 'bad_container'
+REASON_MISSING_FIELD = 'missing_field'
+
+
+class ValidationResult(NamedTuple):
+    """Outcome of screening one envelope"""
+
+    ok: bool
+    reason: str
+    version: Optional[int]
+
+
+def validate_envelope(encrypted_data: Union[str, bytes],
+                      encryption: Optional[SecureMnemonicEncryption] = None) -> ValidationResult:
+    """
+    Check that an envelope could be decrypted, without deriving a key.
+
+    Covers base64 validity, layout, salt length, KDF parameters, the
+    "Salted__" prefix and cipher block alignment. Vault session entries
+    (envelope.KDF_HKDF_VAULT) are checked the same way; no session key
+    is needed.
+
+    Args:
+        encrypted_data: Envelope as armored text or raw bytes
+        encryption: Instance whose limits apply (defaults to a plain one)
+
+    Returns:
+        ValidationResult with a reason code from crypto.envelope
+    """
+    encryption = encryption or SecureMnemonicEncryption()
+    reason = encryption.validate_envelope(encrypted_data)
+    if reason != envelope.REASON_OK:
+        return ValidationResult(False, reason, None)
+    return ValidationResult(True, reason, envelope.detect_version(encrypted_data))
+
+
+def screen_directory(directory: Union[str, Path], pattern: str = "*.enc",
+                     field: str = "encrypted_mnemonic") -> Iterator[Tuple[str, ValidationResult]]:
+    """
+    Screen every SecureFileManager entry in a directory.
+
+    Args:
+        directory: Storage directory to scan
+        pattern: Glob selecting entry files
+        field: JSON field holding the envelope
+
+    Returns:
+        Generator of (file stem, ValidationResult)
+    """
+    encryption = SecureMnemonicEncryption()
+    for file_path in sorted(Path(directory).glob(pattern)):
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            yield file_path.stem, ValidationResult(False, REASON_BAD_CONTAINER, None)
+            continue
+
+        yield file_path.stem, _screen_record(data, field, encryption)
+
+
+def screen_ndjson(path: Union[str, Path],
+                  field: str = "encrypted_mnemonic") -> Iterator[Tuple[int, ValidationResult]]:
+    """
+    Screen an NDJSON file with one JSON object per line.
+
+    Blank lines are skipped; line numbers start at 1.
+
+    Returns:
+        Generator of (line number, ValidationResult)
+    """
+    encryption = SecureMnemonicEncryption()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                yield line_number, ValidationResult(False, REASON_BAD_CONTAINER, None)
+                continue
+
+            yield line_number, _screen_record(data, field, encryption)
+
+
+def _screen_record(data, field: str, encryption: SecureMnemonicEncryption) -> ValidationResult:
+    """Validate the envelope stored under field in a decoded JSON record."""
+    if not isinstance(data, dict) or not isinstance(data.get(field), str):
+        return ValidationResult(False, REASON_MISSING_FIELD, None)
+    return validate_envelope(data[field], encryption)
@@ -0,0 +1,172 @@
+"""
+Vault Unlock Session
+One slow master-key derivation per unlock, cheap HKDF keys per entry
+"""
+
+import hmac
+import os
+import threading
+import time
+from typing import Dict, Optional, Union
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from crypto import envelope
+from crypto.kdf_backends import pbkdf2_sha256
+from crypto.secure_encryption import SecureMnemonicEncryption, _gcm_decrypt, _decode_and_wipe, _wipe
+
+# The master key is used once per unlock, so it can afford a much higher
+# cost than per-entry keys ever could
+MASTER_ITERATIONS = 600_000
+
+_ENTRY_INFO = b"mnemonic-vault/entry-key/v1"
+_VERIFIER_INFO = b"mnemonic-vault/verifier/v1"
+
+
+def _hkdf(master_key: Union[bytes, bytearray], salt: Optional[bytes], info: bytes) -> bytes:
+    """HKDF-SHA256 expansion of the master key."""
+    return HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=info).derive(master_key)
+
+
+class VaultSession:
+    """
+    Unlocked vault: holds the PBKDF2 master key for a limited time.
+
+    Entries written through a session are AES-GCM binary envelopes whose
+    header names the HKDF KDF (envelope.KDF_HKDF_VAULT) and carries the
+    entry salt; the entry key is HKDF(master key, salt). The master key is
+    kept in a bytearray and zeroed on close() or, by a daemon timer, as
+    soon as the lifetime ends, even if the session is never touched again.
+    """
+
+    def __init__(self, master_key: bytes, lifetime: Optional[float] = 900.0):
+        """
+        Args:
+            master_key: Derived vault master key
+            lifetime: Seconds until the session closes itself, or None
+        """
+        self._master_key = bytearray(master_key)
+        self._expires_at = time.monotonic() + lifetime if lifetime is not None else None
+        self._lock = threading.Lock()
+
+        # An idle session must not keep the key; the expiry check in
+        # _check_open still covers a timer that fires late
+        self._timer = None
+        if lifetime is not None:
+            self._timer = threading.Timer(max(lifetime, 0.0), self.close)
+            self._timer.daemon = True
+            self._timer.start()
+
+    @classmethod
+    def create(cls, password: str, iterations: int = MASTER_ITERATIONS,
+               lifetime: Optional[float] = 900.0):
+        """
+        Set up a new vault for a password.
+
+        Returns:
+            Tuple of (session, params) where params is the JSON-serializable
+            dict to persist and pass to unlock() later
+        """
+        if not password or len(password) < 8:
+            raise ValueError("Password must be at least 8 characters")
+
+        salt = os.urandom(SecureMnemonicEncryption.SALT_SIZE)
+        master_key = pbkdf2_sha256(password.encode('utf-8'), salt, iterations)
+        params = {
+            'kdf': 'pbkdf2-sha256',
+            'salt': salt.hex(),
+            'iterations': iterations,
+            'verifier': _hkdf(master_key, None, _VERIFIER_INFO).hex()
+        }
+        return cls(master_key, lifetime), params
+
+    @classmethod
+    def unlock(cls, password: str, params: Dict[str, object],
+               lifetime: Optional[float] = 900.0) -> Optional['VaultSession']:
+        """
+        Derive the master key once and check it against the stored verifier.
+
+        Returns:
+            An open session, or None if the password is wrong
+        """
+        iterations = int(params['iterations'])
+        if not 1 <= iterations <= SecureMnemonicEncryption.MAX_PBKDF2_ITERATIONS:
+            raise ValueError("Vault iteration count out of range")
+
+        master_key = pbkdf2_sha256(password.encode('utf-8'), bytes.fromhex(params['salt']), iterations)
+        verifier = _hkdf(master_key, None, _VERIFIER_INFO)
+        if not hmac.compare_digest(verifier, bytes.fromhex(params['verifier'])):
+            return None
+        return cls(master_key, lifetime)
+
+    @property
+    def is_open(self) -> bool:
+        """True until the session is closed or its lifetime ends."""
+        with self._lock:
+            return self._check_open()
+
+    def _check_open(self) -> bool:
+        """Close on expiry; caller holds the lock."""
+        if self._master_key and self._expires_at is not None and time.monotonic() >= self._expires_at:
+            _wipe(self._master_key)
+            self._master_key = bytearray()
+        return bool(self._master_key)
+
+    def _entry_key(self, salt: bytes) -> bytes:
+        """Derive one entry's key from the master key."""
+        with self._lock:
+            if not self._check_open():
+                raise RuntimeError("Vault session is closed or expired")
+            return _hkdf(self._master_key, salt, _ENTRY_INFO)
+
+    def encrypt_mnemonic(self, mnemonic: str) -> str:
+        """Encrypt an entry under this vault; returns an armored envelope."""
+        if not mnemonic or not mnemonic.strip():
+            raise ValueError("Mnemonic cannot be empty")
+
+        salt = os.urandom(SecureMnemonicEncryption.SALT_SIZE)
+        nonce = os.urandom(envelope.NONCE_SIZES[envelope.VERSION_GCM])
+        header = envelope.pack_envelope(envelope.VERSION_GCM, 0, salt, nonce, b"",
+                                        kdf_id=envelope.KDF_HKDF_VAULT)
+        ciphertext = AESGCM(self._entry_key(salt)).encrypt(nonce, mnemonic.encode('utf-8'), header)
+        return envelope.armor(header + ciphertext)
+
+    def decrypt_mnemonic(self, encrypted_data: Union[str, bytes]) -> Optional[str]:
+        """
+        Decrypt an entry written by a session of this vault.
+
+        Returns:
+            The mnemonic, or None for foreign, legacy or tampered entries
+
+        Raises:
+            RuntimeError: If the session is closed or expired
+        """
+        try:
+            raw = encrypted_data if envelope.is_raw(encrypted_data) else envelope.dearmor(encrypted_data)
+            header, ciphertext, header_bytes = envelope.unpack_envelope(raw)
+        except envelope.EnvelopeError:
+            return None
+        if header.version != envelope.VERSION_GCM or header.kdf_id != envelope.KDF_HKDF_VAULT:
+            return None
+
+        key = self._entry_key(header.salt)
+        try:
+            return _decode_and_wipe(_gcm_decrypt(key, header.nonce, ciphertext, header_bytes))
+        except Exception:
+            return None
+
+    def close(self) -> None:
+        """Zero the master key; further use raises RuntimeError."""
+        if self._timer is not None:
+            self._timer.cancel()
+        with self._lock:
+            _wipe(self._master_key)
+            self._master_key = bytearray()
+
+    def __enter__(self) -> 'VaultSession':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
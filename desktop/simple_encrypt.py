@@ -9,13 +9,15 @@ import os
 import getpass
 
 
-from crypto.secure_encryption import SecureMnemonicEncryption, PasswordStrengthChecker
+from crypto.password_strength import PasswordStrengthChecker
 
 def encrypt_and_display():
     """Encrypt mnemonic and display the result."""
     print("=== SECURE MNEMONIC ENCRYPTION ===")
     print("(Encrypted text will be displayed, not saved to file)")
 
+    from crypto.secure_encryption import SecureMnemonicEncryption
+
     encryption = SecureMnemonicEncryption()
     password_checker = PasswordStrengthChecker()
 
@@ -79,7 +81,7 @@ def encrypt_and_display():
     try:
         # Encrypt the mnemonic
         print("\n[INFO] Encrypting mnemonic...")
-        encrypted_data = encryption.encrypt_mnemonic(mnemonic, password)
+        encrypted_data, verified = encryption.encrypt_and_verify(mnemonic, password)
 
         # Display the result
         print("\n" + "=" * 60)
@@ -93,10 +95,9 @@ def encrypt_and_display():
         print(f"[INFO] Save this encrypted text somewhere safe")
         print(f"[WARNING] Keep your password safe - it cannot be recovered!")
 
-        # Test decryption to make sure it works
-        print(f"\n[INFO] Testing decryption...")
-        test_decrypt = encryption.decrypt_mnemonic(encrypted_data, password)
-        if test_decrypt == mnemonic:
+        # Verify the envelope decrypts, reusing the derived key
+        print(f"\n[INFO] Verifying decryption...")
+        if verified:
             print(f"[SUCCESS] Encryption/decryption test passed")
         else:
             print(f"[ERROR] Encryption/decryption test failed!")
@@ -110,6 +111,8 @@ def decrypt_from_text():
     """Decrypt mnemonic from pasted encrypted text."""
     print("=== DECRYPT MNEMONIC FROM TEXT ===")
 
+    from crypto.secure_encryption import SecureMnemonicEncryption
+
     encryption = SecureMnemonicEncryption()
 
     # Get encrypted text
@@ -0,0 +1,100 @@
+"""
+Unit tests for the asyncio encryption facade
+Run with: python -m pytest tests/
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from crypto.async_encryption import AsyncMnemonicEncryption
+from crypto.secure_encryption import SecureMnemonicEncryption
+
+
+class _SlowEncryption(SecureMnemonicEncryption):
+    """Records how many derivations overlap."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def _derive_key(self, *args, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(0.05)
+            return super()._derive_key(*args, **kwargs)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestAsyncMnemonicEncryption:
+    """Test cases for AsyncMnemonicEncryption."""
+
+    password = "AsyncPassword123!"
+
+    def test_roundtrip(self):
+        """Test encrypt and decrypt through the event loop."""
+        async def scenario():
+            async with AsyncMnemonicEncryption() as encryption:
+                encrypted = await encryption.encrypt_mnemonic("async mnemonic phrase", self.password)
+                return await encryption.decrypt_mnemonic(encrypted, self.password)
+
+        assert asyncio.run(scenario()) == "async mnemonic phrase"
+
+    def test_encrypt_errors_propagate(self):
+        """Test that validation errors surface as exceptions."""
+        async def scenario():
+            async with AsyncMnemonicEncryption() as encryption:
+                await encryption.encrypt_mnemonic("", self.password)
+
+        with pytest.raises(ValueError):
+            asyncio.run(scenario())
+
+    def test_concurrency_cap_and_as_completed(self):
+        """Test that as_completed returns every item with bounded concurrency."""
+        slow = _SlowEncryption()
+        mnemonics = [f"capped mnemonic {i}" for i in range(6)] + [""]
+
+        async def scenario():
+            async with AsyncMnemonicEncryption(slow, max_concurrency=2) as encryption:
+                return [item async for item in encryption.as_completed(mnemonics, self.password, 'encrypt')]
+
+        results = dict(asyncio.run(scenario()))
+        assert sorted(results) == list(range(7))
+        assert isinstance(results[6], ValueError)
+        assert slow.peak <= 2
+        assert slow.decrypt_mnemonic(results[0], self.password) == mnemonics[0]
+
+    def test_cancellation(self):
+        """Test that a cancelled call raises CancelledError and frees its slot."""
+        async def scenario():
+            async with AsyncMnemonicEncryption(_SlowEncryption(), max_concurrency=1) as encryption:
+                task = asyncio.ensure_future(encryption.encrypt_mnemonic("cancelled mnemonic", self.password))
+                await asyncio.sleep(0.01)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+
+                # The slot is released once the running derivation finishes
+                return await asyncio.wait_for(
+                    encryption.encrypt_mnemonic("next mnemonic", self.password), timeout=5)
+
+        assert asyncio.run(scenario())
+
+    def test_process_pool_executor(self):
+        """Test running operations on a process pool."""
+        async def scenario():
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                encryption = AsyncMnemonicEncryption(executor=pool, max_concurrency=1)
+                encrypted = await encryption.encrypt_mnemonic("process mnemonic", self.password)
+                return await encryption.decrypt_mnemonic(encrypted, self.password)
+
+        assert asyncio.run(scenario()) == "process mnemonic"
@@ -0,0 +1,51 @@
+"""
+Unit tests for the microbenchmark runner
+Run with: python -m pytest tests/
+"""
+
+import json
+
+from benchmarks import micro
+
+
+class TestMicroBenchmarks:
+    """Test cases for running and comparing benchmarks."""
+
+    def test_compare_flags_regressions(self):
+        """Test the threshold against stored baselines."""
+        results = {
+            'fast': {'best_s': 1.0, 'median_s': 1.1},
+            'slow': {'best_s': 2.0, 'median_s': 2.1},
+            'unseen': {'best_s': 1.0, 'median_s': 1.0},
+        }
+        rows = {row['name']: row for row in micro.compare(results, {'fast': 1.0, 'slow': 1.0}, 0.5)}
+        assert rows['fast']['status'] == 'ok'
+        assert rows['slow']['status'] == 'regression'
+        assert rows['unseen']['status'] == 'new'
+
+    def test_ungated_benchmarks_never_fail(self, monkeypatch):
+        """Test that noisy I/O benchmarks are reported but not flagged as regressions."""
+        assert all(name in micro.UNGATED for name in micro.BENCHMARKS if name.startswith('file_manager.'))
+        assert 'cryptojs.derive_key_and_iv' not in micro.UNGATED
+
+        monkeypatch.setattr(micro, 'UNGATED', {'noisy'})
+        results = {'noisy': {'best_s': 3.0, 'median_s': 3.0}}
+        rows = micro.compare(results, {'noisy': 1.0}, 0.5)
+        assert rows[0]['status'] == 'slower'
+
+    def test_main_writes_and_checks_baselines(self, tmp_path, capsys):
+        """Test a filtered run end to end with JSON output."""
+        baselines = tmp_path / "baselines.json"
+        args = ["--baselines", str(baselines), "--filter", "password_strength", "--repeats", "1", "--json"]
+
+        assert micro.main(args + ["--update-baselines"]) == 0
+        assert 'password_strength.check' in json.loads(baselines.read_text())['benchmarks']
+        capsys.readouterr()
+
+        # A baseline far faster than reality must be reported as a regression
+        data = json.loads(baselines.read_text())
+        data['benchmarks']['password_strength.check'] = 1e-12
+        baselines.write_text(json.dumps(data))
+        assert micro.main(args) == 1
+        report = json.loads(capsys.readouterr().out)
+        assert report['results'][0]['status'] == 'regression'
@@ -0,0 +1,105 @@
+"""
+Unit tests for the chunked encrypted container
+Run with: python -m pytest tests/
+"""
+
+import os
+
+import pytest
+
+from crypto.chunked_container import ChunkedReader, ContainerError, encrypt_file
+
+
+class TestChunkedContainer:
+    """Test cases for chunked container encryption and random access."""
+
+    password = "ContainerPassword123!"
+
+    def _write(self, tmp_path, data, chunk_size=1000):
+        """Encrypt data into a container and return its path."""
+        source = tmp_path / "plain"
+        source.write_bytes(data)
+        container = tmp_path / "container.mncc"
+        encrypt_file(str(source), str(container), self.password,
+                     chunk_size=chunk_size, iterations=1000, workers=3)
+        return container
+
+    def test_roundtrip(self, tmp_path):
+        """Test full decryption, including empty and exact-multiple sizes."""
+        for size in (0, 1, 3000, 4321):
+            data = os.urandom(size)
+            container = self._write(tmp_path, data)
+            with ChunkedReader(str(container), self.password, workers=3) as reader:
+                assert reader.size == size
+                assert reader.read() == data
+                reader.decrypt_to_file(str(tmp_path / "out"))
+            assert (tmp_path / "out").read_bytes() == data
+
+    def test_random_access(self, tmp_path):
+        """Test byte ranges that fall inside and across chunk boundaries."""
+        data = os.urandom(10500)
+        container = self._write(tmp_path, data)
+
+        with ChunkedReader(str(container), self.password) as reader:
+            decrypted = []
+            original = reader.read_chunk
+            reader.read_chunk = lambda i: decrypted.append(i) or original(i)
+
+            assert reader.read(2500, 1000) == data[2500:3500]
+            assert sorted(decrypted) == [2, 3]
+            assert reader.read(10400, 500) == data[10400:]
+            assert reader.read(20000, 5) == b""
+
+    def test_wrong_password(self, tmp_path):
+        """Test that a wrong password fails authentication."""
+        container = self._write(tmp_path, b"secret payload")
+        with ChunkedReader(str(container), "WrongPassword123!") as reader:
+            with pytest.raises(ContainerError):
+                reader.read()
+
+    def test_tampering_detected(self, tmp_path):
+        """Test that modified chunks and swapped chunks are rejected."""
+        data = os.urandom(3000)
+        container = self._write(tmp_path, data)
+        raw = bytearray(container.read_bytes())
+
+        with ChunkedReader(str(container), self.password) as reader:
+            (first_offset, length), (second_offset, _) = reader._index[0], reader._index[1]
+
+        # Swap the first two chunks
+        swapped = bytearray(raw)
+        swapped[first_offset:first_offset + length] = raw[second_offset:second_offset + length]
+        swapped[second_offset:second_offset + length] = raw[first_offset:first_offset + length]
+        container.write_bytes(bytes(swapped))
+        with ChunkedReader(str(container), self.password) as reader:
+            with pytest.raises(ContainerError):
+                reader.read_chunk(0)
+
+        # Claiming a shorter plaintext breaks the header binding
+        truncated = bytearray(raw)
+        truncated[37:45] = (2000).to_bytes(8, 'big')
+        truncated[45:49] = (2).to_bytes(4, 'big')
+        container.write_bytes(bytes(truncated))
+        with ChunkedReader(str(container), self.password) as reader:
+            with pytest.raises(ContainerError):
+                reader.read()
+
+    def test_crafted_iteration_count_rejected(self, tmp_path, monkeypatch):
+        """Test that an out-of-range cost in the header fails before PBKDF2 runs."""
+        from crypto import chunked_container
+
+        container = self._write(tmp_path, os.urandom(100))
+        crafted = bytearray(container.read_bytes())
+        crafted[5:9] = (0xFFFFFFFF).to_bytes(4, 'big')
+        container.write_bytes(bytes(crafted))
+
+        monkeypatch.setattr(chunked_container, 'pbkdf2_sha256', lambda *args: pytest.fail("KDF should not run"))
+        with pytest.raises(ContainerError):
+            ChunkedReader(str(container), self.password)
+
+    def test_not_a_container(self, tmp_path):
+        """Test that foreign files are rejected on open."""
+        path = tmp_path / "foreign"
+        path.write_bytes(b"definitely not a container" * 4)
+        with pytest.raises(ContainerError):
+            ChunkedReader(str(path), self.password)
@@ -6,11 +6,15 @@ Run with: python -m pytest tests/
 import pytest
 import sys
 import os
+import io
+import shutil
+import subprocess
 
 # Add src to path for testing
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from crypto.secure_encryption import SecureMnemonicEncryption, PasswordStrengthChecker
+from crypto import envelope
+from crypto.secure_encryption import SecureMnemonicEncryption, PasswordStrengthChecker, CryptoJSAES
 
 
 class TestSecureMnemonicEncryption:
@@ -118,6 +122,222 @@ class TestSecureMnemonicEncryption:
         assert self.encryption.decrypt_mnemonic(None, password) is None
         assert self.encryption.decrypt_mnemonic("validdata", None) is None
 
+    def test_encrypt_decrypt_many(self):
+        """Test batch encryption and decryption across worker processes."""
+        mnemonics = [f"batch mnemonic number {i}" for i in range(5)] + [""]
+        password = "BatchPassword123!"
+
+        encrypted = list(self.encryption.encrypt_many(mnemonics, password, workers=2, chunk_size=2))
+        assert [r.index for r in encrypted] == list(range(6))
+        assert all(r.error is None for r in encrypted[:5])
+
+        # The empty mnemonic fails on its own without aborting the batch
+        assert encrypted[5].result is None
+        assert "empty" in encrypted[5].error.lower()
+
+        items = [r.result for r in encrypted[:5]] + ["invalid_base64!"]
+        decrypted = list(self.encryption.decrypt_many(items, password, workers=2, chunk_size=2))
+        assert [r.result for r in decrypted[:5]] == mnemonics[:5]
+        assert decrypted[5].result is None
+        assert decrypted[5].error == envelope.REASON_BAD_BASE64
+
+    @pytest.mark.parametrize("version,armor", [(1, True), (2, True), (3, True), (3, False)])
+    def test_bytes_api_roundtrip(self, version, armor):
+        """Test the bytes API against the str API for every envelope version."""
+        encryption = SecureMnemonicEncryption(envelope_version=version, armor=armor)
+        mnemonic = bytearray("abandon ability able about above absent".encode('utf-8'))
+        password = bytearray(b"BytesPassword123!")
+
+        encrypted = encryption.encrypt_mnemonic_bytes(memoryview(mnemonic), password)
+        assert isinstance(encrypted, bytes)
+
+        decrypted = encryption.decrypt_mnemonic_bytes(memoryview(encrypted), password)
+        assert isinstance(decrypted, bytearray)
+        assert decrypted == mnemonic
+
+        # Interoperates with the str API in both directions
+        text = encrypted.decode('ascii') if armor else encrypted
+        assert encryption.decrypt_mnemonic(text, password.decode()) == mnemonic.decode()
+        encrypted_str = encryption.encrypt_mnemonic(mnemonic.decode(), password.decode())
+        if armor:
+            encrypted_str = encrypted_str.encode('ascii')
+        assert encryption.decrypt_mnemonic_bytes(encrypted_str, password) == mnemonic
+
+        # CBC versions may rarely unpad cleanly under a wrong key; GCM never does
+        wrong = encryption.decrypt_mnemonic_bytes(encrypted, b"WrongPassword1!")
+        assert wrong != mnemonic
+        if version == 3:
+            assert wrong is None
+
+    @pytest.mark.parametrize("version", [1, 2, 3])
+    def test_encrypt_and_verify_single_kdf(self, version, monkeypatch):
+        """Test that encrypt-and-verify derives the key only once."""
+        import crypto.secure_encryption as module
+        encryption = SecureMnemonicEncryption(envelope_version=version)
+        calls = []
+        real_pbkdf2 = module.pbkdf2_sha256
+        monkeypatch.setattr(module, 'pbkdf2_sha256', lambda *args: calls.append(1) or real_pbkdf2(*args))
+
+        encrypted, verified = encryption.encrypt_and_verify("verify this mnemonic", "VerifyPassword123!")
+        assert verified is True
+        assert len(calls) == 1
+        assert encryption.decrypt_mnemonic(encrypted, "VerifyPassword123!") == "verify this mnemonic"
+
+        with pytest.raises(ValueError):
+            encryption.encrypt_and_verify("", "VerifyPassword123!")
+
+    def test_encrypt_with_prepared_key(self, monkeypatch):
+        """Test that a key prepared ahead of time is used instead of deriving."""
+        password = "PreparedPassword123!"
+        prepared = self.encryption.prepare_key(password)
+
+        import crypto.secure_encryption as module
+        monkeypatch.setattr(module, 'pbkdf2_sha256', lambda *args: pytest.fail("KDF should not run"))
+        encrypted, verified = self.encryption.encrypt_and_verify("prepared key words", password, prepared)
+        assert verified is True
+        monkeypatch.undo()
+
+        assert self.encryption.decrypt_mnemonic(encrypted, password) == "prepared key words"
+
+        # A key prepared for another cost is ignored rather than misused
+        other = SecureMnemonicEncryption(iterations=20000, envelope_version=envelope.VERSION_GCM)
+        encrypted, verified = other.encrypt_and_verify("prepared key words", password, prepared)
+        assert verified and other.decrypt_mnemonic(encrypted, password) == "prepared key words"
+
+        # So is a key prepared for another password
+        encrypted, verified = self.encryption.encrypt_and_verify("prepared key words", "OtherPassword123!", prepared)
+        assert verified
+        assert self.encryption.decrypt_mnemonic(encrypted, "OtherPassword123!") == "prepared key words"
+        assert self.encryption.decrypt_mnemonic(encrypted, password) != "prepared key words"
+
+    def test_prepared_key_is_wiped(self):
+        """Test that a prepared key lives in a buffer that is zeroed after use."""
+        password = "PreparedPassword123!"
+        with pytest.raises(ValueError):
+            self.encryption.prepare_key("short")
+
+        prepared = self.encryption.prepare_key(password)
+        assert isinstance(prepared.key, bytearray) and any(prepared.key)
+        _, verified = self.encryption.encrypt_and_verify("prepared key words", password, prepared)
+        assert verified and not any(prepared.key)
+
+        # Wiped even when it is not used or the inputs are rejected
+        unused = self.encryption.prepare_key(password)
+        self.encryption.encrypt_and_verify("prepared key words", "OtherPassword123!", unused)
+        assert not any(unused.key)
+        rejected = self.encryption.prepare_key(password)
+        with pytest.raises(ValueError):
+            self.encryption.encrypt_and_verify("", password, rejected)
+        assert not any(rejected.key)
+
+    def test_cli_speculative_key(self):
+        """Test that the CLI only speculates on valid passwords and wipes abandoned keys."""
+        from cli.main import MnemonicCLI
+
+        cli = MnemonicCLI()
+        cli._encryption = self.encryption
+        cli._start_speculative_key("short")
+        assert cli._speculative_key is None
+
+        cli._start_speculative_key("SpeculativePassword123!")
+        future = cli._speculative_key[1]
+        prepared = future.result()
+        cli._discard_speculative_key()
+        assert cli._speculative_key is None and not any(prepared.key)
+
+        cli._start_speculative_key("SpeculativePassword123!")
+        prepared = cli._speculative_key[1].result()
+        assert cli._take_speculative_key("DifferentPassword123!") is None
+        assert not any(prepared.key)
+
+    def test_bytes_api_invalid_inputs(self):
+        """Test input checks of the bytes API."""
+        with pytest.raises(ValueError):
+            self.encryption.encrypt_mnemonic_bytes(b" \n\t", b"ValidPassword123!")
+        with pytest.raises(ValueError):
+            self.encryption.encrypt_mnemonic_bytes(b"valid mnemonic", b"short")
+        assert self.encryption.decrypt_mnemonic_bytes(b"", b"ValidPassword123!") is None
+
+        # Non-UTF-8 plaintext round-trips as bytes but is not a str mnemonic
+        encrypted = self.encryption.encrypt_mnemonic_bytes(b"\xff\xfe", b"ValidPassword123!")
+        assert self.encryption.decrypt_mnemonic_bytes(encrypted, b"ValidPassword123!") == b"\xff\xfe"
+        assert self.encryption.decrypt_mnemonic(encrypted.decode('ascii'), "ValidPassword123!") is None
+
+
+class TestCryptoJSAESStreaming:
+    """Test cases for streaming OpenSSL-compatible encryption."""
+
+    password = "StreamPassword123!"
+
+    def test_stream_roundtrip(self):
+        """Test streams across several chunks, including a partial last block."""
+        plaintext = os.urandom(3 * 1024 + 5)
+        encrypted = io.BytesIO()
+        CryptoJSAES.encrypt_stream(io.BytesIO(plaintext), encrypted, self.password, chunk_size=1000)
+
+        data = encrypted.getvalue()
+        assert data.startswith(b"Salted__")
+        assert (len(data) - 16) % 16 == 0
+
+        # Decrypt with a different chunk size than was used to encrypt
+        decrypted = io.BytesIO()
+        CryptoJSAES.decrypt_stream(io.BytesIO(data), decrypted, self.password, chunk_size=777)
+        assert decrypted.getvalue() == plaintext
+
+    def test_stream_wrong_password(self):
+        """Test that a wrong password or garbage input raises ValueError."""
+        encrypted = io.BytesIO()
+        CryptoJSAES.encrypt_stream(io.BytesIO(b"secret data"), encrypted, self.password)
+
+        # CBC has no authentication: about 1 in 256 wrong keys still yields
+        # valid-looking padding, so only require that the secret never leaks
+        output = io.BytesIO()
+        try:
+            CryptoJSAES.decrypt_stream(io.BytesIO(encrypted.getvalue()), output, "WrongPassword!")
+        except ValueError:
+            pass
+        assert output.getvalue() != b"secret data"
+        with pytest.raises(ValueError):
+            CryptoJSAES.decrypt_stream(io.BytesIO(b"not salted data"), io.BytesIO(), self.password)
+
+    def test_file_roundtrip(self, tmp_path):
+        """Test the mmap-backed file variants, including an empty file."""
+        for size in (0, 70000):
+            source = tmp_path / f"plain_{size}"
+            source.write_bytes(os.urandom(size))
+            CryptoJSAES.encrypt_file(str(source), str(tmp_path / "enc"), self.password)
+            CryptoJSAES.decrypt_file(str(tmp_path / "enc"), str(tmp_path / "dec"), self.password)
+            assert (tmp_path / "dec").read_bytes() == source.read_bytes()
+
+        # CBC has no authentication: about 1 in 256 wrong keys still yields
+        # valid-looking padding, so only require that the secret never leaks
+        # and that a failed decryption leaves no partial output behind
+        try:
+            CryptoJSAES.decrypt_file(str(tmp_path / "enc"), str(tmp_path / "bad"), "WrongPassword!")
+        except ValueError:
+            assert not (tmp_path / "bad").exists()
+        else:
+            assert (tmp_path / "bad").read_bytes() != source.read_bytes()
+
+        # A truncated ciphertext always fails, so cleanup is checked every run
+        (tmp_path / "truncated").write_bytes((tmp_path / "enc").read_bytes()[:-1])
+        with pytest.raises(ValueError):
+            CryptoJSAES.decrypt_file(str(tmp_path / "truncated"), str(tmp_path / "partial"), self.password)
+        assert not (tmp_path / "partial").exists()
+
+    @pytest.mark.skipif(shutil.which("openssl") is None, reason="openssl not installed")
+    def test_openssl_interop(self, tmp_path):
+        """Test that openssl enc decrypts our output."""
+        source = tmp_path / "plain"
+        source.write_bytes(os.urandom(5000))
+        CryptoJSAES.encrypt_file(str(source), str(tmp_path / "enc"), self.password)
+
+        subprocess.run(["openssl", "enc", "-d", "-aes-256-cbc", "-md", "md5",
+                        "-pass", f"pass:{self.password}",
+                        "-in", str(tmp_path / "enc"), "-out", str(tmp_path / "dec")],
+                       check=True, capture_output=True)
+        assert (tmp_path / "dec").read_bytes() == source.read_bytes()
+
 
 class TestPasswordStrengthChecker:
     """Test cases for PasswordStrengthChecker."""
@@ -0,0 +1,132 @@
+"""
+Unit tests for the binary envelope format
+Run with: python -m pytest tests/
+"""
+
+import pytest
+
+from crypto import envelope
+from crypto.secure_encryption import SecureMnemonicEncryption
+
+
+class TestEnvelopeFormat:
+    """Test cases for packing and detecting envelopes."""
+
+    def test_pack_unpack_roundtrip(self):
+        """Test that every header field survives a round trip."""
+        salt, nonce = b"s" * 16, b"n" * 16
+        packed = envelope.pack_envelope(envelope.VERSION_CBC, 25000, salt, nonce, b"c" * 32)
+
+        header, ciphertext, header_bytes = envelope.unpack_envelope(packed)
+        assert header == envelope.EnvelopeHeader(envelope.VERSION_CBC, envelope.KDF_PBKDF2_SHA256,
+                                                 25000, salt, nonce)
+        assert bytes(ciphertext) == b"c" * 32
+        assert packed.startswith(header_bytes)
+
+    def test_malformed_envelopes(self):
+        """Test that truncated or foreign data is rejected."""
+        packed = envelope.pack_envelope(envelope.VERSION_CBC, 1, b"s" * 16, b"n" * 16, b"")
+
+        with pytest.raises(envelope.EnvelopeError):
+            envelope.unpack_envelope(packed[:20])
+        with pytest.raises(envelope.EnvelopeError):
+            envelope.unpack_envelope(b"\x00" + packed[1:])
+        with pytest.raises(envelope.EnvelopeError):
+            envelope.unpack_envelope(packed[:1] + b"\x7f" + packed[2:])
+
+    def test_detect_version(self):
+        """Test prefix detection for raw, armored and legacy data."""
+        packed = envelope.pack_envelope(envelope.VERSION_CBC, 1, b"s" * 16, b"n" * 16, b"x")
+        assert envelope.detect_version(packed) == envelope.VERSION_CBC
+        assert envelope.detect_version(envelope.armor(packed)) == envelope.VERSION_CBC
+
+        legacy = SecureMnemonicEncryption().encrypt_mnemonic("legacy mnemonic", "Password123!")
+        assert envelope.detect_version(legacy) == envelope.VERSION_LEGACY
+        assert envelope.detect_version("not base64!") == envelope.VERSION_LEGACY
+
+    def test_detect_version_skips_pasted_whitespace(self):
+        """Test that leading whitespace does not hide an armored prefix."""
+        encryption = SecureMnemonicEncryption(envelope_version=envelope.VERSION_GCM)
+        encrypted = encryption.encrypt_mnemonic("pasted mnemonic", "Password123!")
+        for pasted in (" " + encrypted, "\n" + encrypted, "\r\n\t" + encrypted):
+            assert envelope.detect_version(pasted) == envelope.VERSION_GCM
+            assert envelope.detect_version(pasted.encode('ascii')) == envelope.VERSION_GCM
+            assert encryption.validate_envelope(pasted) == envelope.REASON_OK
+        assert encryption.decrypt_mnemonic("\n" + encrypted, "Password123!") == "pasted mnemonic"
+
+
+class TestBinaryEnvelopeEncryption:
+    """Test cases for SecureMnemonicEncryption with binary envelopes."""
+
+    mnemonic = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+    password = "SecurePassword123!"
+
+    def test_armored_roundtrip_and_size(self):
+        """Test the armored v2 round trip and that it is smaller than v1."""
+        v2 = SecureMnemonicEncryption(envelope_version=envelope.VERSION_CBC)
+        encrypted = v2.encrypt_mnemonic(self.mnemonic, self.password)
+        assert isinstance(encrypted, str)
+
+        legacy = SecureMnemonicEncryption().encrypt_mnemonic(self.mnemonic, self.password)
+        assert len(encrypted) < len(legacy)
+
+        # Any instance decrypts either version
+        legacy_reader = SecureMnemonicEncryption()
+        assert legacy_reader.decrypt_mnemonic(encrypted, self.password) == self.mnemonic
+        assert v2.decrypt_mnemonic(legacy, self.password) == self.mnemonic
+        assert legacy_reader.decrypt_mnemonic(encrypted, "WrongPassword123!") != self.mnemonic
+
+    def test_raw_roundtrip(self):
+        """Test unarmored binary output."""
+        v2 = SecureMnemonicEncryption(envelope_version=envelope.VERSION_CBC, armor=False)
+        encrypted = v2.encrypt_mnemonic(self.mnemonic, self.password)
+        assert isinstance(encrypted, bytes)
+        assert encrypted[0] == envelope.MAGIC
+        assert v2.decrypt_mnemonic(encrypted, self.password) == self.mnemonic
+
+    def test_header_records_iterations(self):
+        """Test that the KDF cost is read from the header."""
+        encrypted = SecureMnemonicEncryption(iterations=1500, envelope_version=envelope.VERSION_CBC,
+                                             armor=False).encrypt_mnemonic(self.mnemonic, self.password)
+        header, _, _ = envelope.unpack_envelope(encrypted)
+        assert header.iterations == 1500
+        assert SecureMnemonicEncryption().decrypt_mnemonic(encrypted, self.password) == self.mnemonic
+
+    def test_unsupported_version(self):
+        """Test that unknown envelope versions are rejected up front."""
+        with pytest.raises(ValueError):
+            SecureMnemonicEncryption(envelope_version=99)
+
+
+class TestAuthenticatedEnvelope:
+    """Test cases for the AES-GCM (v3) envelope."""
+
+    mnemonic = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+    password = "SecurePassword123!"
+
+    def setup_method(self):
+        """Setup a v3 instance."""
+        self.encryption = SecureMnemonicEncryption(envelope_version=envelope.VERSION_GCM, armor=False)
+
+    def test_roundtrip(self):
+        """Test the GCM round trip and version detection."""
+        encrypted = self.encryption.encrypt_mnemonic(self.mnemonic, self.password)
+        assert envelope.detect_version(encrypted) == envelope.VERSION_GCM
+        assert SecureMnemonicEncryption().decrypt_mnemonic(encrypted, self.password) == self.mnemonic
+
+    def test_wrong_password_detected(self):
+        """Test that a wrong password always fails authentication."""
+        encrypted = self.encryption.encrypt_mnemonic(self.mnemonic, self.password)
+        assert self.encryption.decrypt_mnemonic(encrypted, "WrongPassword123!") is None
+
+    def test_tampering_detected(self):
+        """Test that changes to the header or ciphertext are rejected."""
+        encrypted = bytearray(self.encryption.encrypt_mnemonic(self.mnemonic, self.password))
+
+        tampered_body = bytes(encrypted[:-1]) + bytes([encrypted[-1] ^ 1])
+        assert self.encryption.decrypt_mnemonic(tampered_body, self.password) is None
+
+        # Lowering the recorded iteration count breaks the tag as well
+        tampered_header = bytearray(encrypted)
+        tampered_header[6] ^= 1
+        assert self.encryption.decrypt_mnemonic(bytes(tampered_header), self.password) is None
@@ -0,0 +1,293 @@
+"""
+Unit tests for encrypted file storage
+Run with: python -m pytest tests/
+"""
+
+import json
+import os
+import threading
+
+import pytest
+
+from utils.file_manager import ConfigManager, SecureFileManager
+
+
+def _fill(manager, count):
+    for i in range(count):
+        assert manager.save_encrypted_mnemonic(f"data{i}", f"entry{i}", {'index': i})
+
+
+class TestMetadataIndex:
+    """Test cases for the SecureFileManager listing index."""
+
+    def test_listing_matches_files(self, tmp_path):
+        """Test that listings reflect saves and deletes."""
+        manager = SecureFileManager(str(tmp_path))
+        _fill(manager, 3)
+        listed = manager.list_encrypted_files()
+        assert [entry['filename'] for entry in listed] == ["entry0", "entry1", "entry2"]
+        assert listed[1]['metadata'] == {'index': 1}
+
+        assert manager.delete_encrypted_file("entry1")
+        assert manager.save_encrypted_mnemonic("data9", "entry9")
+        assert [entry['filename'] for entry in manager.list_encrypted_files()] == ["entry0", "entry2", "entry9"]
+
+        # A fresh manager agrees with the maintained index
+        assert SecureFileManager(str(tmp_path)).list_encrypted_files() == manager.list_encrypted_files()
+
+    def test_indexed_listing_does_not_open_entries(self, tmp_path, monkeypatch):
+        """Test that a warm listing reads only the index file."""
+        manager = SecureFileManager(str(tmp_path))
+        _fill(manager, 5)
+        manager.list_encrypted_files()
+
+        opened = []
+        real_open = open
+        monkeypatch.setattr("builtins.open", lambda path, *args, **kwargs: (
+            opened.append(os.path.basename(str(path))), real_open(path, *args, **kwargs))[1])
+
+        assert len(SecureFileManager(str(tmp_path)).list_encrypted_files()) == 5
+        assert len(manager.list_encrypted_files()) == 5
+        assert set(opened) <= {SecureFileManager.INDEX_FILE, SecureFileManager.INDEX_JOURNAL}
+
+    def test_reconciles_external_changes(self, tmp_path):
+        """Test that files changed behind the index are picked up on open."""
+        manager = SecureFileManager(str(tmp_path))
+        _fill(manager, 2)
+        manager.list_encrypted_files()
+
+        # Written by a tool that does not maintain the index
+        (tmp_path / "outside.enc").write_text(json.dumps(
+            {'encrypted_mnemonic': "x", 'created_at': "2024-01-01", 'metadata': {'source': "copy"}}))
+        (tmp_path / "entry0.enc").write_text(json.dumps(
+            {'encrypted_mnemonic': "y", 'created_at': "2024-01-02", 'metadata': {'edited': True}}))
+        (tmp_path / "entry1.enc").unlink()
+        (tmp_path / "broken.enc").write_text("{not json")
+
+        listed = {entry['filename']: entry for entry in SecureFileManager(str(tmp_path)).list_encrypted_files()}
+        assert set(listed) == {"entry0", "outside"}
+        assert listed["entry0"]['metadata'] == {'edited': True}
+        assert listed["outside"]['created_at'] == "2024-01-01"
+
+    def test_rebuilds_missing_or_corrupt_index(self, tmp_path):
+        """Test that a lost or damaged index is rebuilt from the entries."""
+        manager = SecureFileManager(str(tmp_path))
+        _fill(manager, 3)
+        index_path = tmp_path / SecureFileManager.INDEX_FILE
+        assert not index_path.exists()
+
+        assert len(manager.list_encrypted_files()) == 3
+        assert index_path.exists()
+
+        index_path.write_text("garbage")
+        assert len(SecureFileManager(str(tmp_path)).list_encrypted_files()) == 3
+        assert json.loads(index_path.read_text())['version'] == SecureFileManager.INDEX_VERSION
+
+    def test_saves_journal_instead_of_rewriting_index(self, tmp_path, monkeypatch):
+        """Test that saves and deletes append to the journal, and listings compact it."""
+        manager = SecureFileManager(str(tmp_path))
+        _fill(manager, 8)
+        manager.list_encrypted_files()
+        index_path = tmp_path / SecureFileManager.INDEX_FILE
+        journal_path = tmp_path / SecureFileManager.INDEX_JOURNAL
+
+        index_writes = []
+        real_write_index = manager._write_index
+        monkeypatch.setattr(manager, "_write_index", lambda entries: (index_writes.append(1),
+                                                                      real_write_index(entries))[1])
+
+        assert manager.save_encrypted_mnemonic("new", "entry8")
+        assert manager.delete_encrypted_file("entry0")
+        assert index_writes == []
+        assert len(journal_path.read_text().splitlines()) == 2
+
+        # Two journal records for eight entries are replayed, not compacted
+        names = [entry['filename'] for entry in manager.list_encrypted_files()]
+        assert names == [f"entry{i}" for i in range(1, 9)]
+        assert index_writes == []
+
+        assert manager.save_encrypted_mnemonic("new", "entry9")
+        assert len(manager.list_encrypted_files()) == 9
+        assert index_writes == [1]
+        assert not journal_path.exists()
+        assert "entry9" in json.loads(index_path.read_text())['entries']
+
+    def test_torn_journal_line_is_skipped(self, tmp_path):
+        """Test that a crash mid-append does not lose the rest of the journal."""
+        manager = SecureFileManager(str(tmp_path))
+        _fill(manager, 8)
+        manager.list_encrypted_files()
+
+        journal_path = tmp_path / SecureFileManager.INDEX_JOURNAL
+        journal_path.write_text('{"name":"entry0","rec\n')
+        assert manager.save_encrypted_mnemonic("new", "entry8")
+
+        assert len(manager.list_encrypted_files()) == 9
+        assert len(SecureFileManager(str(tmp_path)).list_encrypted_files()) == 9
+
+    @pytest.mark.skipif(os.name == 'nt', reason="flock semantics")
+    def test_compaction_keeps_appends_from_other_managers(self, tmp_path):
+        """Test that another manager's journal append waits for compaction instead of being dropped."""
+        manager = SecureFileManager(str(tmp_path))
+        _fill(manager, 4)
+        manager.list_encrypted_files()
+        other = SecureFileManager(str(tmp_path))  # Own thread lock, as in another process
+
+        with manager._index_lock():
+            entries, _ = manager._read_index()
+            writer = threading.Thread(target=other.save_encrypted_mnemonic, args=("late", "late"))
+            writer.start()
+            writer.join(0.2)
+            assert writer.is_alive()  # Blocked on INDEX_LOCK
+            manager._write_index(entries)
+        writer.join()
+
+        assert "late" in [entry['filename'] for entry in manager.list_encrypted_files()]
+        assert "late" in [entry['filename'] for entry in other.list_encrypted_files()]
+
+
+class TestAtomicWrites:
+    """Test cases for crash-safe saves and group commit."""
+
+    @staticmethod
+    def _count_fsyncs(monkeypatch):
+        calls = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: (calls.append(fd), real_fsync(fd))[1])
+        return calls
+
+    def test_save_is_durable_and_leaves_no_temp_files(self, tmp_path, monkeypatch):
+        """Test that a save fsyncs the file and the directory."""
+        manager = SecureFileManager(str(tmp_path))
+        fsyncs = self._count_fsyncs(monkeypatch)
+        assert manager.save_encrypted_mnemonic("data", "wallet")
+
+        assert len(fsyncs) == 2
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["wallet.enc"]
+        if os.name != 'nt':
+            assert (tmp_path / "wallet.enc").stat().st_mode & 0o777 == 0o600
+
+    def test_failed_save_keeps_previous_entry(self, tmp_path, monkeypatch):
+        """Test that an interrupted save never leaves a torn entry."""
+        manager = SecureFileManager(str(tmp_path))
+        assert manager.save_encrypted_mnemonic("old", "wallet")
+
+        def crash(*args):
+            raise OSError("simulated crash")
+
+        monkeypatch.setattr(os, "replace", crash)
+        assert not manager.save_encrypted_mnemonic("new", "wallet")
+        monkeypatch.undo()
+
+        assert manager.load_encrypted_mnemonic("wallet")['encrypted_mnemonic'] == "old"
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["wallet.enc"]
+
+    def test_group_commit_batches_syncs_and_index(self, tmp_path, monkeypatch):
+        """Test that a group publishes all entries with one directory sync and index append."""
+        manager = SecureFileManager(str(tmp_path))
+        _fill(manager, 2)
+        manager.list_encrypted_files()
+
+        fsyncs = self._count_fsyncs(monkeypatch)
+        index_appends = []
+        real_index_append = manager._index_append
+        monkeypatch.setattr(manager, "_index_append", lambda changes: (index_appends.append(list(changes)),
+                                                                       real_index_append(index_appends[-1]))[1])
+
+        with manager.group_commit():
+            for i in range(20):
+                assert manager.save_encrypted_mnemonic(f"bulk{i}", f"bulk{i:02d}")
+            assert manager.delete_encrypted_file("entry0")
+            assert manager.load_encrypted_mnemonic("bulk05") is None  # Not published yet
+            assert fsyncs == []
+
+        assert len(fsyncs) == 21  # One per entry plus one for the directory
+        assert len(index_appends) == 1 and len(index_appends[0]) == 21
+        names = [entry['filename'] for entry in manager.list_encrypted_files()]
+        assert names == ["bulk%02d" % i for i in range(20)] + ["entry1"]
+        assert SecureFileManager(str(tmp_path)).list_encrypted_files() == manager.list_encrypted_files()
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_group_commit_discards_on_error(self, tmp_path):
+        """Test that a failing group publishes nothing and cleans up."""
+        manager = SecureFileManager(str(tmp_path))
+        try:
+            with manager.group_commit():
+                manager.save_encrypted_mnemonic("data", "wallet")
+                with manager.group_commit():  # Joins the outer group
+                    manager.save_encrypted_mnemonic("data", "other")
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+
+        assert list(tmp_path.iterdir()) == []
+        assert manager.save_encrypted_mnemonic("data", "wallet")
+
+
+class TestBulkIO:
+    """Test cases for load_many / save_many."""
+
+    def test_save_many_then_load_many_in_order(self, tmp_path, capsys):
+        """Test that results come back in request order with per-entry errors."""
+        manager = SecureFileManager(str(tmp_path))
+        entries = [(f"data{i}", f"entry{i:03d}", {'index': i}) for i in range(50)]
+        entries.insert(10, ("data", "missing_dir/entry", None))
+
+        saved = list(manager.save_many(iter(entries), workers=4))
+        assert [result.filename for result in saved] == [filename for _, filename, _ in entries]
+        assert [result.result for result in saved].count(True) == 50
+        assert saved[10].result is None and saved[10].error
+
+        names = [f"entry{i:03d}" for i in reversed(range(50))] + ["nope"]
+        loaded = list(manager.load_many(names, workers=4))
+        assert [result.filename for result in loaded] == names
+        assert loaded[0].result['encrypted_mnemonic'] == "data49"
+        assert loaded[-1] == ("nope", None, "Entry not found")
+
+        (tmp_path / "broken.enc").write_text("{not json")
+        (broken,) = manager.load_many(["broken"])
+        assert broken.result is None and broken.error
+
+        # Errors are reported, never printed
+        assert capsys.readouterr().out == ""
+
+    def test_save_many_reports_malformed_entries(self, tmp_path):
+        """Test that a bad entry tuple is an error result, not an exception."""
+        manager = SecureFileManager(str(tmp_path))
+        entries = [("data0", "entry0", None), ("data1", "entry1"), None, ("data3", "entry3", None)]
+
+        saved = list(manager.save_many(entries, workers=2))
+        assert [result.filename for result in saved] == ["entry0", None, None, "entry3"]
+        assert [result.result for result in saved] == [True, None, None, True]
+        assert saved[1].error and saved[2].error
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["entry0.enc", "entry3.enc"]
+
+    def test_save_many_inside_group_commit(self, tmp_path):
+        """Test that concurrent saves can share one group commit."""
+        manager = SecureFileManager(str(tmp_path))
+        manager.list_encrypted_files()
+        with manager.group_commit():
+            assert all(result.result for result in manager.save_many(
+                (f"data{i}", f"entry{i:03d}", None) for i in range(40)))
+        assert len(manager.list_encrypted_files()) == 40
+        assert len(SecureFileManager(str(tmp_path)).list_encrypted_files()) == 40
+
+
+class TestConfigManager:
+    """Test cases for ConfigManager."""
+
+    def test_pbkdf2_iterations_are_calibrated(self, tmp_path, monkeypatch):
+        """Test that a new config records this host's calibrated PBKDF2 cost."""
+        from crypto import calibration
+
+        calls = []
+        monkeypatch.setattr(calibration, 'calibrate_iterations', lambda *args: calls.append(1) or 321000)
+        config_path = tmp_path / "config.json"
+
+        config = ConfigManager(str(config_path)).load_config()
+        assert config['security_settings']['pbkdf2_iterations'] == 321000
+        assert json.loads(config_path.read_text())['security_settings']['pbkdf2_iterations'] == 321000
+
+        # Loaded from the file afterwards, without calibrating again
+        assert ConfigManager(str(config_path)).load_config() == config
+        assert len(calls) == 1
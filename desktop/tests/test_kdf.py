@@ -0,0 +1,172 @@
+"""
+Unit tests for PBKDF2 key derivation backends
+Run with: python -m pytest tests/
+"""
+
+import base64
+import binascii
+import hashlib
+import os
+
+import pytest
+
+from crypto import envelope, kdf_backends
+from crypto.secure_encryption import CryptoJSAES, SecureMnemonicEncryption
+
+
+class TestKDFBackends:
+    """Test cases for the KDF backend registry."""
+
+    def teardown_method(self):
+        """Drop test backends and force reselection."""
+        for name in ('broken', 'wrapped'):
+            kdf_backends._backends.pop(name, None)
+        kdf_backends._selected = None
+
+    def test_builtin_backends_agree(self):
+        """Test that every built-in backend matches the known vectors."""
+        for name in kdf_backends.available_backends():
+            backend = kdf_backends._backends[name]
+            assert kdf_backends._verify(backend), name
+
+    def test_selection_reports_diagnostics(self):
+        """Test that selection reports the chosen backend and timings."""
+        info = kdf_backends.backend_info()
+        assert info['selected'] in kdf_backends.available_backends()
+        assert info['selected'] in info['timings']
+
+    def test_broken_backend_rejected(self):
+        """Test that a backend producing wrong output is never selected."""
+        kdf_backends.register_backend('broken', lambda p, s, i, n: b"\x00" * n)
+        info = kdf_backends.backend_info()
+        assert 'broken' in info['rejected']
+        assert info['selected'] != 'broken'
+
+        with pytest.raises(ValueError):
+            kdf_backends.select_backend('broken')
+
+    def test_forced_backend(self):
+        """Test that a registered backend can be forced."""
+        calls = []
+
+        def wrapped(password, salt, iterations, length):
+            calls.append(iterations)
+            return kdf_backends._hashlib_pbkdf2(password, salt, iterations, length)
+
+        kdf_backends.register_backend('wrapped', wrapped)
+        kdf_backends.select_backend('wrapped')
+        kdf_backends.pbkdf2_sha256(b"password", b"salt", 3)
+        assert calls[-1] == 3
+        assert kdf_backends.backend_info() == {'selected': 'wrapped', 'forced': True}
+
+
+class TestBatchPBKDF2:
+    """Test cases for the lockstep batched PBKDF2 engine."""
+
+    def setup_method(self):
+        """Skip when numpy is not installed."""
+        pytest.importorskip("numpy")
+
+    def test_matches_hashlib(self):
+        """Test bit-identical output across salt lengths, passwords and key lengths."""
+        from crypto.batch_pbkdf2 import pbkdf2_sha256_batch
+
+        salts = [os.urandom(16) for _ in range(4)] + [b"salt", os.urandom(70)]
+        for password in (b"password", b"p" * 100):
+            for length in (16, 32, 40):
+                expected = [hashlib.pbkdf2_hmac('sha256', password, s, 3, length) for s in salts]
+                assert pbkdf2_sha256_batch(password, salts, 3, length) == expected
+
+    def test_known_vector(self):
+        """Test against a published PBKDF2-HMAC-SHA256 vector."""
+        from crypto.batch_pbkdf2 import pbkdf2_sha256_batch
+
+        password, salt, iterations, length, expected = kdf_backends.KNOWN_VECTORS[1]
+        assert pbkdf2_sha256_batch(password, [salt], iterations, length)[0].hex() == expected
+
+    def test_decrypt_batch_lockstep(self, monkeypatch):
+        """Test decrypt_batch through the lockstep engine and, by default, without it."""
+        from crypto import batch_pbkdf2
+
+        monkeypatch.setattr(SecureMnemonicEncryption, 'PBKDF2_ITERATIONS', 5)
+
+        encryption = SecureMnemonicEncryption()
+        password = "BatchPassword123!"
+        mnemonics = [f"lockstep mnemonic {i}" for i in range(3)]
+        items = [encryption.encrypt_mnemonic(m, password) for m in mnemonics] + ["invalid_base64!"]
+
+        assert encryption.decrypt_batch(items, password, lockstep=True) == mnemonics + [None]
+
+        # The default path never probes or runs the engine
+        def unexpected(*args):
+            raise AssertionError("lockstep engine used")
+
+        monkeypatch.setattr(batch_pbkdf2, 'lockstep_speedup', unexpected)
+        monkeypatch.setattr(batch_pbkdf2, 'pbkdf2_sha256_batch', unexpected)
+        assert encryption.decrypt_batch(items * 20, password) == (mnemonics + [None]) * 20
+
+
+class TestCalibration:
+    """Test cases for KDF cost calibration."""
+
+    def test_calibration_cached_on_disk(self, tmp_path, monkeypatch):
+        """Test that a second calibration reads the cache instead of measuring."""
+        from crypto import calibration
+
+        cache_path = tmp_path / "calibration.json"
+        calls = []
+        monkeypatch.setattr(calibration, 'measure_iterations_per_second',
+                            lambda: calls.append(1) or 123456.0)
+
+        assert calibration.calibrate_iterations(1.0, cache_path=cache_path) == 123000
+        assert calibration.calibrate_iterations(1.0, cache_path=cache_path) == 123000
+        assert len(calls) == 1
+        assert cache_path.exists()
+
+        # Forcing re-measures, and the floor still applies
+        assert calibration.calibrate_iterations(0.01, min_iterations=5000,
+                                                cache_path=cache_path, force=True) == 5000
+        assert len(calls) == 2
+
+    def test_envelope_records_iterations(self):
+        """Test that a non-default cost travels inside the binary header."""
+        mnemonic = "calibrated mnemonic phrase"
+        password = "CalibratedPassword123!"
+
+        encrypted = SecureMnemonicEncryption(iterations=1234, envelope_version=envelope.VERSION_GCM
+                                             ).encrypt_mnemonic(mnemonic, password)
+        header, _, _ = envelope.unpack_envelope(envelope.dearmor(encrypted))
+        assert header.iterations == 1234
+
+        # A default instance reads the cost from the envelope
+        assert SecureMnemonicEncryption().decrypt_mnemonic(encrypted, password) == mnemonic
+
+    def test_legacy_envelopes_keep_the_mobile_cost(self, monkeypatch):
+        """Test that v1 refuses a cost the mobile app could not read."""
+        with pytest.raises(ValueError):
+            SecureMnemonicEncryption(iterations=1234)
+
+        from crypto import calibration
+        monkeypatch.setattr(calibration, 'calibrate_iterations', lambda *args, **kwargs: 50000)
+        calibrated = SecureMnemonicEncryption.calibrated()
+        assert (calibrated.iterations, calibrated.envelope_version) == (50000, envelope.VERSION_GCM)
+
+        # Existing iterations:salt_hex:data envelopes still decrypt
+        mnemonic, password, salt = "older calibrated phrase", "CalibratedPassword123!", os.urandom(16)
+        key = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, 1234, 32)
+        inner = base64.b64encode(CryptoJSAES.encrypt_buffer(mnemonic.encode('utf-8'), binascii.hexlify(key)))
+        encrypted = base64.b64encode(b"1234:" + binascii.hexlify(salt) + b":" + inner).decode('ascii')
+        assert SecureMnemonicEncryption().decrypt_mnemonic(encrypted, password) == mnemonic
+
+    def test_default_cost_keeps_mobile_format(self):
+        """Test that the default cost keeps the two-field mobile format."""
+        encrypted = SecureMnemonicEncryption().encrypt_mnemonic("default cost mnemonic", "Password123!")
+        assert len(base64.b64decode(encrypted).decode('utf-8').split(':')) == 2
+
+    def test_iterations_bounds(self):
+        """Test that out-of-range costs are rejected."""
+        with pytest.raises(ValueError):
+            SecureMnemonicEncryption(iterations=SecureMnemonicEncryption.MAX_PBKDF2_ITERATIONS + 1)
+
+        crafted = base64.b64encode(b"99999999999:00:AAAA").decode('ascii')
+        assert SecureMnemonicEncryption().decrypt_mnemonic(crafted, "Password123!") is None
@@ -0,0 +1,72 @@
+"""
+Unit tests for the derived key cache
+Run with: python -m pytest tests/
+"""
+
+import pytest
+
+from crypto.key_cache import DerivedKeyCache
+from crypto.secure_encryption import SecureMnemonicEncryption
+
+
+class TestDerivedKeyCache:
+    """Test cases for DerivedKeyCache."""
+
+    def test_hit_and_miss_counters(self):
+        """Test that a repeat lookup skips derivation."""
+        cache = DerivedKeyCache(max_entries=4)
+        calls = []
+
+        def derive():
+            calls.append(1)
+            return b"k" * 32
+
+        assert cache.get_or_derive(b"salt", b"password", derive) == b"k" * 32
+        assert cache.get_or_derive(b"salt", b"password", derive) == b"k" * 32
+        assert len(calls) == 1
+
+        # A different password is a different entry
+        cache.get_or_derive(b"salt", b"other", derive)
+        assert len(calls) == 2
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 2
+
+    def test_lru_eviction_zeroizes(self):
+        """Test that evicted keys are wiped."""
+        cache = DerivedKeyCache(max_entries=1)
+        cache.get_or_derive(b"salt1", b"pw", lambda: b"\x01" * 32)
+        stored_key, _ = next(iter(cache._entries.values()))
+
+        cache.get_or_derive(b"salt2", b"pw", lambda: b"\x02" * 32)
+        assert len(cache) == 1
+        assert cache.stats()['evictions'] == 1
+        assert stored_key == bytearray(32)
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are derived again."""
+        cache = DerivedKeyCache(ttl_seconds=0)
+        calls = []
+        cache.get_or_derive(b"salt", b"pw", lambda: calls.append(1) or b"k" * 32)
+        cache.get_or_derive(b"salt", b"pw", lambda: calls.append(1) or b"k" * 32)
+        assert len(calls) == 2
+
+    def test_invalid_size(self):
+        """Test that an empty cache size is rejected."""
+        with pytest.raises(ValueError):
+            DerivedKeyCache(max_entries=0)
+
+    def test_repeat_decrypt_uses_cache(self):
+        """Test that SecureMnemonicEncryption serves repeat decrypts from the cache."""
+        cache = DerivedKeyCache()
+        encryption = SecureMnemonicEncryption(key_cache=cache)
+        mnemonic = "cached mnemonic phrase for decryption"
+        password = "CachePassword123!"
+
+        encrypted = encryption.encrypt_mnemonic(mnemonic, password)
+        assert encryption.decrypt_mnemonic(encrypted, password) == mnemonic
+        assert encryption.decrypt_mnemonic(encrypted, password) == mnemonic
+        assert cache.stats()['hits'] == 1
+
+        # Wrong password misses the cache and still fails
+        assert encryption.decrypt_mnemonic(encrypted, "WrongPassword123!") is None
+        assert cache.stats()['misses'] == 2
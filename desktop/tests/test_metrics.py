@@ -0,0 +1,103 @@
+"""
+Unit tests for the instrumentation hooks
+Run with: python -m pytest tests/
+"""
+
+import pytest
+
+from crypto import envelope, metrics
+from crypto.secure_encryption import SecureMnemonicEncryption
+from utils.file_manager import SecureFileManager
+
+MNEMONIC = "abandon ability able about above absent absorb abstract absurd abuse access accident"
+PASSWORD = "TestPassword123!"
+
+
+@pytest.fixture
+def registry():
+    """Enabled metrics registry, disabled again after the test."""
+    yield metrics.enable()
+    metrics.disable()
+
+
+def _count(registry, operation, outcome, reason=""):
+    for row in registry.to_dict()['operations']:
+        if (row['operation'], row['outcome'], row['reason']) == (operation, outcome, reason):
+            return row['count']
+    return 0
+
+
+class TestMetrics:
+    """Test cases for the metrics registry and hooks."""
+
+    def test_disabled_hooks_are_no_ops(self):
+        """Test that nothing is collected while instrumentation is off."""
+        metrics.disable()
+        assert metrics.get_metrics() is None
+        assert metrics.stage('aes') is metrics.stage('pbkdf2')
+
+        encryption = SecureMnemonicEncryption()
+        encrypted = encryption.encrypt_mnemonic(MNEMONIC, PASSWORD)
+        assert encryption.decrypt_mnemonic(encrypted, PASSWORD) == MNEMONIC
+
+    def test_legacy_stages_and_success(self, registry):
+        """Test that a legacy round-trip times every stage."""
+        encryption = SecureMnemonicEncryption()
+        encrypted = encryption.encrypt_mnemonic(MNEMONIC, PASSWORD)
+        assert encryption.decrypt_mnemonic(encrypted, PASSWORD) == MNEMONIC
+
+        stages = registry.to_dict()['stages']
+        for name in ('encrypt', 'decrypt', 'decode', 'pbkdf2', 'evp_bytes_to_key', 'aes', 'unpad'):
+            assert stages[name]['count'] >= 1, name
+        assert stages['pbkdf2']['count'] == 2
+        assert _count(registry, 'encrypt', 'success') == 1
+        assert _count(registry, 'decrypt', 'success') == 1
+
+    @pytest.mark.parametrize("data, reason", [
+        ("", envelope.REASON_EMPTY),
+        ("not*base64!", envelope.REASON_BAD_BASE64),
+    ])
+    def test_structural_failure_reasons(self, registry, data, reason):
+        """Test that malformed input is counted with its reason code."""
+        assert SecureMnemonicEncryption().decrypt_mnemonic(data, PASSWORD) is None
+        assert _count(registry, 'decrypt', 'failure', reason) == 1
+        assert 'pbkdf2' not in registry.to_dict()['stages']
+
+    def test_wrong_password_reason(self, registry):
+        """Test that a wrong GCM password is reported as an authentication failure."""
+        encryption = SecureMnemonicEncryption(envelope_version=envelope.VERSION_GCM)
+        encrypted = encryption.encrypt_mnemonic(MNEMONIC, PASSWORD)
+        assert encryption.decrypt_mnemonic(encrypted, "WrongPassword123!") is None
+        assert _count(registry, 'decrypt', 'failure', 'authentication_failed') == 1
+
+    def test_file_manager_io(self, registry, tmp_path):
+        """Test that storage operations are timed and counted."""
+        manager = SecureFileManager(str(tmp_path))
+        assert manager.save_encrypted_mnemonic("data", "wallet")
+        assert manager.load_encrypted_mnemonic("wallet") is not None
+        assert manager.load_encrypted_mnemonic("missing") is None
+        assert len(manager.list_encrypted_files()) == 1
+        assert manager.delete_encrypted_file("wallet")
+
+        stages = registry.to_dict()['stages']
+        for name in ('file_save', 'file_load', 'file_list', 'file_delete'):
+            assert stages[name]['count'] == 1, name
+        assert _count(registry, 'file_load', 'failure', 'not_found') == 1
+
+    def test_prometheus_export(self, registry):
+        """Test the text exposition format."""
+        registry.observe('aes', 0.002)
+        registry.observe('aes', 10.0)
+        registry.record('decrypt', 'failure', 'bad_"salt"')
+
+        text = registry.to_prometheus()
+        assert '# TYPE mnemonic_stage_duration_seconds histogram' in text
+        assert 'mnemonic_stage_duration_seconds_bucket{stage="aes",le="0.001"} 0' in text
+        assert 'mnemonic_stage_duration_seconds_bucket{stage="aes",le="0.005"} 1' in text
+        assert 'mnemonic_stage_duration_seconds_bucket{stage="aes",le="+Inf"} 2' in text
+        assert 'mnemonic_stage_duration_seconds_count{stage="aes"} 2' in text
+        assert ('mnemonic_operations_total{operation="decrypt",outcome="failure",'
+                'reason="bad_\\"salt\\""} 1') in text
+
+        registry.reset()
+        assert registry.to_dict() == {'stages': {}, 'operations': []}
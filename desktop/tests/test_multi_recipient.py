@@ -0,0 +1,95 @@
+"""
+Unit tests for multi-recipient envelopes
+Run with: python -m pytest tests/
+"""
+
+import pytest
+
+from crypto import envelope, multi_recipient, validation
+from crypto.secure_encryption import SecureMnemonicEncryption
+from utils.file_manager import SecureFileManager
+
+MNEMONIC = "abandon ability able about above absent absorb abstract absurd abuse access accident"
+RECIPIENTS = {"alice": "AlicePassword1!", "bob": "BobPassword22@"}
+
+
+class TestMultiRecipient:
+    """Test cases for multi-recipient envelopes."""
+
+    def setup_method(self):
+        """Encrypt once for two recipients."""
+        self.sealed = multi_recipient.encrypt_for_recipients(MNEMONIC, RECIPIENTS, iterations=1000)
+
+    def test_every_recipient_can_decrypt(self):
+        """Test that each password opens the envelope, with or without a label."""
+        assert envelope.detect_version(self.sealed) == envelope.VERSION_MULTI
+        for label, password in RECIPIENTS.items():
+            assert multi_recipient.decrypt_for_recipient(self.sealed, password) == MNEMONIC
+            assert multi_recipient.decrypt_for_recipient(self.sealed, password, label) == MNEMONIC
+
+        assert multi_recipient.decrypt_for_recipient(self.sealed, "WrongPassword1!") is None
+        assert multi_recipient.decrypt_for_recipient(self.sealed, RECIPIENTS["alice"], "bob") is None
+
+    def test_recipient_changes_keep_payload(self):
+        """Test that add, remove and change-password leave the ciphertext untouched."""
+        payload = multi_recipient.unpack(self.sealed).ciphertext
+
+        added = multi_recipient.add_recipient(self.sealed, RECIPIENTS["bob"], "carol", "CarolPassword3#",
+                                              iterations=1000)
+        assert multi_recipient.decrypt_for_recipient(added, "CarolPassword3#") == MNEMONIC
+
+        removed = multi_recipient.remove_recipient(added, "alice")
+        assert multi_recipient.unpack(removed).labels() == ["bob", "carol"]
+        assert multi_recipient.decrypt_for_recipient(removed, RECIPIENTS["alice"]) is None
+
+        changed = multi_recipient.change_password(removed, "bob", RECIPIENTS["bob"], "NewBobPassword4$")
+        assert multi_recipient.decrypt_for_recipient(changed, RECIPIENTS["bob"]) is None
+        assert multi_recipient.decrypt_for_recipient(changed, "NewBobPassword4$") == MNEMONIC
+
+        for version in (added, removed, changed):
+            assert multi_recipient.unpack(version).ciphertext == payload
+
+    def test_invalid_operations(self):
+        """Test that bad passwords and labels are rejected."""
+        with pytest.raises(ValueError):
+            multi_recipient.add_recipient(self.sealed, "WrongPassword1!", "carol", "CarolPassword3#")
+        with pytest.raises(ValueError):
+            multi_recipient.add_recipient(self.sealed, RECIPIENTS["bob"], "alice", "CarolPassword3#")
+        with pytest.raises(ValueError):
+            multi_recipient.change_password(self.sealed, "bob", "WrongPassword1!", "NewBobPassword4$")
+        with pytest.raises(ValueError):
+            multi_recipient.remove_recipient(multi_recipient.remove_recipient(self.sealed, "alice"), "bob")
+        with pytest.raises(ValueError):
+            multi_recipient.encrypt_for_recipients(MNEMONIC, {"dave": "short"})
+
+    def test_malformed_envelopes(self):
+        """Test that truncated data fails with a reason code."""
+        raw = envelope.dearmor(self.sealed)
+        with pytest.raises(envelope.EnvelopeError) as info:
+            multi_recipient.unpack(raw[:40])
+        assert info.value.reason == envelope.REASON_TRUNCATED
+        assert multi_recipient.decrypt_for_recipient(raw[:-1] + bytes([raw[-1] ^ 1]),
+                                                     RECIPIENTS["alice"]) is None
+
+    def test_main_api_and_screening(self, tmp_path):
+        """Test that v4 envelopes open through SecureMnemonicEncryption and pass screening."""
+        encryption = SecureMnemonicEncryption()
+        for password in RECIPIENTS.values():
+            assert encryption.decrypt_mnemonic(self.sealed, password) == MNEMONIC
+        assert encryption.decrypt_mnemonic_bytes(envelope.dearmor(self.sealed),
+                                                 RECIPIENTS["bob"].encode('utf-8')) == MNEMONIC.encode('utf-8')
+        assert encryption.decrypt_mnemonic(self.sealed, "WrongPassword1!") is None
+        assert encryption.decrypt_batch([self.sealed], RECIPIENTS["alice"]) == [MNEMONIC]
+
+        assert validation.validate_envelope(self.sealed) == (True, envelope.REASON_OK, envelope.VERSION_MULTI)
+        truncated = envelope.armor(envelope.dearmor(self.sealed)[:40])
+        assert validation.validate_envelope(truncated).reason == envelope.REASON_TRUNCATED
+
+        # Saved next to ordinary entries, it is a valid entry to the file manager
+        manager = SecureFileManager(str(tmp_path))
+        manager.save_encrypted_mnemonic(self.sealed, "shared")
+        manager.save_encrypted_mnemonic(encryption.encrypt_mnemonic(MNEMONIC, RECIPIENTS["alice"]), "own")
+        assert dict(validation.screen_directory(tmp_path)) == {
+            "own": (True, envelope.REASON_OK, envelope.VERSION_LEGACY),
+            "shared": (True, envelope.REASON_OK, envelope.VERSION_MULTI),
+        }
@@ -0,0 +1,144 @@
+"""
+Unit tests for the packed vault storage
+Run with: python -m pytest tests/
+"""
+
+import json
+import os
+
+import pytest
+
+from utils.file_manager import SecureFileManager
+from utils.pack_storage import PackError, PackStorage
+
+
+@pytest.fixture
+def pack(tmp_path):
+    with PackStorage(str(tmp_path / "vault.pack")) as opened:
+        yield opened
+
+
+class TestPackStorage:
+    """Test cases for PackStorage."""
+
+    def test_save_load_list_delete(self, pack):
+        """Test the SecureFileManager-compatible interface."""
+        assert pack.bulk_save([(f"ENC{i}", f"entry{i:03d}", {'index': i}) for i in range(50)]) == 50
+        assert pack.save_encrypted_mnemonic("NEW", "entry010", {'index': "replaced"})
+
+        assert pack.load_encrypted_mnemonic("entry007")['encrypted_mnemonic'] == "ENC7"
+        assert pack.load_encrypted_mnemonic("entry010")['metadata'] == {'index': "replaced"}
+        assert pack.load_encrypted_mnemonic("missing") is None
+
+        listed = pack.list_encrypted_files()
+        assert [entry['filename'] for entry in listed] == [f"entry{i:03d}" for i in range(50)]
+
+        assert pack.delete_encrypted_file("entry000")
+        assert not pack.delete_encrypted_file("entry000")
+        assert pack.load_encrypted_mnemonic("entry000") is None
+        assert len(pack.list_encrypted_files()) == 49
+
+    def test_load_reads_only_one_record(self, pack, monkeypatch):
+        """Test that a lookup parses a single record."""
+        pack.bulk_save([(f"ENC{i}", f"entry{i:04d}", None) for i in range(1000)])
+
+        parsed = []
+        real_read = pack._read_record
+        monkeypatch.setattr(pack, "_read_record", lambda *args: parsed.append(args) or real_read(*args))
+        assert pack.load_encrypted_mnemonic("entry0777")['encrypted_mnemonic'] == "ENC777"
+        assert len(parsed) == 1
+
+    def test_reopen_and_reject_bad_files(self, tmp_path):
+        """Test that the pack survives reopening and garbage is refused."""
+        path = tmp_path / "vault.pack"
+        with PackStorage(str(path)) as pack:
+            pack.bulk_save([("A", "a", None), ("B", "b", None)])
+        with PackStorage(str(path)) as pack:
+            assert pack.load_encrypted_mnemonic("b")['encrypted_mnemonic'] == "B"
+
+        (tmp_path / "bad.pack").write_bytes(b"not a pack at all")
+        with pytest.raises(PackError):
+            PackStorage(str(tmp_path / "bad.pack"))
+
+    def test_failed_append_keeps_pack_intact(self, pack):
+        """Test that a rejected name leaves the previous index in place."""
+        pack.bulk_save([("A", "a", None)])
+        assert pack.bulk_save([("B", "b", None), ("C", "x" * 200, None)]) == 0
+        assert [entry['filename'] for entry in pack.list_encrypted_files()] == ["a"]
+
+    @pytest.mark.parametrize("tail", [
+        b'{"encrypted_mnemonic":"MNPK half a rec',       # Crash while writing records
+        b'{"a":1}' + b"c" * 128 + b"\0" * 12 + b"MN",   # Crash while writing the trailer
+    ])
+    def test_reopen_recovers_from_torn_append(self, tmp_path, tail):
+        """Test that a crash mid-append is cut back to the last complete trailer."""
+        path = tmp_path / "vault.pack"
+        with PackStorage(str(path)) as pack:
+            pack.bulk_save([("MNPK", "a", None), ("B", "b", None)])
+        size = path.stat().st_size
+        with open(path, 'ab') as f:
+            f.write(tail)
+
+        with PackStorage(str(path)) as pack:
+            assert [entry['filename'] for entry in pack.list_encrypted_files()] == ["a", "b"]
+            assert path.stat().st_size == size
+            assert pack.save_encrypted_mnemonic("C", "c")
+        with PackStorage(str(path)) as pack:
+            assert pack.load_encrypted_mnemonic("c")['encrypted_mnemonic'] == "C"
+
+    def test_append_syncs_before_trailer(self, pack, monkeypatch):
+        """Test that records and index are fsynced before the trailer is written."""
+        writes = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: (writes.append(os.fstat(fd).st_size), real_fsync(fd))[1])
+        pack.save_encrypted_mnemonic("A", "a")
+
+        assert len(writes) == 2
+        assert writes[1] - writes[0] == 16  # Only the trailer follows the first sync
+
+    def test_compact(self, pack):
+        """Test that compaction drops dead records and keeps live ones."""
+        pack.bulk_save([(f"ENC{i}", f"entry{i}", None) for i in range(20)])
+        for i in range(10):
+            pack.delete_encrypted_file(f"entry{i}")
+        assert pack.dead_bytes() > 0
+
+        reclaimed = pack.compact()
+        assert reclaimed > 0
+        assert pack.dead_bytes() == 0
+        assert [entry['filename'] for entry in pack.list_encrypted_files()] == [f"entry{i}" for i in range(10, 20)]
+        assert pack.load_encrypted_mnemonic("entry15")['encrypted_mnemonic'] == "ENC15"
+
+    @pytest.mark.skipif(os.name == 'nt', reason="POSIX permissions")
+    def test_files_created_private(self, tmp_path, monkeypatch):
+        """Test that the pack, its compaction copy and backups are owner-only from creation."""
+        monkeypatch.setattr(os, "chmod", lambda *args: pytest.fail("files must not need chmod"))
+        old_umask = os.umask(0o022)
+        try:
+            with PackStorage(str(tmp_path / "vault.pack")) as pack:
+                pack.bulk_save([("A", "a", None), ("B", "b", None)])
+                assert pack.delete_encrypted_file("b")
+                pack.compact()
+                assert pack.backup_encrypted_file("a", str(tmp_path / "backups"))
+        finally:
+            os.umask(old_umask)
+
+        (backup_file,) = (tmp_path / "backups").glob("a_backup_*.enc")
+        for path in (tmp_path / "vault.pack", backup_file):
+            assert path.stat().st_mode & 0o777 == 0o600, path.name
+
+    def test_directory_conversion(self, tmp_path):
+        """Test packing a directory and unpacking it again, keeping created_at."""
+        manager = SecureFileManager(str(tmp_path / "source"))
+        for i in range(5):
+            manager.save_encrypted_mnemonic(f"ENC{i}", f"entry{i}", {'index': i})
+        (tmp_path / "source" / "broken.enc").write_text("{not json")
+        original = manager.list_encrypted_files()
+
+        with PackStorage.from_directory(str(tmp_path / "source"), str(tmp_path / "vault.pack")) as pack:
+            assert pack.list_encrypted_files() == original
+            assert pack.to_directory(str(tmp_path / "restored")) == 5
+
+        restored = SecureFileManager(str(tmp_path / "restored"))
+        assert restored.list_encrypted_files() == original
+        assert json.loads((tmp_path / "restored" / "entry3.enc").read_text())['encrypted_mnemonic'] == "ENC3"
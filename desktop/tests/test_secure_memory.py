@@ -0,0 +1,78 @@
+"""
+Unit tests for the secure memory arena
+Run with: python -m pytest tests/
+"""
+
+import pytest
+
+from crypto.kdf_backends import pbkdf2_sha256, pbkdf2_sha256_into
+from crypto.secure_encryption import SecureMnemonicEncryption
+from crypto.secure_memory import SecureArena
+
+
+class TestSecureArena:
+    """Test cases for SecureArena."""
+
+    def test_slots_are_reused_and_zeroed(self):
+        """Test that a released slot is wiped and handed out again."""
+        with SecureArena(slots=2, slot_size=32) as arena:
+            with arena.acquire(32) as buffer:
+                buffer[:] = b"k" * 32
+                first = buffer.obj
+            with arena.acquire(16) as buffer:
+                assert buffer.obj is first
+                assert bytes(buffer) == bytes(16)
+
+            stats = arena.stats()
+            assert stats['acquisitions'] == 2
+            assert stats['in_use'] == 0
+            assert stats['peak_in_use'] == 1
+            assert stats['fallbacks'] == 0
+
+    def test_fallback_when_exhausted_or_oversized(self):
+        """Test that requests beyond capacity still get a wiped buffer."""
+        with SecureArena(slots=1, slot_size=32) as arena:
+            with arena.acquire(32), arena.acquire(32) as spare:
+                assert isinstance(spare.obj, bytearray)
+                spare[:] = b"s" * 32
+                backing = spare.obj
+            assert backing == bytes(32)
+
+            with arena.acquire(64) as large:
+                assert len(large) == 64
+
+            assert arena.stats()['fallbacks'] == 2
+
+    def test_close_requires_released_buffers(self):
+        """Test that the arena cannot be unmapped under a live buffer."""
+        arena = SecureArena(slots=1)
+        with arena.acquire(8):
+            with pytest.raises(RuntimeError):
+                arena.close()
+        arena.close()
+        with pytest.raises(ValueError):
+            with arena.acquire(8):
+                pass
+
+    def test_derive_into(self):
+        """Test that deriving into a buffer matches the regular derivation."""
+        with SecureArena(slots=1) as arena, arena.acquire(32) as key:
+            pbkdf2_sha256_into(b"password", b"salt" * 4, 1000, key)
+            assert bytes(key) == pbkdf2_sha256(b"password", b"salt" * 4, 1000)
+
+    @pytest.mark.parametrize("version", [1, 2, 3])
+    def test_encryption_with_arena(self, version):
+        """Test that keys derived into the arena interoperate and are released."""
+        with SecureArena(slots=4) as arena:
+            encryption = SecureMnemonicEncryption(envelope_version=version, arena=arena)
+            plain = SecureMnemonicEncryption(envelope_version=version)
+            mnemonic = "abandon ability able about above absent"
+            password = "ArenaPassword123!"
+
+            encrypted = encryption.encrypt_mnemonic(mnemonic, password)
+            assert plain.decrypt_mnemonic(encrypted, password) == mnemonic
+            assert encryption.decrypt_mnemonic(plain.encrypt_mnemonic(mnemonic, password), password) == mnemonic
+
+            stats = arena.stats()
+            assert stats['acquisitions'] == 2
+            assert stats['in_use'] == 0
@@ -0,0 +1,106 @@
+"""
+Unit tests for the SQLite storage backend
+Run with: python -m pytest tests/
+"""
+
+import json
+import os
+import sqlite3
+
+import pytest
+
+from utils.sqlite_storage import SQLiteStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    with SQLiteStorage(str(tmp_path / "vault.db")) as opened:
+        yield opened
+
+
+class TestSQLiteStorage:
+    """Test cases for SQLiteStorage."""
+
+    def test_save_load_list_delete(self, storage):
+        """Test the SecureFileManager-compatible interface."""
+        assert storage.save_encrypted_mnemonic("ENC1", "wallet", {'coin': "btc"})
+        loaded = storage.load_encrypted_mnemonic("wallet")
+        assert loaded['encrypted_mnemonic'] == "ENC1"
+        assert loaded['metadata'] == {'coin': "btc"}
+        assert loaded['created_at']
+
+        # Saving again replaces the entry and its metadata rows
+        assert storage.save_encrypted_mnemonic("ENC2", "wallet", {'coin': "eth"})
+        assert storage.load_encrypted_mnemonic("wallet")['encrypted_mnemonic'] == "ENC2"
+        assert storage.find_by_metadata('coin', "btc") == []
+
+        listed = storage.list_encrypted_files()
+        assert [entry['filename'] for entry in listed] == ["wallet"]
+        assert storage.delete_encrypted_file("wallet")
+        assert not storage.delete_encrypted_file("wallet")
+        assert storage.load_encrypted_mnemonic("wallet") is None
+
+    def test_wal_mode(self, storage):
+        """Test that the database runs in write-ahead-log mode."""
+        assert storage._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    @pytest.mark.skipif(os.name == 'nt', reason="POSIX permissions")
+    def test_database_files_are_private(self, tmp_path):
+        """Test that the database and its WAL sidecars are created owner-only."""
+        with SQLiteStorage(str(tmp_path / "vault.db")) as storage:
+            assert storage.save_encrypted_mnemonic("ENC", "wallet")
+            assert storage.backup(str(tmp_path / "copy.db"))
+            created = sorted(path.name for path in tmp_path.iterdir())
+            assert created == ["copy.db", "vault.db", "vault.db-shm", "vault.db-wal"]
+            for name in created:
+                assert (tmp_path / name).stat().st_mode & 0o777 == 0o600, name
+
+    @pytest.mark.skipif(os.name == 'nt', reason="POSIX permissions")
+    def test_entry_backup_created_private(self, storage, tmp_path, monkeypatch):
+        """Test that an entry backup is owner-only from creation, without a later chmod."""
+        storage.save_encrypted_mnemonic("ENC", "wallet")
+        monkeypatch.setattr(os, "chmod", lambda *args: pytest.fail("backup must not need chmod"))
+        old_umask = os.umask(0o022)
+        try:
+            assert storage.backup_encrypted_file("wallet", str(tmp_path / "backups"))
+        finally:
+            os.umask(old_umask)
+        (backup_file,) = (tmp_path / "backups").glob("wallet_backup_*.enc")
+        assert backup_file.stat().st_mode & 0o777 == 0o600
+
+    def test_bulk_save_is_one_transaction(self, storage):
+        """Test that a failing bulk insert leaves nothing behind."""
+        entries = [(f"ENC{i}", f"entry{i:03d}", {'batch': 1, 'index': i}) for i in range(100)]
+        assert storage.bulk_save(entries) == 100
+        assert len(storage.list_encrypted_files()) == 100
+
+        broken = [("ENC", "good", None), (None, "bad", None)]  # NULL violates NOT NULL
+        assert storage.bulk_save(broken) == 0
+        assert storage.load_encrypted_mnemonic("good") is None
+
+    def test_indexed_queries(self, storage):
+        """Test metadata and creation-time lookups and that they use indexes."""
+        storage.bulk_save([("A", "a", {'coin': "btc"}), ("B", "b", {'coin': "eth"}),
+                           ("C", "c", {'coin': "btc", 'tags': ["cold"]})])
+        assert [entry['filename'] for entry in storage.find_by_metadata('coin', "btc")] == ["a", "c"]
+        assert [entry['filename'] for entry in storage.find_by_metadata('tags', ["cold"])] == ["c"]
+        assert len(storage.find_created_between("2000-01-01")) == 3
+        assert storage.find_created_between(end="2000-01-01") == []
+
+        plan = " ".join(row[-1] for row in storage._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT name FROM entry_metadata WHERE key = ? AND value = ?", ("coin", '"btc"')))
+        assert "entry_metadata_key_value" in plan
+
+    def test_backups(self, storage, tmp_path):
+        """Test whole-database and single-entry backups."""
+        storage.bulk_save([("A", "a", None), ("B", "b", None)])
+
+        copy_path = tmp_path / "copy.db"
+        assert storage.backup(str(copy_path), pages_per_step=1)
+        with sqlite3.connect(str(copy_path)) as copy:
+            assert copy.execute("SELECT COUNT(*) FROM entries").fetchone()[0] == 2
+
+        assert storage.backup_encrypted_file("a", str(tmp_path / "backups"))
+        (backup_file,) = (tmp_path / "backups").glob("a_backup_*.enc")
+        assert json.loads(backup_file.read_text())['encrypted_mnemonic'] == "A"
+        assert not storage.backup_encrypted_file("missing", str(tmp_path / "backups"))
@@ -0,0 +1,38 @@
+"""
+Unit tests for lazy CLI startup
+Run with: python -m pytest tests/
+"""
+
+import json
+
+import pytest
+
+from benchmarks.startup import DEFAULT_BUDGET, import_profile
+
+
+def _budget_targets():
+    with open(DEFAULT_BUDGET, 'r', encoding='utf-8') as f:
+        return json.load(f)['targets']
+
+
+class TestStartupImports:
+    """Test that light entry points do not load heavy modules."""
+
+    @pytest.mark.parametrize("target", sorted(_budget_targets()))
+    def test_no_forbidden_modules(self, target):
+        """Test each budget target against its forbidden module list."""
+        loaded = import_profile(target)
+        forbidden = _budget_targets()[target].get('forbidden_modules', [])
+        assert target in loaded
+        assert [name for name in forbidden if name in loaded] == []
+
+    def test_lazy_package_exports(self):
+        """Test that crypto package exports still resolve on access."""
+        import crypto
+        from crypto.password_strength import PasswordStrengthChecker
+        from crypto.secure_encryption import SecureMnemonicEncryption
+
+        assert crypto.PasswordStrengthChecker is PasswordStrengthChecker
+        assert crypto.SecureMnemonicEncryption is SecureMnemonicEncryption
+        with pytest.raises(AttributeError):
+            crypto.NotAnExport
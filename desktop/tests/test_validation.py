@@ -0,0 +1,95 @@
+"""
+Unit tests for structural envelope validation
+Run with: python -m pytest tests/
+"""
+
+import base64
+import json
+
+from crypto import envelope
+from crypto.secure_encryption import SecureMnemonicEncryption
+from crypto.validation import validate_envelope, screen_directory, screen_ndjson
+
+
+def _legacy(salt_hex: str, inner: bytes) -> str:
+    """Build a legacy envelope around arbitrary inner bytes."""
+    combined = f"{salt_hex}:{base64.b64encode(inner).decode('ascii')}"
+    return base64.b64encode(combined.encode('utf-8')).decode('ascii')
+
+
+def _fail_kdf():
+    """Stand-in KDF that must never run."""
+    raise AssertionError("KDF ran on a structurally invalid envelope")
+
+
+class TestValidateEnvelope:
+    """Test cases for validate_envelope reason codes."""
+
+    password = "ValidPassword123!"
+
+    def test_valid_envelopes(self):
+        """Test that freshly encrypted envelopes of every version pass."""
+        for version in (1, 2, 3):
+            encrypted = SecureMnemonicEncryption(envelope_version=version).encrypt_mnemonic(
+                "valid mnemonic phrase", self.password)
+            result = validate_envelope(encrypted)
+            assert result.ok and result.reason == envelope.REASON_OK
+            assert result.version == version
+
+    def test_reason_codes(self):
+        """Test that each structural defect maps to its reason code."""
+        salt_hex = "00" * 16
+        cases = {
+            "": envelope.REASON_EMPTY,
+            "invalid_base64!": envelope.REASON_BAD_BASE64,
+            "dGVzdA==": envelope.REASON_BAD_LAYOUT,
+            _legacy("abcd", b"Salted__" + b"\x00" * 24): envelope.REASON_BAD_SALT,
+            _legacy(salt_hex, b"NotSalted" + b"\x00" * 23): envelope.REASON_MISSING_SALTED_PREFIX,
+            _legacy(salt_hex, b"Salted__" + b"\x00" * 20): envelope.REASON_BAD_BLOCK_ALIGNMENT,
+            base64.b64encode(b"0:" + salt_hex.encode() + b":AAAA").decode(): envelope.REASON_BAD_ITERATIONS,
+        }
+        for data, reason in cases.items():
+            result = validate_envelope(data)
+            assert not result.ok
+            assert result.reason == reason, data
+
+    def test_invalid_envelope_skips_kdf(self, monkeypatch):
+        """Test that decrypt_mnemonic rejects malformed data before deriving a key."""
+        encryption = SecureMnemonicEncryption()
+        monkeypatch.setattr(encryption, '_derive_key', lambda *a, **k: _fail_kdf())
+        bad = _legacy("00" * 16, b"Salted__" + b"\x00" * 20)
+        assert encryption.decrypt_mnemonic(bad, self.password) is None
+
+
+class TestBulkScreening:
+    """Test cases for directory and NDJSON screening."""
+
+    def test_screen_directory(self, tmp_path):
+        """Test screening SecureFileManager-style entries."""
+        good = SecureMnemonicEncryption().encrypt_mnemonic("screened mnemonic", "Password123!")
+        (tmp_path / "good.enc").write_text(json.dumps({'encrypted_mnemonic': good}))
+        (tmp_path / "bad.enc").write_text(json.dumps({'encrypted_mnemonic': "dGVzdA=="}))
+        (tmp_path / "broken.enc").write_text("{not json")
+        (tmp_path / "empty.enc").write_text(json.dumps({}))
+
+        results = {name: result.reason for name, result in screen_directory(tmp_path)}
+        assert results == {
+            'good': envelope.REASON_OK,
+            'bad': envelope.REASON_BAD_LAYOUT,
+            'broken': 'bad_container',
+            'empty': 'missing_field',
+        }
+
+    def test_screen_ndjson(self, tmp_path):
+        """Test screening an NDJSON export line by line."""
+        good = SecureMnemonicEncryption().encrypt_mnemonic("screened mnemonic", "Password123!")
+        path = tmp_path / "vault.ndjson"
+        path.write_text("\n".join([
+            json.dumps({'encrypted_mnemonic': good}),
+            "",
+            json.dumps({'encrypted_mnemonic': "invalid_base64!"}),
+            "{not json",
+        ]))
+
+        results = [(line, result.reason) for line, result in screen_ndjson(path)]
+        assert results == [(1, 'ok'), (3, 'bad_base64'), (4, 'bad_container')]
@@ -0,0 +1,113 @@
+"""
+Unit tests for vault unlock sessions
+Run with: python -m pytest tests/
+"""
+
+import time
+
+import pytest
+
+from crypto import envelope, validation
+from crypto.secure_encryption import SecureMnemonicEncryption
+from crypto.vault_session import VaultSession
+from utils.file_manager import SecureFileManager
+
+PASSWORD = "VaultPassword123!"
+
+
+class TestVaultSession:
+    """Test cases for VaultSession."""
+
+    def test_roundtrip_and_unlock(self):
+        """Test that a re-unlocked session opens entries from an earlier one."""
+        session, params = VaultSession.create(PASSWORD, iterations=1000)
+        encrypted = session.encrypt_mnemonic("alpha bravo charlie")
+        assert envelope.detect_version(encrypted) == envelope.VERSION_GCM
+
+        reopened = VaultSession.unlock(PASSWORD, params)
+        assert reopened.decrypt_mnemonic(encrypted) == "alpha bravo charlie"
+        assert VaultSession.unlock("WrongPassword1!", params) is None
+
+        # A password-only decrypt cannot open a vault entry
+        assert SecureMnemonicEncryption().decrypt_mnemonic(encrypted, PASSWORD) is None
+
+    def test_close_and_expiry_zero_the_key(self):
+        """Test that a closed or expired session refuses further use."""
+        session, _ = VaultSession.create(PASSWORD, iterations=1000)
+        key_buffer = session._master_key
+        session.close()
+        assert not session.is_open
+        assert key_buffer == bytes(len(key_buffer))
+        with pytest.raises(RuntimeError):
+            session.encrypt_mnemonic("alpha bravo charlie")
+
+        short, _ = VaultSession.create(PASSWORD, iterations=1000, lifetime=0.01)
+        time.sleep(0.02)
+        assert not short.is_open
+
+    def test_idle_session_key_is_zeroed_on_expiry(self):
+        """Test that expiry wipes the key without any further call on the session."""
+        session, _ = VaultSession.create(PASSWORD, iterations=1000, lifetime=0.05)
+        key_buffer = session._master_key
+        assert any(key_buffer)
+
+        deadline = time.monotonic() + 5.0
+        while any(key_buffer) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert key_buffer == bytes(len(key_buffer))
+
+
+class TestFileManagerSession:
+    """Test cases for session-based vault access through SecureFileManager."""
+
+    def test_decrypt_all_with_one_kdf(self, tmp_path, monkeypatch):
+        """Test that unlocking and reading N entries runs PBKDF2 only once."""
+        manager = SecureFileManager(str(tmp_path))
+        session = manager.open_session(PASSWORD, iterations=1000)
+        for i in range(3):
+            manager.save_encrypted_mnemonic(session.encrypt_mnemonic(f"entry number {i}"), f"entry{i}")
+        session.close()
+
+        import crypto.vault_session as vault_module
+        calls = []
+        real_pbkdf2 = vault_module.pbkdf2_sha256
+        monkeypatch.setattr(vault_module, 'pbkdf2_sha256',
+                            lambda *args: calls.append(1) or real_pbkdf2(*args))
+
+        with manager.open_session(PASSWORD) as session:
+            assert manager.decrypt_all(session) == {f"entry{i}": f"entry number {i}" for i in range(3)}
+            assert all(manager.verify_all(session).values())
+        assert len(calls) == 1
+
+        assert manager.open_session("WrongPassword1!") is None
+
+    def test_upgrade_legacy_entries(self, tmp_path):
+        """Test that password-encrypted entries are moved to the session format."""
+        manager = SecureFileManager(str(tmp_path))
+        legacy = SecureMnemonicEncryption().encrypt_mnemonic("legacy entry words", PASSWORD)
+        manager.save_encrypted_mnemonic(legacy, "old", {'label': 'kept'})
+
+        with manager.open_session(PASSWORD, iterations=1000) as session:
+            assert manager.decrypt_all(session) == {"old": None}
+            assert manager.upgrade_entries(session, PASSWORD) == 1
+            assert manager.decrypt_all(session) == {"old": "legacy entry words"}
+            assert manager.load_encrypted_mnemonic("old")['metadata'] == {'label': 'kept'}
+
+    def test_screening_accepts_session_entries(self, tmp_path):
+        """Test that a directory written through a session screens clean without its key."""
+        manager = SecureFileManager(str(tmp_path))
+        with manager.open_session(PASSWORD, iterations=1000) as session:
+            for i in range(3):
+                manager.save_encrypted_mnemonic(session.encrypt_mnemonic(f"entry number {i}"), f"entry{i}")
+            tampered = bytearray(envelope.dearmor(session.encrypt_mnemonic("entry number 3")))
+            tampered[3:7] = (1000).to_bytes(4, 'big')  # A PBKDF2 cost in a vault header
+            manager.save_encrypted_mnemonic(envelope.armor(bytes(tampered)), "tampered")
+
+        results = dict(validation.screen_directory(tmp_path))
+        assert results.pop("tampered").reason == envelope.REASON_BAD_ITERATIONS
+        assert results == {f"entry{i}": (True, envelope.REASON_OK, envelope.VERSION_GCM) for i in range(3)}
+
+        # A password alone cannot open them, and says why
+        encryption = SecureMnemonicEncryption()
+        stored = manager.load_encrypted_mnemonic("entry0")['encrypted_mnemonic']
+        assert encryption._decrypt_text(stored, PASSWORD) == (None, envelope.REASON_SESSION_REQUIRED)
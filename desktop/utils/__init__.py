@@ -1,5 +1,7 @@
 """Utility modules for file management and configuration."""
 
-from utils.file_manager import SecureFileManager, ConfigManager
+from utils.file_manager import SecureFileManager, ConfigManager, EntryResult
+from utils.pack_storage import PackStorage
+from utils.sqlite_storage import SQLiteStorage
 
-__all__ = ['SecureFileManager', 'ConfigManager']
\ No newline at end of file
+__all__ = ['SecureFileManager', 'ConfigManager', 'EntryResult', 'PackStorage', 'SQLiteStorage']
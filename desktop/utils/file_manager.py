@@ -5,14 +5,74 @@ Secure handling of encrypted mnemonic file storage
 
 import os
 import json
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Iterator, NamedTuple, Tuple
 from pathlib import Path
 
+from crypto import metrics
+from crypto.concurrency import bounded_map
+
+
+class EntryResult(NamedTuple):
+    """Outcome of one entry in a load_many / save_many batch"""
+
+    filename: Optional[str]  # None for a save_many entry that is not a valid tuple
+    result: Any
+    error: Optional[str]
+
+
+@contextmanager
+def _exclusive_file_lock(path: Path):
+    """Hold an exclusive advisory lock on path (created 0600) across processes"""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield  # Released when fd is closed
+    finally:
+        os.close(fd)
+
+
+def _fsync_path(path: str) -> None:
+    """Flush one file's data to stable storage"""
+    fd = os.open(path, os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
 
 class SecureFileManager:
     """Handles secure file operations for encrypted mnemonic storage."""
 
+    # Vault parameters (master key salt, cost and verifier) for unlock sessions
+    VAULT_FILE = ".vault.json"
+
+    # Listing cache: filename -> created_at, metadata and the mtime/size of
+    # the .enc file it was read from
+    INDEX_FILE = ".index.json"
+    INDEX_VERSION = 1
+    # Index changes made since INDEX_FILE was written, one JSON line each;
+    # folded back into INDEX_FILE by listings once it outgrows a quarter
+    # of the index, and by every reconcile
+    INDEX_JOURNAL = ".index.journal"
+    # Serializes journal appends with compaction across processes, so a
+    # record appended by another manager is never dropped with the journal
+    INDEX_LOCK = ".index.lock"
+
     def __init__(self, storage_dir: str = "encrypted_storage"):
         """
         Initialize file manager with storage directory.
@@ -22,12 +82,25 @@ class SecureFileManager:
         """
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(exist_ok=True)
+        # The index is checked against the directory once per manager
+        self._index_reconciled = False
+        # Open group commit: filename -> (unsynced temp file, entry data)
+        self._group: Optional[Dict[str, Tuple[str, Dict[str, Any]]]] = None
+        self._group_deleted: set = set()
+        self._lock = threading.RLock()
+        # True while this manager holds INDEX_LOCK (always under self._lock)
+        self._index_locked = False
 
     def save_encrypted_mnemonic(self, encrypted_data: str, filename: str,
                                metadata: Optional[Dict[str, Any]] = None) -> bool:
         """
         Save encrypted mnemonic to file with metadata.
 
+        The entry is written to a temporary file, fsynced and renamed over
+        the target, so a crash leaves either the old or the new entry.
+        Inside group_commit() the entry is made durable and visible when
+        the group exits.
+
         Args:
             encrypted_data: The encrypted mnemonic string
             filename: Name for the storage file (without extension)
@@ -37,8 +110,17 @@ class SecureFileManager:
             True if successful, False otherwise
         """
         try:
-            file_path = self.storage_dir / f"{filename}.enc"
+            self._save_entry(encrypted_data, filename, metadata)
+            return True
+
+        except Exception as e:
+            print(f"Error saving file: {e}")
+            return False
 
+    def _save_entry(self, encrypted_data: str, filename: str,
+                    metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Save one entry, raising on failure"""
+        try:
             # Prepare data structure
             data = {
                 'encrypted_mnemonic': encrypted_data,
@@ -46,19 +128,13 @@ class SecureFileManager:
                 'metadata': metadata or {}
             }
 
-            # Write to file with restrictive permissions
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-
-            # Set file permissions (readable only by owner on Unix systems)
-            if os.name != 'nt':  # Not Windows
-                os.chmod(file_path, 0o600)
-
-            return True
+            with metrics.stage('file_save'):
+                self._write_entry(filename, data)
 
         except Exception as e:
-            print(f"Error saving file: {e}")
-            return False
+            metrics.record('file_save', 'failure', type(e).__name__)
+            raise
+        metrics.record('file_save', 'success')
 
     def load_encrypted_mnemonic(self, filename: str) -> Optional[Dict[str, Any]]:
         """
@@ -70,45 +146,130 @@ class SecureFileManager:
         Returns:
             Dictionary with encrypted data and metadata, or None if failed
         """
+        try:
+            return self._load_entry(filename)
+
+        except Exception as e:
+            print(f"Error loading file: {e}")
+            return None
+
+    def _load_entry(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Load one entry; None if it does not exist, raises on other failures"""
         try:
             file_path = self.storage_dir / f"{filename}.enc"
 
             if not file_path.exists():
+                metrics.record('file_load', 'failure', 'not_found')
                 return None
 
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            return data
+            with metrics.stage('file_load'):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
 
         except Exception as e:
-            print(f"Error loading file: {e}")
-            return None
+            metrics.record('file_load', 'failure', type(e).__name__)
+            raise
+        metrics.record('file_load', 'success')
+        return data
+
+    def load_many(self, filenames: Iterable[str], workers: int = 8) -> Iterator[EntryResult]:
+        """
+        Load many entries with file reads and JSON parsing on a thread pool.
+
+        At most 2 * workers loads are in flight, so a long (or endless)
+        input never queues everything at once.
+
+        Args:
+            filenames: Entry names (without extension)
+            workers: Maximum concurrent loads
+
+        Yields:
+            EntryResult per name in input order; result is the entry
+            dictionary, or None with an error message
+        """
+        def load(filename: str) -> EntryResult:
+            try:
+                data = self._load_entry(filename)
+            except Exception as e:
+                return EntryResult(filename, None, str(e) or type(e).__name__)
+            if data is None:
+                return EntryResult(filename, None, "Entry not found")
+            return EntryResult(filename, data, None)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            yield from bounded_map(pool, load, ((filename,) for filename in filenames), workers * 2)
+
+    def save_many(self, entries: Iterable[Tuple[str, str, Optional[Dict[str, Any]]]],
+                  workers: int = 8) -> Iterator[EntryResult]:
+        """
+        Save many entries with JSON encoding and file writes on a thread pool.
+
+        Each save is durable on its own; wrap the loop in group_commit() to
+        share the fsyncs (results then mean "staged", and the entries land
+        when the group exits).
+
+        Args:
+            entries: (encrypted_data, filename, metadata) tuples
+            workers: Maximum concurrent saves
+
+        Yields:
+            EntryResult per entry in input order; result is True, or None
+            with an error message (and filename None for an entry that is
+            not an (encrypted_data, filename, metadata) tuple)
+        """
+        def save(entry) -> EntryResult:
+            try:
+                encrypted_data, filename, metadata = entry
+            except (TypeError, ValueError):
+                return EntryResult(None, None, "Entry must be an (encrypted_data, filename, metadata) tuple")
+            try:
+                self._save_entry(encrypted_data, filename, metadata)
+            except Exception as e:
+                return EntryResult(filename, None, str(e) or type(e).__name__)
+            return EntryResult(filename, True, None)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            yield from bounded_map(pool, save, ((entry,) for entry in entries), workers * 2)
 
     def list_encrypted_files(self) -> list:
         """
         List all encrypted mnemonic files.
 
+        Served from INDEX_FILE and INDEX_JOURNAL. The first listing of each
+        manager checks the index against the directory by mtime and size
+        and re-reads only the entries that changed; later listings read the
+        index and replay the journal, compacting it once it grows large.
+
         Returns:
             List of dictionaries with file information
         """
         files = []
         try:
-            for file_path in self.storage_dir.glob("*.enc"):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-
+            with metrics.stage('file_list'):
+                # Entry files are only opened when the index is missing or
+                # stale (see _reconcile_index)
+                with self._index_lock():
+                    entries, journaled = self._read_index() if self._index_reconciled else (None, 0)
+                    if entries is None:
+                        entries = self._reconcile_index()
+                    elif journaled * 4 > len(entries):
+                        # Fold the journal back in so replaying it stays cheap
+                        try:
+                            self._write_index(entries)
+                        except OSError:
+                            pass  # Replayed again until a later listing compacts it
+
+                for filename, record in sorted(entries.items()):
                     files.append({
-                        'filename': file_path.stem,
-                        'created_at': data.get('created_at', 'Unknown'),
-                        'metadata': data.get('metadata', {})
+                        'filename': filename,
+                        'created_at': record['created_at'],
+                        'metadata': record['metadata']
                     })
-                except Exception:
-                    # Skip corrupted files
-                    continue
+
+            metrics.record('file_list', 'success')
 
         except Exception as e:
+            metrics.record('file_list', 'failure', type(e).__name__)
             print(f"Error listing files: {e}")
 
         return files
@@ -126,15 +287,34 @@ class SecureFileManager:
         try:
             file_path = self.storage_dir / f"{filename}.enc"
 
+            with self._lock:
+                pending = self._group.pop(filename, None) if self._group is not None else None
+            if pending is not None:
+                os.unlink(pending[0])
+
             if not file_path.exists():
+                if pending is not None:
+                    metrics.record('file_delete', 'success')
+                    return True
+                metrics.record('file_delete', 'failure', 'not_found')
                 return False
 
             # On some systems, you might want to overwrite before deletion
             # This is a basic secure deletion
-            file_path.unlink()
+            with metrics.stage('file_delete'):
+                file_path.unlink()
+                with self._lock:
+                    in_group = self._group is not None
+                    if in_group:
+                        self._group_deleted.add(filename)
+                if not in_group:
+                    self._fsync_directory()
+                    self._index_append([(filename, None)])
+            metrics.record('file_delete', 'success')
             return True
 
         except Exception as e:
+            metrics.record('file_delete', 'failure', type(e).__name__)
             print(f"Error deleting file: {e}")
             return False
 
@@ -167,6 +347,384 @@ class SecureFileManager:
             print(f"Error creating backup: {e}")
             return False
 
+    def open_session(self, password: str, lifetime: Optional[float] = 900.0,
+                     iterations: Optional[int] = None):
+        """
+        Unlock the vault with one master key derivation.
+
+        The vault parameters (salt, cost, verifier) live in VAULT_FILE and
+        are created on first use.
+
+        Args:
+            password: Vault password
+            lifetime: Seconds until the session closes itself, or None
+            iterations: PBKDF2 cost when creating a new vault
+
+        Returns:
+            An open VaultSession, or None if the password is wrong
+        """
+        from crypto.vault_session import MASTER_ITERATIONS, VaultSession
+
+        params_path = self.storage_dir / self.VAULT_FILE
+        try:
+            if params_path.exists():
+                with open(params_path, 'r', encoding='utf-8') as f:
+                    return VaultSession.unlock(password, json.load(f), lifetime)
+
+            session, params = VaultSession.create(password, iterations or MASTER_ITERATIONS, lifetime)
+            self._atomic_write(params_path, json.dumps(params, indent=2))
+            return session
+
+        except Exception as e:
+            print(f"Error opening vault session: {e}")
+            return None
+
+    def decrypt_all(self, session) -> Dict[str, Optional[str]]:
+        """
+        Decrypt every entry written under a vault session.
+
+        Costs one HKDF per entry; entries in another format map to None.
+
+        Returns:
+            Mapping of filename to mnemonic (or None)
+        """
+        results = {}
+        for file_path in sorted(self.storage_dir.glob("*.enc")):
+            data = self.load_encrypted_mnemonic(file_path.stem)
+            encrypted = data.get('encrypted_mnemonic') if isinstance(data, dict) else None
+            results[file_path.stem] = session.decrypt_mnemonic(encrypted) if encrypted else None
+        return results
+
+    def verify_all(self, session) -> Dict[str, bool]:
+        """
+        Check that every entry decrypts and authenticates under a session.
+
+        Returns:
+            Mapping of filename to True when the entry is intact
+        """
+        return {name: mnemonic is not None for name, mnemonic in self.decrypt_all(session).items()}
+
+    def upgrade_entries(self, session, password: str) -> int:
+        """
+        Re-encrypt password-encrypted entries under the vault session.
+
+        Each upgraded entry costs its own PBKDF2 once; afterwards it opens
+        with the session's cheap per-entry keys. Metadata and creation time
+        are kept.
+
+        Returns:
+            Number of entries upgraded
+        """
+        from crypto.secure_encryption import SecureMnemonicEncryption
+
+        encryption = SecureMnemonicEncryption()
+        upgraded = 0
+        for file_path in sorted(self.storage_dir.glob("*.enc")):
+            data = self.load_encrypted_mnemonic(file_path.stem)
+            encrypted = data.get('encrypted_mnemonic') if isinstance(data, dict) else None
+            if not encrypted or session.decrypt_mnemonic(encrypted) is not None:
+                continue
+
+            mnemonic = encryption.decrypt_mnemonic(encrypted, password)
+            if mnemonic is None:
+                continue
+
+            data['encrypted_mnemonic'] = session.encrypt_mnemonic(mnemonic)
+            try:
+                self._write_entry(file_path.stem, data)
+                upgraded += 1
+            except Exception as e:
+                print(f"Error upgrading {file_path.stem}: {e}")
+
+        return upgraded
+
+    def _write_entry(self, filename: str, data: Dict[str, Any]) -> None:
+        """Write one entry's JSON as-is (keeping its created_at) and index it"""
+        file_path = self.storage_dir / f"{filename}.enc"
+        text = json.dumps(data, indent=2)
+
+        if self._group is not None:
+            temp_path = self._write_temp(file_path, text, sync=False)
+            with self._lock:
+                group = self._group
+                if group is not None:
+                    replaced = group.get(filename)
+                    group[filename] = (temp_path, data)
+                    self._group_deleted.discard(filename)
+            if group is not None:
+                if replaced is not None:
+                    os.unlink(replaced[0])
+                return
+            # The group committed while this entry was being written
+            os.unlink(temp_path)
+
+        self._atomic_write(file_path, text)
+        self._index_append([(filename, self._index_record(data, file_path.stat()))])
+
+    def _write_temp(self, file_path: Path, text: str, sync: bool = True) -> str:
+        """
+        Write text to a new temporary file beside file_path.
+
+        mkstemp creates the file readable only by its owner, so there is
+        no window in which the data is exposed with default permissions.
+
+        Returns:
+            Path of the temporary file
+        """
+        fd, temp_path = tempfile.mkstemp(prefix=f".{file_path.name}.", suffix=".tmp", dir=self.storage_dir)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return temp_path
+
+    def _atomic_write(self, file_path: Path, text: str, sync: bool = True) -> None:
+        """Replace file_path with text via temp file and rename; durable when sync is set"""
+        temp_path = self._write_temp(file_path, text, sync)
+        try:
+            os.replace(temp_path, file_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        if sync:
+            self._fsync_directory()
+
+    def _fsync_directory(self) -> None:
+        """Make renames and unlinks in the storage directory durable"""
+        if os.name == 'nt':  # Directories cannot be opened for fsync on Windows
+            return
+        fd = os.open(self.storage_dir, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @contextmanager
+    def group_commit(self, workers: int = 16):
+        """
+        Batch the durability work of many saves and deletes.
+
+        Saves inside the block write unsynced temporary files. On exit
+        they are fsynced concurrently, which lets the filesystem fold
+        them into a few journal commits. They are then renamed into place
+        and made durable by one directory fsync and one index append. If the
+        block raises, the pending saves are discarded. Deletes take effect
+        at once; only their fsync and index update wait for the exit.
+        Nested groups join the outermost one.
+
+        Args:
+            workers: Maximum concurrent fsyncs at commit
+
+        Example:
+            with manager.group_commit():
+                for name, encrypted in entries:
+                    manager.save_encrypted_mnemonic(encrypted, name)
+        """
+        with self._lock:
+            if self._group is not None:
+                nested = True
+            else:
+                nested = False
+                self._group, self._group_deleted = {}, set()
+        if nested:
+            yield self
+            return
+
+        try:
+            yield self
+        except BaseException:
+            with self._lock:
+                pending, self._group = self._group, None
+            for temp_path, _ in pending.values():
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+            raise
+
+        with self._lock:
+            pending, deleted = self._group, self._group_deleted
+            self._group, self._group_deleted = None, set()
+        try:
+            with metrics.stage('file_group_commit'):
+                self._commit_group(pending, deleted, workers)
+        except BaseException:
+            # Entries already renamed stay; unsynced leftovers are dropped
+            for temp_path, _ in pending.values():
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+            raise
+
+    def _commit_group(self, pending: Dict[str, Tuple[str, Dict[str, Any]]], deleted: set, workers: int) -> None:
+        """Sync, publish and index the entries of a finished group"""
+        if pending:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(pending)))) as pool:
+                list(pool.map(_fsync_path, [temp_path for temp_path, _ in pending.values()]))
+            for filename, (temp_path, _) in pending.items():
+                os.replace(temp_path, self.storage_dir / f"{filename}.enc")
+        if pending or deleted:
+            self._fsync_directory()
+
+        changes = [(filename, None) for filename in deleted]
+        changes += [(filename, self._index_record(data, (self.storage_dir / f"{filename}.enc").stat()))
+                    for filename, (_, data) in pending.items()]
+        self._index_append(changes)
+
+    @staticmethod
+    def _index_record(data: Dict[str, Any], stat: os.stat_result) -> Dict[str, Any]:
+        """Index entry for one .enc file's parsed contents and stat"""
+        return {
+            'created_at': data.get('created_at', 'Unknown'),
+            'metadata': data.get('metadata', {}),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size
+        }
+
+    def _read_index(self) -> Tuple[Optional[Dict[str, Dict[str, Any]]], int]:
+        """
+        Index entries with the journal replayed over them.
+
+        A torn journal line (a crash mid-append) is skipped; the mtime/size
+        check on open picks up the change it described.
+
+        Returns:
+            The entries, or None when the index is missing or unreadable,
+            and the number of journal records replayed
+        """
+        try:
+            with open(self.storage_dir / self.INDEX_FILE, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') != self.INDEX_VERSION:
+                return None, 0
+            entries = index['entries']
+        except (OSError, ValueError, KeyError, AttributeError):
+            return None, 0
+
+        journaled = 0
+        try:
+            with open(self.storage_dir / self.INDEX_JOURNAL, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        change = json.loads(line)
+                    except ValueError:
+                        continue
+                    if change['record'] is None:
+                        entries.pop(change['name'], None)
+                    else:
+                        entries[change['name']] = change['record']
+                    journaled += 1
+        except FileNotFoundError:
+            pass
+        except (OSError, KeyError, TypeError):
+            return None, 0
+        return entries, journaled
+
+    def _write_index(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Atomically replace the index file with the given entries and drop
+        the journal they include. Callers hold _index_lock() from reading
+        the entries until this returns.
+
+        Not fsynced: after a crash the mtime/size check on open repairs
+        whatever the index lost.
+        """
+        self._atomic_write(self.storage_dir / self.INDEX_FILE,
+                           json.dumps({'version': self.INDEX_VERSION, 'entries': entries}, separators=(',', ':')),
+                           sync=False)
+        try:
+            os.unlink(self.storage_dir / self.INDEX_JOURNAL)
+        except FileNotFoundError:
+            pass
+
+    def _index_append(self, changes: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> None:
+        """
+        Journal index changes: (filename, record) adds or replaces an entry,
+        (filename, None) drops it.
+
+        Costs one append however large the index is. Without an index
+        nothing is written; the next listing builds it. A failed append
+        never fails the entry operation, it only forces the next listing
+        to reconcile.
+        """
+        payload = "".join(json.dumps({'name': filename, 'record': record}, separators=(',', ':')) + "\n"
+                          for filename, record in changes).encode('utf-8')
+        if not payload or not (self.storage_dir / self.INDEX_FILE).exists():
+            return
+        try:
+            with self._index_lock():
+                fd = os.open(self.storage_dir / self.INDEX_JOURNAL, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+                try:
+                    os.write(fd, payload)
+                finally:
+                    os.close(fd)
+        except OSError:
+            self._index_reconciled = False
+
+    @contextmanager
+    def _index_lock(self):
+        """
+        Hold self._lock and INDEX_LOCK, excluding index changes by other
+        threads and processes. Re-entrant within one thread.
+        """
+        with self._lock:
+            if self._index_locked:
+                yield
+                return
+            with _exclusive_file_lock(self.storage_dir / self.INDEX_LOCK):
+                self._index_locked = True
+                try:
+                    yield
+                finally:
+                    self._index_locked = False
+
+    def _reconcile_index(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Bring the index in line with the .enc files on disk.
+
+        Costs one directory scan; only files whose mtime or size differ
+        from their index entry (or that have none) are opened and parsed.
+        Corrupted files are left out, as listings always skipped them.
+
+        Returns:
+            The reconciled index entries
+        """
+        with self._index_lock():
+            indexed, journaled = self._read_index()
+            entries = {}
+            changed = indexed is None or journaled > 0
+            indexed = indexed or {}
+
+            with os.scandir(self.storage_dir) as scan:
+                for dir_entry in scan:
+                    if not dir_entry.name.endswith('.enc') or not dir_entry.is_file():
+                        continue
+                    filename = dir_entry.name[:-len('.enc')]
+                    stat = dir_entry.stat()
+
+                    record = indexed.get(filename)
+                    if record and record.get('mtime_ns') == stat.st_mtime_ns and record.get('size') == stat.st_size:
+                        entries[filename] = record
+                        continue
+
+                    try:
+                        with open(dir_entry.path, 'r', encoding='utf-8') as f:
+                            data = json.load(f)
+                        entries[filename] = self._index_record(data, stat)
+                        changed = True
+                    except Exception:
+                        # Skip corrupted files
+                        metrics.record('file_list', 'skipped', 'corrupted')
+
+            if changed or entries.keys() != indexed.keys():
+                self._write_index(entries)
+            self._index_reconciled = True
+            return entries
+
 
 class ConfigManager:
     """Manages application configuration."""
@@ -181,7 +739,8 @@ class ConfigManager:
             'security_settings': {
                 'min_password_length': 12,
                 'require_strong_password': True,
-                'pbkdf2_iterations': 100000
+                # None: calibrated to this host (crypto.calibration) on load
+                'pbkdf2_iterations': None
             }
         }
 
@@ -192,11 +751,18 @@ class ConfigManager:
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     config = json.load(f)
                 # Merge with defaults for any missing keys
-                return {**self.default_config, **config}
+                config = {**self.default_config, **config}
             else:
-                # Create default config file
-                self.save_config(self.default_config)
-                return self.default_config.copy()
+                config = self.default_config.copy()
+
+            # A new config file, or one without a cost, gets this host's
+            # calibrated PBKDF2 cost and is saved with it
+            security = config['security_settings'] = dict(config['security_settings'])
+            if security.get('pbkdf2_iterations') is None:
+                from crypto.calibration import calibrate_iterations
+                security['pbkdf2_iterations'] = calibrate_iterations()
+                self.save_config(config)
+            return config
 
         except Exception as e:
             print(f"Error loading config, using defaults: {e}")
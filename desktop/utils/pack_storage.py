@@ -0,0 +1,480 @@
+"""
+Packed Vault Storage
+Whole vaults in one append-only file with a sorted offset index
+
+Layout (all integers big-endian):
+
+    offset  size        field
+    0       4           MAGIC b"MNPK"
+    4       1           version
+    5       ...         records: each entry's JSON (as in a .enc file), UTF-8
+    I       140 * count index: (name, NUL-padded to 128 bytes; record offset
+                        u64; record length u32), sorted by name
+    end-16  16          trailer: index offset I u64, count u32, MAGIC
+
+Saves and deletes append the new records and a fresh index, fsync them,
+then append the trailer; readers only trust the last trailer. A pack that
+ends in a torn append (a crash before its trailer landed) is cut back to
+the last complete trailer when opened. Superseded records and indexes stay
+behind as dead space until compact() rewrites the pack. Readers mmap the
+file and binary-search the fixed-width index, so loading one entry parses
+only that entry's record.
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from crypto import metrics
+
+MAGIC = b"MNPK"
+VERSION = 1
+NAME_SIZE = 128
+
+_HEADER = struct.Struct(">4sB")
+_INDEX_ENTRY = struct.Struct(f">{NAME_SIZE}sQI")
+_TRAILER = struct.Struct(">QI4s")
+
+# (encoded name, record offset, record length)
+_IndexEntry = Tuple[bytes, int, int]
+
+
+class PackError(ValueError):
+    """Raised for malformed pack files and names that cannot be stored"""
+
+
+def _encode_name(filename: str) -> bytes:
+    """Index key for an entry name."""
+    name = filename.encode('utf-8')
+    if not name or len(name) > NAME_SIZE or b"\0" in name:
+        raise PackError(f"Entry name must be 1-{NAME_SIZE} UTF-8 bytes without NUL")
+    return name
+
+
+def _fsync_directory(path: Path) -> None:
+    """Make a rename in path's directory durable"""
+    if os.name == 'nt':  # Directories cannot be opened for fsync on Windows
+        return
+    fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _open_private(path: Path, mode: str, exclusive: bool = True):
+    """
+    Open a new file for writing that is owner-only from creation.
+
+    Args:
+        path: File to create
+        mode: 'w' or 'wb'
+        exclusive: Fail with FileExistsError instead of truncating an existing file
+    """
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_EXCL if exclusive else os.O_TRUNC)
+    fd = os.open(path, flags | getattr(os, 'O_BINARY', 0), 0o600)
+    return os.fdopen(fd, mode, encoding=None if 'b' in mode else 'utf-8')
+
+
+class _IndexKeys(Sequence):
+    """Names of a mapped index, read lazily so bisect touches O(log n) entries."""
+
+    def __init__(self, view, offset: int, count: int):
+        self._view = view
+        self._offset = offset
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position: int) -> bytes:
+        start = self._offset + position * _INDEX_ENTRY.size
+        return bytes(self._view[start:start + NAME_SIZE]).rstrip(b"\0")
+
+
+class PackStorage:
+    """Stores encrypted mnemonics in a single packfile."""
+
+    def __init__(self, pack_path: str = "encrypted_storage.pack"):
+        """
+        Open (creating if needed) a packfile.
+
+        Args:
+            pack_path: Path of the pack file
+
+        Raises:
+            PackError: If an existing file is not a valid pack
+        """
+        self.pack_path = Path(pack_path)
+        self._file = None
+        self._map = None
+
+        if not self.pack_path.exists():
+            try:
+                with _open_private(self.pack_path, 'wb') as f:
+                    f.write(_HEADER.pack(MAGIC, VERSION))
+                    f.write(_TRAILER.pack(_HEADER.size, 0, MAGIC))
+            except FileExistsError:
+                pass  # Another opener created it first
+
+        self._index_offset, self._count = self._remap()
+
+    def close(self) -> None:
+        """Release the file mapping."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def _remap(self) -> Tuple[int, int]:
+        """
+        Map the file afresh and validate its header and trailer.
+
+        If the file does not end in a valid trailer, it is truncated back
+        to the last one that is complete, which drops a torn append.
+        """
+        self.close()
+        self._file = open(self.pack_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        size = len(self._map)
+        if size < _HEADER.size + _TRAILER.size or _HEADER.unpack_from(self._map) != (MAGIC, VERSION):
+            self.close()
+            raise PackError("Not a supported pack file")
+
+        trailer = self._trailer_at(size)
+        if trailer is None:
+            end = self._last_complete_end()
+            self.close()
+            if end is None:
+                raise PackError("Pack trailer is damaged")
+            os.truncate(self.pack_path, end)
+            return self._remap()
+        return trailer
+
+    def _trailer_at(self, end: int, check_entries: bool = False) -> Optional[Tuple[int, int]]:
+        """
+        (index offset, count) of a trailer ending at end, or None if there is
+        no consistent trailer there.
+
+        With check_entries, every index entry must also point at a record
+        between the header and the index, which rules out MAGIC bytes that
+        merely occur inside a record.
+        """
+        if end < _HEADER.size + _TRAILER.size:
+            return None
+        index_offset, count, magic = _TRAILER.unpack_from(self._map, end - _TRAILER.size)
+        if (magic != MAGIC or index_offset < _HEADER.size
+                or index_offset + count * _INDEX_ENTRY.size != end - _TRAILER.size):
+            return None
+        if check_entries:
+            for position in range(count):
+                _, offset, length = _INDEX_ENTRY.unpack_from(self._map, index_offset + position * _INDEX_ENTRY.size)
+                if offset < _HEADER.size or offset + length > index_offset:
+                    return None
+        return index_offset, count
+
+    def _last_complete_end(self) -> Optional[int]:
+        """End offset of the last complete trailer in the mapped file."""
+        end = len(self._map)
+        while True:
+            position = self._map.rfind(MAGIC, _HEADER.size, end)
+            if position < 0:
+                return None
+            if self._trailer_at(position + len(MAGIC), check_entries=True) is not None:
+                return position + len(MAGIC)
+            end = position + len(MAGIC) - 1
+
+    def _index_entry(self, position: int) -> _IndexEntry:
+        name, offset, length = _INDEX_ENTRY.unpack_from(self._map, self._index_offset + position * _INDEX_ENTRY.size)
+        return name.rstrip(b"\0"), offset, length
+
+    def _index_entries(self) -> List[_IndexEntry]:
+        """The whole index in name order."""
+        return [self._index_entry(position) for position in range(self._count)]
+
+    def _find(self, filename: str) -> Optional[_IndexEntry]:
+        """Binary-search the index for an entry."""
+        name = _encode_name(filename)
+        position = bisect.bisect_left(_IndexKeys(self._map, self._index_offset, self._count), name)
+        if position < self._count:
+            entry = self._index_entry(position)
+            if entry[0] == name:
+                return entry
+        return None
+
+    def _read_record(self, offset: int, length: int) -> Dict[str, Any]:
+        return json.loads(self._map[offset:offset + length].decode('utf-8'))
+
+    def _append(self, records: Iterable[Tuple[str, Dict[str, Any]]], removed: Iterable[str] = ()) -> int:
+        """
+        Append records and a new index superseding the current one.
+
+        Args:
+            records: (filename, data) pairs to add or replace
+            removed: Names to leave out of the new index
+
+        Returns:
+            Number of records appended
+        """
+        index = {name: (offset, length) for name, offset, length in self._index_entries()}
+        for filename in removed:
+            index.pop(_encode_name(filename), None)
+
+        appended = 0
+        with open(self.pack_path, 'r+b') as f:
+            end = f.seek(0, os.SEEK_END)
+            try:
+                for filename, data in records:
+                    name = _encode_name(filename)
+                    payload = json.dumps(data, separators=(',', ':')).encode('utf-8')
+                    index[name] = (f.tell(), len(payload))
+                    f.write(payload)
+                    appended += 1
+
+                index_offset = f.tell()
+                f.write(b"".join(_INDEX_ENTRY.pack(name, offset, length)
+                                 for name, (offset, length) in sorted(index.items())))
+                # The trailer must never reach the disk ahead of what it points at
+                f.flush()
+                os.fsync(f.fileno())
+                f.write(_TRAILER.pack(index_offset, len(index), MAGIC))
+                f.flush()
+                os.fsync(f.fileno())
+            except BaseException:
+                # Without its trailer the tail would hide the previous index
+                f.truncate(end)
+                raise
+
+        self._index_offset, self._count = self._remap()
+        return appended
+
+    def save_encrypted_mnemonic(self, encrypted_data: str, filename: str,
+                                metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Append an encrypted mnemonic with metadata, replacing any entry of that name.
+
+        Each call also writes a new index; use bulk_save for many entries.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.bulk_save([(encrypted_data, filename, metadata)]) == 1
+
+    def bulk_save(self, entries: Iterable[Tuple[str, str, Optional[Dict[str, Any]]]]) -> int:
+        """
+        Append many entries followed by a single index.
+
+        Args:
+            entries: (encrypted_data, filename, metadata) tuples
+
+        Returns:
+            Number of entries saved (0 on failure)
+        """
+        created_at = datetime.now().isoformat()
+        try:
+            with metrics.stage('pack_save'):
+                saved = self._append(
+                    (filename, {'encrypted_mnemonic': encrypted_data, 'created_at': created_at,
+                                'metadata': metadata or {}})
+                    for encrypted_data, filename, metadata in entries
+                )
+            metrics.record('pack_save', 'success')
+            return saved
+
+        except Exception as e:
+            metrics.record('pack_save', 'failure', type(e).__name__)
+            print(f"Error saving to pack: {e}")
+            return 0
+
+    def load_encrypted_mnemonic(self, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Load one entry without parsing any other record.
+
+        Returns:
+            Dictionary with encrypted data and metadata, or None if failed
+        """
+        try:
+            with metrics.stage('pack_load'):
+                entry = self._find(filename)
+                data = self._read_record(entry[1], entry[2]) if entry else None
+
+            if data is None:
+                metrics.record('pack_load', 'failure', 'not_found')
+                return None
+
+            metrics.record('pack_load', 'success')
+            return data
+
+        except Exception as e:
+            metrics.record('pack_load', 'failure', type(e).__name__)
+            print(f"Error loading from pack: {e}")
+            return None
+
+    def list_encrypted_files(self) -> list:
+        """
+        List all live entries in name order.
+
+        Returns:
+            List of dictionaries with filename, created_at and metadata
+        """
+        files = []
+        try:
+            with metrics.stage('pack_list'):
+                for name, offset, length in self._index_entries():
+                    data = self._read_record(offset, length)
+                    files.append({
+                        'filename': name.decode('utf-8'),
+                        'created_at': data.get('created_at', 'Unknown'),
+                        'metadata': data.get('metadata', {})
+                    })
+            metrics.record('pack_list', 'success')
+
+        except Exception as e:
+            metrics.record('pack_list', 'failure', type(e).__name__)
+            print(f"Error listing pack: {e}")
+
+        return files
+
+    def delete_encrypted_file(self, filename: str) -> bool:
+        """
+        Drop an entry from the index; its record is reclaimed by compact().
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            if self._find(filename) is None:
+                metrics.record('pack_delete', 'failure', 'not_found')
+                return False
+
+            with metrics.stage('pack_delete'):
+                self._append((), removed=[filename])
+            metrics.record('pack_delete', 'success')
+            return True
+
+        except Exception as e:
+            metrics.record('pack_delete', 'failure', type(e).__name__)
+            print(f"Error deleting from pack: {e}")
+            return False
+
+    def backup_encrypted_file(self, filename: str, backup_dir: str) -> bool:
+        """
+        Write one entry to backup_dir as a SecureFileManager-style .enc file.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            data = self.load_encrypted_mnemonic(filename)
+            if data is None:
+                return False
+
+            backup_path = Path(backup_dir)
+            backup_path.mkdir(exist_ok=True)
+            destination = backup_path / f"{filename}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.enc"
+
+            with _open_private(destination, 'w') as f:
+                json.dump(data, f, indent=2)
+            return True
+
+        except Exception as e:
+            print(f"Error creating backup: {e}")
+            return False
+
+    def dead_bytes(self) -> int:
+        """Bytes taken by superseded records and indexes."""
+        live = sum(length for _, _, length in self._index_entries())
+        return len(self._map) - _HEADER.size - live - self._count * _INDEX_ENTRY.size - _TRAILER.size
+
+    def compact(self) -> int:
+        """
+        Rewrite the pack with only the live entries.
+
+        The new pack is written and fsynced next to the old one, swapped in
+        with os.replace and the directory fsynced, so a crash leaves one
+        complete pack or the other.
+
+        Returns:
+            Number of bytes reclaimed
+        """
+        entries = self._index_entries()
+        old_size = len(self._map)
+        temp_path = self.pack_path.with_name(self.pack_path.name + ".compact")
+
+        # A leftover from an interrupted compaction is simply overwritten
+        with _open_private(temp_path, 'wb', exclusive=False) as f:
+            f.write(_HEADER.pack(MAGIC, VERSION))
+            index = []
+            for name, offset, length in entries:
+                index.append(_INDEX_ENTRY.pack(name, f.tell(), length))
+                f.write(self._map[offset:offset + length])
+            index_offset = f.tell()
+            f.write(b"".join(index))
+            f.write(_TRAILER.pack(index_offset, len(index), MAGIC))
+            f.flush()
+            os.fsync(f.fileno())
+
+        # The mapping must be released before replacing the file on Windows
+        self.close()
+        os.replace(temp_path, self.pack_path)
+        _fsync_directory(self.pack_path)
+        self._index_offset, self._count = self._remap()
+        return old_size - len(self._map)
+
+    @classmethod
+    def from_directory(cls, storage_dir: str, pack_path: str) -> 'PackStorage':
+        """
+        Pack every entry of a SecureFileManager directory, keeping created_at.
+
+        Corrupted .enc files are skipped, as listings skip them. An existing
+        pack at pack_path gains the entries (same-named ones are replaced).
+
+        Returns:
+            The opened PackStorage
+        """
+        def records():
+            for file_path in sorted(Path(storage_dir).glob("*.enc")):
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        yield file_path.stem, json.load(f)
+                except ValueError:
+                    continue
+
+        pack = cls(pack_path)
+        pack._append(records())
+        return pack
+
+    def to_directory(self, storage_dir: str) -> int:
+        """
+        Write every live entry out as SecureFileManager .enc files, keeping created_at.
+
+        The files are written in one group commit, so they share their
+        fsyncs and land together.
+
+        Returns:
+            Number of entries written
+        """
+        from utils.file_manager import SecureFileManager
+
+        manager = SecureFileManager(storage_dir)
+        written = 0
+        with manager.group_commit():
+            for name, offset, length in self._index_entries():
+                manager._write_entry(name.decode('utf-8'), self._read_record(offset, length))
+                written += 1
+        return written
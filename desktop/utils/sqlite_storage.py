@@ -0,0 +1,327 @@
+"""
+SQLite Storage Backend
+Encrypted mnemonic storage in a single SQLite database
+
+Drop-in alternative to SecureFileManager's one-file-per-entry layout:
+the same save/load/list/delete/backup methods, plus bulk inserts in one
+transaction, indexed queries by creation time and metadata, and online
+backups through the SQLite backup API.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from crypto import metrics
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    name TEXT PRIMARY KEY,
+    encrypted_mnemonic TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_created_at ON entries (created_at);
+
+-- One row per top-level metadata key; values are stored as JSON text
+CREATE TABLE IF NOT EXISTS entry_metadata (
+    name TEXT NOT NULL REFERENCES entries (name) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (name, key)
+);
+CREATE INDEX IF NOT EXISTS entry_metadata_key_value ON entry_metadata (key, value);
+"""
+
+
+def _create_private(path: Path) -> None:
+    """
+    Create path readable only by its owner, if it does not exist yet.
+
+    SQLite gives the -wal, -shm and -journal files the permissions of the
+    database file, so creating it 0600 before connecting keeps those
+    private too; a chmod afterwards would come too late for them.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o600)
+    os.close(fd)
+
+
+class SQLiteStorage:
+    """Stores encrypted mnemonics as rows of a WAL-mode SQLite database."""
+
+    def __init__(self, db_path: str = "encrypted_storage.db"):
+        """
+        Open (creating if needed) the storage database.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        _create_private(self.db_path)
+
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL with synchronous=NORMAL is durable up to the last checkpointed
+        # commit and avoids an fsync per transaction
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def _insert(self, encrypted_data: str, filename: str, metadata: Optional[Dict[str, Any]]) -> None:
+        """Upsert one entry and its metadata rows; runs inside the caller's transaction"""
+        metadata = metadata or {}
+        self._conn.execute(
+            "INSERT INTO entries (name, encrypted_mnemonic, created_at, metadata) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET encrypted_mnemonic = excluded.encrypted_mnemonic, "
+            "created_at = excluded.created_at, metadata = excluded.metadata",
+            (filename, encrypted_data, datetime.now().isoformat(), json.dumps(metadata))
+        )
+        self._conn.execute("DELETE FROM entry_metadata WHERE name = ?", (filename,))
+        self._conn.executemany(
+            "INSERT INTO entry_metadata (name, key, value) VALUES (?, ?, ?)",
+            [(filename, str(key), json.dumps(value, sort_keys=True)) for key, value in metadata.items()]
+        )
+
+    def save_encrypted_mnemonic(self, encrypted_data: str, filename: str,
+                                metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Save encrypted mnemonic with metadata, replacing any entry of that name.
+
+        Args:
+            encrypted_data: The encrypted mnemonic string
+            filename: Entry name
+            metadata: Optional metadata to store with the entry
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with metrics.stage('sqlite_save'), self._conn:
+                self._insert(encrypted_data, filename, metadata)
+            metrics.record('sqlite_save', 'success')
+            return True
+
+        except Exception as e:
+            metrics.record('sqlite_save', 'failure', type(e).__name__)
+            print(f"Error saving entry: {e}")
+            return False
+
+    def bulk_save(self, entries: Iterable[Tuple[str, str, Optional[Dict[str, Any]]]]) -> int:
+        """
+        Save many entries in a single transaction.
+
+        Either every entry is stored or, on any error, none are.
+
+        Args:
+            entries: (encrypted_data, filename, metadata) tuples
+
+        Returns:
+            Number of entries saved (0 on failure)
+        """
+        saved = 0
+        try:
+            with metrics.stage('sqlite_bulk_save'), self._conn:
+                for encrypted_data, filename, metadata in entries:
+                    self._insert(encrypted_data, filename, metadata)
+                    saved += 1
+            metrics.record('sqlite_bulk_save', 'success')
+            return saved
+
+        except Exception as e:
+            metrics.record('sqlite_bulk_save', 'failure', type(e).__name__)
+            print(f"Error saving entries: {e}")
+            return 0
+
+    def load_encrypted_mnemonic(self, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Load an encrypted mnemonic entry.
+
+        Args:
+            filename: Entry name
+
+        Returns:
+            Dictionary with encrypted data and metadata (the same shape as
+            SecureFileManager returns), or None if failed
+        """
+        try:
+            with metrics.stage('sqlite_load'):
+                row = self._conn.execute(
+                    "SELECT encrypted_mnemonic, created_at, metadata FROM entries WHERE name = ?",
+                    (filename,)
+                ).fetchone()
+
+            if row is None:
+                metrics.record('sqlite_load', 'failure', 'not_found')
+                return None
+
+            metrics.record('sqlite_load', 'success')
+            return {'encrypted_mnemonic': row[0], 'created_at': row[1], 'metadata': json.loads(row[2])}
+
+        except Exception as e:
+            metrics.record('sqlite_load', 'failure', type(e).__name__)
+            print(f"Error loading entry: {e}")
+            return None
+
+    def _listing(self, where: str = "", params: Tuple = ()) -> List[Dict[str, Any]]:
+        """Listing rows (name order) matching an optional WHERE clause"""
+        rows = self._conn.execute(
+            f"SELECT name, created_at, metadata FROM entries {where} ORDER BY name", params
+        ).fetchall()
+        return [{'filename': name, 'created_at': created_at, 'metadata': json.loads(metadata)}
+                for name, created_at, metadata in rows]
+
+    def list_encrypted_files(self) -> list:
+        """
+        List all stored entries.
+
+        Returns:
+            List of dictionaries with filename, created_at and metadata
+        """
+        try:
+            with metrics.stage('sqlite_list'):
+                files = self._listing()
+            metrics.record('sqlite_list', 'success')
+            return files
+
+        except Exception as e:
+            metrics.record('sqlite_list', 'failure', type(e).__name__)
+            print(f"Error listing entries: {e}")
+            return []
+
+    def find_by_metadata(self, key: str, value: Any) -> list:
+        """
+        List entries whose metadata has key equal to value (indexed lookup).
+
+        Returns:
+            List of dictionaries with filename, created_at and metadata
+        """
+        try:
+            return self._listing(
+                "WHERE name IN (SELECT name FROM entry_metadata WHERE key = ? AND value = ?)",
+                (key, json.dumps(value, sort_keys=True))
+            )
+        except Exception as e:
+            print(f"Error querying entries: {e}")
+            return []
+
+    def find_created_between(self, start: Optional[str] = None, end: Optional[str] = None) -> list:
+        """
+        List entries created in [start, end) (ISO timestamps; indexed lookup).
+
+        Args:
+            start: Earliest created_at to include, or None for no lower bound
+            end: created_at to stop before, or None for no upper bound
+
+        Returns:
+            List of dictionaries with filename, created_at and metadata
+        """
+        try:
+            clauses, params = [], []
+            if start is not None:
+                clauses.append("created_at >= ?")
+                params.append(start)
+            if end is not None:
+                clauses.append("created_at < ?")
+                params.append(end)
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            return self._listing(where, tuple(params))
+        except Exception as e:
+            print(f"Error querying entries: {e}")
+            return []
+
+    def delete_encrypted_file(self, filename: str) -> bool:
+        """
+        Delete an entry.
+
+        Args:
+            filename: Entry name
+
+        Returns:
+            True if an entry was deleted, False otherwise
+        """
+        try:
+            with metrics.stage('sqlite_delete'), self._conn:
+                deleted = self._conn.execute("DELETE FROM entries WHERE name = ?", (filename,)).rowcount
+
+            if not deleted:
+                metrics.record('sqlite_delete', 'failure', 'not_found')
+                return False
+
+            metrics.record('sqlite_delete', 'success')
+            return True
+
+        except Exception as e:
+            metrics.record('sqlite_delete', 'failure', type(e).__name__)
+            print(f"Error deleting entry: {e}")
+            return False
+
+    def backup_encrypted_file(self, filename: str, backup_dir: str) -> bool:
+        """
+        Write one entry to backup_dir as a SecureFileManager-style .enc file.
+
+        Args:
+            filename: Entry name
+            backup_dir: Directory to store the backup
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            data = self.load_encrypted_mnemonic(filename)
+            if data is None:
+                return False
+
+            backup_path = Path(backup_dir)
+            backup_path.mkdir(exist_ok=True)
+            destination = backup_path / f"{filename}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.enc"
+
+            # Owner-only from creation, so the entry is never readable by others
+            fd = os.open(destination, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            return True
+
+        except Exception as e:
+            print(f"Error creating backup: {e}")
+            return False
+
+    def backup(self, destination: str, pages_per_step: int = 256) -> bool:
+        """
+        Copy the whole database with the online backup API.
+
+        Readers and writers on this database can keep going while the copy
+        runs; pages are copied in steps so the lock is never held for long.
+
+        Args:
+            destination: Path of the backup database file
+            pages_per_step: Pages copied per backup step (-1 for all at once)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            _create_private(Path(destination))
+            target = sqlite3.connect(destination)
+            try:
+                self._conn.backup(target, pages=pages_per_step)
+            finally:
+                target.close()
+            return True
+
+        except Exception as e:
+            print(f"Error creating backup: {e}")
+            return False